@@ -0,0 +1,171 @@
+from PyQt6.QtCore import QObject, QTimer, QElapsedTimer, QCoreApplication, Qt, pyqtSignal
+from PyQt6 import sip
+
+
+class AnimationClock(QObject):
+    """Spoločné hodiny, ktoré poháňajú animácie všetkých protokolov.
+
+    Hodiny tikajú s pevnou cieľovou frekvenciou snímok a každej snímke odovzdajú
+    skutočne uplynutý čas. Ak je slučka udalostí preťažená, snímky sa zahodia:
+    dlhý výpadok sa započíta najviac ako MAX_FRAME_DT.
+    """
+
+    # Signál s časom od predchádzajúcej snímky v sekundách
+    frame = pyqtSignal(float)
+
+    TARGET_FPS = 60
+    MAX_FRAME_DT = 0.25
+
+    def __init__(self, fps=TARGET_FPS, parent=None):
+        """Inicializácia hodín s cieľovou frekvenciou snímok"""
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(round(1000 / fps))
+        self.timer.timeout.connect(self.tick)
+        self.elapsed = QElapsedTimer()
+        self.subscribers = 0
+
+    def subscribe(self, callback):
+        """Prihlásenie odberateľa snímok; hodiny sa spustia s prvým odberateľom"""
+        self.frame.connect(callback)
+        self.subscribers += 1
+        if not self.timer.isActive():
+            self.elapsed.start()
+            self.timer.start()
+
+    def unsubscribe(self, callback):
+        """Odhlásenie odberateľa; bez odberateľov sa hodiny zastavia"""
+        self.frame.disconnect(callback)
+        self.subscribers -= 1
+        if self.subscribers <= 0:
+            self.subscribers = 0
+            self.timer.stop()
+
+    def tick(self):
+        """Jedna snímka - odoslanie uplynutého času všetkým odberateľom"""
+        dt = min(self.elapsed.restart() / 1000.0, self.MAX_FRAME_DT)
+        self.frame.emit(dt)
+
+
+# Jediné hodiny zdieľané celou aplikáciou (vytvoria sa pri prvom použití)
+_shared_clock = None
+
+
+def shared_clock():
+    """Vráti spoločné animačné hodiny aplikácie"""
+    global _shared_clock
+    if _shared_clock is None:
+        # Hodiny žijú rovnako dlho ako aplikácia
+        _shared_clock = AnimationClock(parent=QCoreApplication.instance())
+    return _shared_clock
+
+
+class ClockTimer(QObject):
+    """Náhrada QTimer poháňaná spoločnými animačnými hodinami.
+
+    Má rovnaké rozhranie ako QTimer (start, stop, isActive, interval, timeout),
+    ale signál timeout sa odvodzuje od skutočne uplynutého času, nie od počtu
+    tikov. Zameškané tiky sa dobehnú v ďalšej snímke (najviac MAX_CATCHUP_TICKS,
+    zvyšok sa zahodí). S intervalom 0 sa timeout vyšle raz za snímku a čas
+    snímky je dostupný cez frame_time(). Jednorazový časovač (setSingleShot)
+    vyšle timeout raz a zastaví sa - náhrada QTimer.singleShot, ktorá rešpektuje
+    pozastavenie a zastavenie animácie.
+    """
+
+    timeout = pyqtSignal()
+
+    MAX_CATCHUP_TICKS = 8
+
+    def __init__(self, parent=None, clock=None):
+        """Inicializácia časovača napojeného na spoločné hodiny"""
+        super().__init__(parent)
+        self.clock = clock
+        self.interval_ms = 0
+        self.accumulated_ms = 0.0
+        self.last_frame_dt = 0.0
+        self.active = False
+        self.single_shot = False
+
+    def setInterval(self, msec):
+        """Nastavenie intervalu medzi signálmi timeout v milisekundách"""
+        self.interval_ms = msec
+
+    def interval(self):
+        """Vráti interval v milisekundách"""
+        return self.interval_ms
+
+    def setSingleShot(self, single_shot):
+        """Nastavenie jednorazového režimu (timeout sa vyšle iba raz)"""
+        self.single_shot = single_shot
+
+    def isSingleShot(self):
+        """Vráti, či je časovač jednorazový"""
+        return self.single_shot
+
+    def start(self, msec=None):
+        """Spustenie (alebo reštart) časovača, voliteľne s novým intervalom"""
+        if msec is not None:
+            self.interval_ms = msec
+        self.accumulated_ms = 0.0
+        if not self.active:
+            self.active = True
+            self.get_clock().subscribe(self.on_frame)
+
+    def stop(self):
+        """Zastavenie časovača"""
+        if self.active:
+            self.active = False
+            # Pri zatváraní aplikácie môžu byť hodiny zrušené skôr ako časovač
+            if not sip.isdeleted(self.get_clock()):
+                self.get_clock().unsubscribe(self.on_frame)
+
+    def isActive(self):
+        """Vráti, či časovač beží"""
+        return self.active
+
+    def remainingTime(self):
+        """Vráti čas do ďalšieho signálu timeout v milisekundách (-1, ak nebeží)"""
+        if not self.active:
+            return -1
+        return max(0, round(self.interval_ms - self.accumulated_ms))
+
+    def frame_time(self):
+        """Vráti dĺžku poslednej snímky v sekundách (pre interpoláciu podľa času)"""
+        return self.last_frame_dt
+
+    def get_clock(self):
+        """Vráti hodiny, ktoré časovač poháňajú"""
+        if self.clock is None:
+            self.clock = shared_clock()
+        return self.clock
+
+    def on_frame(self, dt):
+        """Spracovanie snímky - vyslanie toľkých timeout, koľko zodpovedá uplynulému času"""
+        self.last_frame_dt = dt
+        if self.interval_ms <= 0:
+            if self.single_shot:
+                self.stop()
+            self.timeout.emit()
+            return
+
+        self.accumulated_ms += dt * 1000.0
+        ticks = int(self.accumulated_ms // self.interval_ms)
+        if ticks == 0:
+            return
+        if self.single_shot:
+            # Ako pri QTimer sa časovač zastaví pred vyslaním signálu (obsluha ho môže znova spustiť)
+            self.stop()
+            self.timeout.emit()
+            return
+        self.accumulated_ms -= ticks * self.interval_ms
+        if ticks > self.MAX_CATCHUP_TICKS:
+            # Preťaženie - zvyšné tiky sa zahodia
+            ticks = self.MAX_CATCHUP_TICKS
+            self.accumulated_ms = 0.0
+
+        for _ in range(ticks):
+            # Obsluha signálu môže časovač zastaviť alebo reštartovať
+            if not self.active:
+                break
+            self.timeout.emit()
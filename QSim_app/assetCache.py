@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+from PyQt6.QtSvg import QSvgRenderer
+from PyQt6.QtGui import QPixmap, QPainter, QGuiApplication
+from PyQt6.QtCore import Qt, QSize
+
+
+class AssetCache:
+    """Zdieľaná cache SVG rendererov a rastrovaných obrázkov pre celú aplikáciu.
+
+    Každý SVG súbor sa načíta a sparsuje iba raz. Rastrované obrázky sa ukladajú
+    podľa veľkosti a pomeru pixelov zariadenia a pri prekročení kapacity sa
+    odstraňujú najdlhšie nepoužité (LRU). Renderery sa neodstraňujú, pretože
+    na ne odkazujú živé QGraphicsSvgItem prvky scén.
+    """
+
+    def __init__(self, max_pixmaps=64):
+        """Inicializácia prázdnej cache s kapacitou pre rastrované obrázky"""
+        self.max_pixmaps = max_pixmaps
+        self.renderers = {}
+        self.pixmaps = OrderedDict()
+
+    def renderer(self, path):
+        """Vráti zdieľaný QSvgRenderer pre daný SVG súbor"""
+        renderer = self.renderers.get(path)
+        if renderer is None:
+            renderer = QSvgRenderer(path)
+            self.renderers[path] = renderer
+        return renderer
+
+    def pixmap(self, path, size=None, device_pixel_ratio=None):
+        """Vráti SVG súbor rastrovaný do QPixmap (pre každú veľkosť a DPR iba raz)"""
+        renderer = self.renderer(path)
+        if size is None:
+            size = renderer.defaultSize()
+        elif not isinstance(size, QSize):
+            size = QSize(*size)
+        if device_pixel_ratio is None:
+            device_pixel_ratio = default_device_pixel_ratio()
+
+        key = (path, size.width(), size.height(), device_pixel_ratio)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+
+        pixmap = self.rasterize(renderer, size, device_pixel_ratio)
+        self.pixmaps[key] = pixmap
+        if len(self.pixmaps) > self.max_pixmaps:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def rasterize(self, renderer, size, device_pixel_ratio):
+        """Vykreslenie SVG do priehľadného QPixmap v rozlíšení zariadenia"""
+        pixmap = QPixmap(round(size.width() * device_pixel_ratio), round(size.height() * device_pixel_ratio))
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        renderer.render(painter)
+        painter.end()
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        return pixmap
+
+    def clear(self):
+        """Vyprázdnenie cache rastrovaných obrázkov"""
+        self.pixmaps.clear()
+
+
+def default_device_pixel_ratio():
+    """Vráti pomer pixelov hlavnej obrazovky (1.0, ak nie je k dispozícii)"""
+    screen = QGuiApplication.primaryScreen()
+    return screen.devicePixelRatio() if screen is not None else 1.0
+
+
+# Jediná inštancia zdieľaná všetkými protokolmi
+shared = AssetCache()
+
+
+def svg_renderer(path):
+    """Vráti zdieľaný QSvgRenderer zo spoločnej cache"""
+    return shared.renderer(path)
+
+
+def svg_pixmap(path, size=None, device_pixel_ratio=None):
+    """Vráti rastrovaný SVG obrázok zo spoločnej cache"""
+    return shared.pixmap(path, size, device_pixel_ratio)
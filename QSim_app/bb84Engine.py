@@ -0,0 +1,216 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+# Kódovanie báz v poliach: 0 = rektilineárna (⨁), 1 = diagonálna (⨂)
+RECTILINEAR = 0
+DIAGONAL = 1
+BASIS_SYMBOLS = ("⨁", "⨂")
+
+# Predvolená veľkosť bloku pri spracovaní veľkého počtu fotónov
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+
+class BB84Batch:
+    """Výsledok simulácie BB84 pre blok fotónov uložený v NumPy poliach"""
+
+    def __init__(self, alice_bits, alice_bases, bob_bases, bob_bits, intercepted=None, detected=None):
+        """Inicializácia bloku z polí bitov a báz (uint8) a masiek zachytených a zaznamenaných fotónov"""
+        self.alice_bits = alice_bits
+        self.alice_bases = alice_bases
+        self.bob_bases = bob_bases
+        self.bob_bits = bob_bits
+        self.intercepted = intercepted
+        self.detected = np.ones(len(alice_bits), dtype=bool) if detected is None else detected
+        self.basis_match = alice_bases == bob_bases
+        # Do preosiateho kľúča idú zaznamenané impulzy so zhodnou bázou
+        self.sifted = self.basis_match & self.detected
+
+    def __len__(self):
+        return len(self.alice_bits)
+
+    def sifted_key(self):
+        """Vráti Alicin a Bobov preosiaty kľúč (zaznamenané pozície so zhodnou bázou)"""
+        return self.alice_bits[self.sifted], self.bob_bits[self.sifted]
+
+    def statistics(self):
+        """Štatistiky zhody báz a chybovosti preosiateho kľúča"""
+        alice_key, bob_key = self.sifted_key()
+        return make_statistics(len(self), len(alice_key), int(np.count_nonzero(alice_key != bob_key)))
+
+
+def make_statistics(photons, sifted_bits, errors):
+    """Zostavenie slovníka štatistík z počtov fotónov, preosiatych bitov a chýb"""
+    return {
+        "photons": photons,
+        "sifted_bits": sifted_bits,
+        "errors": errors,
+        "match_rate": sifted_bits / photons if photons else 0.0,
+        "qber": errors / sifted_bits if sifted_bits else 0.0,
+    }
+
+
+def random_bits(rng, n):
+    """Vygenerovanie n náhodných bitov (uint8) naraz"""
+    return rng.integers(0, 2, size=n, dtype=np.uint8)
+
+
+def measure(alice_bits, alice_bases, bob_bases, rng):
+    """Bobovo meranie: pri zhodnej báze dostane Alicin bit, inak náhodný výsledok"""
+    return np.where(alice_bases == bob_bases, alice_bits, random_bits(rng, len(alice_bits)))
+
+
+def intercept_resend(alice_bits, alice_bases, rng, fraction=1.0, eve_basis=None):
+    """Útok zachyť a pošli ďalej: Eva zmeria časť fotónov a Bobovi pošle nový stav.
+
+    Eva meria v náhodnej báze, alebo vždy v pevnej báze eve_basis (0/1).
+    Vráti bity a bázy fotónov, ktoré dorazia k Bobovi, a masku zachytených fotónov.
+    """
+    n = len(alice_bits)
+    if fraction >= 1.0:
+        intercepted = np.ones(n, dtype=bool)
+    else:
+        intercepted = rng.random(n) < fraction
+
+    if eve_basis is None:
+        eve_bases = random_bits(rng, n)
+    else:
+        eve_bases = np.full(n, eve_basis, dtype=np.uint8)
+    eve_bits = measure(alice_bits, alice_bases, eve_bases, rng)
+
+    sent_bits = np.where(intercepted, eve_bits, alice_bits)
+    sent_bases = np.where(intercepted, eve_bases, alice_bases)
+    return sent_bits, sent_bases, intercepted
+
+
+def run_bb84(n=None, rng=None, alice_bits=None, eve_fraction=0.0, eve_basis=None, channel=None, parties=None):
+    """Simulácia BB84 pre n fotónov naraz (Alicine bity je možné zadať).
+
+    Pri eve_fraction > 0 je medzi Alicou a Bobom Eva s útokom zachyť a pošli ďalej.
+    Fyzický kanál (napr. channelModel.FiberChannel) určí straty a šum detekcie;
+    bez neho dorazí a zaznamená sa každý fotón. Slovník parties môže každej strane
+    ("alice", "bob", "eve") dať vlastný generátor (rngService.parties); chýbajúce
+    strany použijú rng.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    parties = parties or {}
+    alice_rng = parties.get("alice", rng)
+    bob_rng = parties.get("bob", rng)
+    eve_rng = parties.get("eve", rng)
+
+    if alice_bits is None:
+        alice_bits = random_bits(alice_rng, n)
+    else:
+        alice_bits = np.asarray(alice_bits, dtype=np.uint8)
+        n = len(alice_bits)
+
+    alice_bases = random_bits(alice_rng, n)
+    bob_bases = random_bits(bob_rng, n)
+
+    # Kvantový kanál - bez Evy dorazí k Bobovi pôvodný stav
+    intercepted = None
+    channel_bits, channel_bases = alice_bits, alice_bases
+    if eve_fraction > 0:
+        channel_bits, channel_bases, intercepted = intercept_resend(alice_bits, alice_bases, eve_rng,
+                                                                    eve_fraction, eve_basis)
+
+    # Výsledok merania aj šum detektorov patria Bobovej strane
+    detected = None
+    if channel is None:
+        bob_bits = measure(channel_bits, channel_bases, bob_bases, bob_rng)
+    else:
+        bob_bits, detected = channel.transmit(channel_bits, channel_bases, bob_bases, bob_rng)
+    return BB84Batch(alice_bits, alice_bases, bob_bases, bob_bits, intercepted, detected)
+
+
+def run_bb84_statistics(n, rng=None, chunk_size=DEFAULT_CHUNK_SIZE, eve_fraction=0.0, eve_basis=None,
+                        channel=None):
+    """Štatistiky BB84 pre ľubovoľne veľa fotónov, spracované po blokoch.
+
+    Pamäť je ohraničená veľkosťou bloku, takže sa dá simulovať aj 10^9 fotónov.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    if channel is not None:
+        channel.reset_detector()
+
+    sifted_bits = 0
+    errors = 0
+    remaining = n
+    while remaining > 0:
+        batch = run_bb84(min(chunk_size, remaining), rng, eve_fraction=eve_fraction, eve_basis=eve_basis,
+                         channel=channel)
+        alice_key, bob_key = batch.sifted_key()
+        sifted_bits += len(alice_key)
+        errors += int(np.count_nonzero(alice_key != bob_key))
+        remaining -= len(batch)
+    return make_statistics(n, sifted_bits, errors)
+
+
+def run_bb84_chunks(bit_chunks, rng=None, eve_fraction=0.0, eve_basis=None, channel=None, parties=None):
+    """Simulácia BB84 po blokoch zadaných Alicinych bitov (napr. bitSource.BitFile.chunks())"""
+    if rng is None:
+        rng = np.random.default_rng()
+    if channel is not None:
+        channel.reset_detector()
+    for alice_bits in bit_chunks:
+        if len(alice_bits):
+            yield run_bb84(rng=rng, alice_bits=alice_bits, eve_fraction=eve_fraction, eve_basis=eve_basis,
+                           channel=channel, parties=parties)
+
+
+def batch_statistics(batches):
+    """Súhrnné štatistiky z prúdu blokov BB84 (bloky sa nikde neuchovávajú)"""
+    photons = 0
+    sifted_bits = 0
+    errors = 0
+    for batch in batches:
+        alice_key, bob_key = batch.sifted_key()
+        photons += len(batch)
+        sifted_bits += len(alice_key)
+        errors += int(np.count_nonzero(alice_key != bob_key))
+    return make_statistics(photons, sifted_bits, errors)
+
+
+def qber_confidence_interval(errors, sifted_bits, confidence=0.95):
+    """Wilsonov interval spoľahlivosti pre QBER z počtu chýb a preosiatych bitov"""
+    if sifted_bits == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = errors / sifted_bits
+    denominator = 1 + z * z / sifted_bits
+    center = (p + z * z / (2 * sifted_bits)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / sifted_bits + z * z / (4 * sifted_bits * sifted_bits)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def estimate_qber(n, rng=None, eve_fraction=0.0, eve_basis=None, confidence=0.95,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+    """Odhad QBER pre n fotónov s intervalom spoľahlivosti"""
+    stats = run_bb84_statistics(n, rng, chunk_size, eve_fraction, eve_basis)
+    stats["eve_fraction"] = eve_fraction
+    stats["qber_low"], stats["qber_high"] = qber_confidence_interval(stats["errors"], stats["sifted_bits"],
+                                                                     confidence)
+    return stats
+
+
+def _interception_sweep_point(args):
+    """Jeden bod rozmietania - spúšťa sa v samostatnom procese"""
+    fraction, n, eve_basis, confidence, seed = args
+    return estimate_qber(n, np.random.default_rng(seed), fraction, eve_basis, confidence)
+
+
+def sweep_interception(fractions, n, eve_basis=None, confidence=0.95, seed=None, processes=None):
+    """Rozmietanie QBER cez podiel zachytených fotónov, paralelne v skupine procesov.
+
+    Každý bod dostane nezávislý prúd náhodných čísel odvodený zo seed, takže
+    výsledky sú pri rovnakom seed reprodukovateľné.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(fractions))
+    tasks = [(fraction, n, eve_basis, confidence, child) for fraction, child in zip(fractions, seeds)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_interception_sweep_point, tasks))
@@ -0,0 +1,123 @@
+import os
+
+import numpy as np
+
+from QSim_app.bb84Engine import DEFAULT_CHUNK_SIZE
+
+# Formáty súborov s Alicinými bitmi
+ASCII = "ascii"    # text zo znakov 0 a 1 (medzery a konce riadkov sa ignorujú)
+PACKED = "packed"  # binárny súbor, 8 bitov v bajte, najvyšší bit prvý
+NPY = "npy"        # jednorozmerné pole NumPy s hodnotami 0/1
+
+# Prípony súborov pre automatické rozpoznanie formátu
+PACKED_EXTENSIONS = (".bin", ".dat", ".raw")
+
+ZERO = ord("0")
+ONE = ord("1")
+WHITESPACE = np.array([ord(" "), ord("\t"), ord("\n"), ord("\r")], dtype=np.uint8)
+
+
+def detect_format(path):
+    """Formát súboru podľa prípony"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return NPY
+    if extension in PACKED_EXTENSIONS:
+        return PACKED
+    return ASCII
+
+
+def parse_ascii(raw):
+    """Bity z bajtov textu (pole uint8); vráti bity a index prvého neplatného znaku alebo None"""
+    is_bit = (raw == ZERO) | (raw == ONE)
+    invalid = np.flatnonzero(~is_bit & ~np.isin(raw, WHITESPACE))
+    if len(invalid):
+        return None, int(invalid[0])
+    return raw[is_bit] - ZERO, None
+
+
+def parse_text(text):
+    """Bity zo zadaného reťazca (napr. z poľa vlastnej sekvencie); None pri neplatnom znaku"""
+    bits, _ = parse_ascii(np.frombuffer(text.encode("utf-8"), dtype=np.uint8))
+    return bits
+
+
+class BitFile:
+    """Alicine bity zo súboru mapovaného do pamäte (mmap).
+
+    Súbor sa nikdy nenačíta celý - kontrola aj prevod na bity prebieha po blokoch
+    nad np.memmap (pri .npy cez np.load s mmap_mode), takže pamäť nezávisí od
+    veľkosti súboru ani pri stovkách megabitov.
+    """
+
+    def __init__(self, path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Otvorenie a kontrola súboru; pri neplatnom obsahu vyvolá ValueError"""
+        self.path = path
+        self.name = os.path.basename(path)
+        self.format = file_format or detect_format(path)
+        self.chunk_size = chunk_size
+
+        if self.format == NPY:
+            data = np.load(path, mmap_mode="r", allow_pickle=False)
+            if data.dtype.kind not in "biu":
+                raise ValueError(f"Súbor {self.name} neobsahuje celé čísla (typ {data.dtype}).")
+            self.data = data.reshape(-1)
+        elif os.path.getsize(path) == 0:
+            # Prázdny súbor sa nedá namapovať
+            self.data = np.zeros(0, dtype=np.uint8)
+        else:
+            self.data = np.memmap(path, dtype=np.uint8, mode="r")
+
+        self.length = self.validate()
+
+    def __len__(self):
+        return self.length
+
+    def raw_chunks(self):
+        """Bloky surových dát (bajty alebo prvky poľa) ako pohľady do mapovaného súboru"""
+        step = self.chunk_size // 8 if self.format == PACKED else self.chunk_size
+        for start in range(0, len(self.data), step):
+            yield start, self.data[start:start + step]
+
+    def validate(self):
+        """Vektorová kontrola celého súboru po blokoch; vráti počet bitov"""
+        if self.format == PACKED:
+            return 8 * len(self.data)
+
+        length = 0
+        for start, raw in self.raw_chunks():
+            if self.format == NPY:
+                invalid = np.flatnonzero((raw != 0) & (raw != 1))
+                if len(invalid):
+                    position = start + int(invalid[0])
+                    raise ValueError(f"Súbor {self.name} obsahuje hodnotu {raw[invalid[0]]} "
+                                     f"na pozícii {position} (povolené sú iba 0 a 1).")
+                length += len(raw)
+            else:
+                bits, invalid = parse_ascii(raw)
+                if invalid is not None:
+                    raise ValueError(f"Súbor {self.name} obsahuje neplatný znak na pozícii {start + invalid} "
+                                     f"(povolené sú iba 0, 1 a medzery).")
+                length += len(bits)
+        return length
+
+    def chunks(self):
+        """Generátor blokov bitov (uint8), každý najviac chunk_size bitov"""
+        for _, raw in self.raw_chunks():
+            if self.format == PACKED:
+                yield np.unpackbits(raw)
+            elif self.format == NPY:
+                yield raw.astype(np.uint8)
+            else:
+                yield parse_ascii(raw)[0]
+
+    def head(self, n):
+        """Prvých n bitov súboru"""
+        parts = []
+        remaining = n
+        for bits in self.chunks():
+            parts.append(bits[:remaining])
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint8)
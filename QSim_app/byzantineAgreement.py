@@ -5,15 +5,20 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, QTimer, QPointF
 from PyQt6.QtGui import QPen, QBrush, QColor, QPainter, QFont, QPainterPath
 
-import random
 import math
+from QSim_app.animationClock import ClockTimer
+from QSim_app.instantMode import instant_checkbox, batched_update
+from QSim_app import rngService
 
 
 class QuantumByzantineAgreement(QWidget):
+    # Najväčší počet krokov vykonaných naraz v režime okamžitého výpočtu
+    MAX_INSTANT_STEPS = 100
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_step = 0
-        self.animation_timer = QTimer()
+        self.animation_timer = ClockTimer(self)
         self.animation_timer.timeout.connect(self.next_animation_step)
         self.animation_speed = 500  # ms medzi krokmi animácie
 
@@ -32,6 +37,10 @@ class QuantumByzantineAgreement(QWidget):
 
         self.initUI()
 
+    def animation_timers(self):
+        """Časovače animácie, ktoré sa pozastavia so skrytou kartou"""
+        return [self.animation_timer]
+
     def initUI(self):
         main_layout = QVBoxLayout()
 
@@ -67,6 +76,10 @@ class QuantumByzantineAgreement(QWidget):
         self.reset_button.clicked.connect(self.reset_protocol)
         controls_layout.addWidget(self.reset_button)
 
+        # Pri okamžitom výpočte tlačidlo animácie dokončí protokol naraz
+        self.instant_mode = instant_checkbox()
+        controls_layout.addWidget(self.instant_mode)
+
         controls_group.setLayout(controls_layout)
         main_layout.addWidget(controls_group)
 
@@ -272,7 +285,9 @@ class QuantumByzantineAgreement(QWidget):
         self.play_button.setText("Spustiť animáciu")
 
     def play_animation(self):
-        if self.animation_timer.isActive():
+        if self.instant_mode.isChecked():
+            self.complete_instantly()
+        elif self.animation_timer.isActive():
             self.animation_timer.stop()
             self.play_button.setText("Spustiť animáciu")
             self.step_button.setEnabled(True)
@@ -305,6 +320,16 @@ class QuantumByzantineAgreement(QWidget):
         self.update_node_table()
         self.draw_network()
 
+    def complete_instantly(self):
+        """Vykonanie všetkých zostávajúcich krokov protokolu naraz bez animácie"""
+        self.animation_timer.stop()
+        with batched_update(self):
+            # Poistka proti zacykleniu, ak by niektorá fáza nikdy neskončila
+            for _ in range(self.MAX_INSTANT_STEPS):
+                if self.protocol_complete:
+                    break
+                self.next_animation_step()
+
     def next_animation_step(self):
         self.step_animation()
 
@@ -318,7 +343,7 @@ class QuantumByzantineAgreement(QWidget):
         """Spracovanie fázy prípravy a distribúcie"""
         if self.current_step == 1:
             # Náhodne vyberieme uzol, ktorý pripraví qutrity
-            preparer = random.choice(["S", "R0", "R1"])
+            preparer = rngService.stream("qba.nodes").choice(["S", "R0", "R1"])
             recipients = [node for node in ["S", "R0", "R1"] if node != preparer]
 
             # Vytvorenie správ o distribúcii qutritov
@@ -343,7 +368,7 @@ class QuantumByzantineAgreement(QWidget):
             if self.byzantine_player == "S" and self.byzantine_behavior_combo.currentText() == "Odoslanie rozdielnych hodnôt":
                 # Byzantský odosielateľ posiela rozdielne bity
                 # Náhodne vyberieme, ktorý prijímateľ dostane konzistentné údaje
-                consistent_receiver = random.choice([0, 1])
+                consistent_receiver = rngService.stream("qba.sender").choice([0, 1])
 
                 if consistent_receiver == 0:
                     # R0 dostáva bit zodpovedajúci indexom, R1 dostáva opačný bit
@@ -0,0 +1,201 @@
+import math
+
+import numpy as np
+
+# Predvolený počet priechodov protokolu Cascade
+DEFAULT_PASSES = 4
+
+_ONE = np.uint64(1)
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def popcount64(words):
+    """Počet jednotkových bitov v každom 64-bitovom slove"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    # Staršie verzie NumPy nemajú bitwise_count - SWAR sčítanie po skupinách bitov
+    words = np.asarray(words, dtype=np.uint64)
+    words = words - ((words >> _ONE) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return (words * _H01) >> np.uint64(56)
+
+
+def parity64(words):
+    """Parita každého 64-bitového slova (0/1)"""
+    return (popcount64(words) & 1).astype(np.uint8)
+
+
+def pack_bits(bits):
+    """Zbalenie poľa bitov (0/1) do 64-bitových slov; bit i je v slove i // 64 na pozícii i % 64"""
+    bits = np.asarray(bits, dtype=np.uint8)
+    padded = np.zeros(-(-len(bits) // 64) * 64, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    return np.packbits(padded, bitorder="little").view("<u8").astype(np.uint64)
+
+
+def unpack_bits(words, n):
+    """Rozbalenie 64-bitových slov späť na pole n bitov (uint8)"""
+    return np.unpackbits(np.asarray(words, dtype="<u8").view(np.uint8), bitorder="little")[:n]
+
+
+def binary_entropy(p):
+    """Binárna entropia h(p) v bitoch"""
+    if p <= 0 or p >= 1:
+        return 0.0
+    return -p * math.log2(p) - (1 - p) * math.log2(1 - p)
+
+
+def default_block_sizes(qber, n, passes=DEFAULT_PASSES):
+    """Veľkosti blokov pre jednotlivé priechody: k1 = 0.73 / QBER, potom vždy dvojnásobok.
+
+    Parita bloku cez celý kľúč nezávisí od permutácie, preto sa priechody končia
+    prvým blokom, ktorý pokryje celý kľúč (ďalšie by iba odhalili ten istý bit).
+    """
+    first = n if qber <= 0 else max(4, int(0.73 / qber))
+    sizes = []
+    for i in range(passes):
+        sizes.append(min(n, first << i))
+        if sizes[-1] >= n:
+            break
+    return sizes
+
+
+class CascadePass:
+    """Jeden priechod Cascade: permutácia kľúča, zbalené slová a nepárne bloky"""
+
+    def __init__(self, errors, block_size, permutation=None):
+        """Inicializácia priechodu z poľa rozdielov kľúčov (v pôvodnom poradí)"""
+        n = len(errors)
+        self.n = n
+        self.block_size = block_size
+        self.permutation = permutation
+        if permutation is None:
+            self.position = None
+            self.words = pack_bits(errors)
+        else:
+            self.position = np.empty(n, dtype=np.int64)
+            self.position[permutation] = np.arange(n)
+            self.words = pack_bits(errors[permutation])
+        self.block_count = -(-n // block_size)
+        self.prefix = None
+        # Bloky, v ktorých sa parita Alicinho a Bobovho kľúča líši
+        self.odd = self.block_parities()
+
+    def positions(self, original):
+        """Prepočet pôvodných indexov bitov na indexy v poradí tohto priechodu"""
+        return original if self.position is None else self.position[original]
+
+    def originals(self, positions):
+        """Prepočet indexov v poradí priechodu na pôvodné indexy bitov"""
+        return positions if self.permutation is None else self.permutation[positions]
+
+    def prefix_parity(self, index):
+        """Parita bitov [0, index) pre pole indexov (paritou slov a popcountom zvyšku)"""
+        if self.prefix is None:
+            # Parita všetkých celých slov pred daným slovom
+            self.prefix = np.concatenate(([0], np.bitwise_xor.accumulate(parity64(self.words)))).astype(np.uint8)
+        word = index >> 6
+        offset = (index & 63).astype(np.uint64)
+        tail = np.zeros(len(index), dtype=np.uint64)
+        inside = word < len(self.words)
+        tail[inside] = self.words[word[inside]] & ((_ONE << offset[inside]) - _ONE)
+        return self.prefix[word] ^ parity64(tail)
+
+    def range_parity(self, start, end):
+        """Parita rozsahov bitov [start, end) v poradí priechodu"""
+        return self.prefix_parity(end) ^ self.prefix_parity(start)
+
+    def block_parities(self):
+        """Parita rozdielu Alicinho a Bobovho kľúča vo všetkých blokoch priechodu"""
+        starts = np.arange(self.block_count, dtype=np.int64) * self.block_size
+        return self.range_parity(starts, np.minimum(starts + self.block_size, self.n))
+
+    def bisect(self, blocks):
+        """Binárne vyhľadanie chybného bitu vo všetkých zadaných nepárnych blokoch naraz.
+
+        Vráti pozície chybných bitov a počet odhalených paritných bitov.
+        """
+        lo = blocks.astype(np.int64) * self.block_size
+        hi = np.minimum(lo + self.block_size, self.n)
+        leaked = 0
+        while True:
+            active = hi - lo > 1
+            count = int(np.count_nonzero(active))
+            if count == 0:
+                return lo, leaked
+            leaked += count
+            mid = (lo + hi) >> 1
+            left_odd = self.range_parity(lo, mid).astype(bool)
+            hi = np.where(active & left_odd, mid, hi)
+            lo = np.where(active & ~left_odd, mid, lo)
+
+    def flip(self, original):
+        """Oprava bitov na daných pôvodných indexoch a prepnutie parity dotknutých blokov"""
+        positions = self.positions(original)
+        np.bitwise_xor.at(self.words, positions >> 6, _ONE << (positions & 63).astype(np.uint64))
+        np.bitwise_xor.at(self.odd, positions // self.block_size, 1)
+        self.prefix = None
+
+
+def reconcile(alice_key, bob_key, qber=None, block_sizes=None, passes=DEFAULT_PASSES, rng=None):
+    """Oprava chýb Bobovho kľúča protokolom Cascade.
+
+    Kľúče sa spracúvajú zbalené v 64-bitových slovách a parity blokov sa počítajú
+    cez popcount. Nepárne bloky jedného priechodu sa bisektujú naraz; každá oprava
+    sa spätne premietne do blokov predchádzajúcich priechodov (kaskáda), až kým
+    nezostane žiadny nepárny blok. Simulácia porovnáva paritu rozdielu kľúčov, čo
+    zodpovedá porovnaniu Alicinej a Bobovej parity - každé porovnanie sa započíta
+    ako jeden odhalený bit.
+    """
+    alice_key = np.asarray(alice_key, dtype=np.uint8)
+    bob_key = np.asarray(bob_key, dtype=np.uint8)
+    n = len(alice_key)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    errors = alice_key ^ bob_key
+    if qber is None:
+        qber = float(errors.mean()) if n else 0.0
+    if block_sizes is None:
+        block_sizes = default_block_sizes(qber, n, passes)
+
+    corrected = bob_key.copy()
+    leaked = 0
+    started = []
+    for pass_index, block_size in enumerate(block_sizes):
+        if n == 0:
+            break
+        # Prvý priechod pracuje s kľúčom v pôvodnom poradí, ďalšie s náhodnou permutáciou
+        permutation = None if pass_index == 0 else rng.permutation(n)
+        current = CascadePass(errors, max(1, int(block_size)), permutation)
+        leaked += current.block_count
+        started.append(current)
+
+        # Kaskáda: vždy sa spracuje priechod s najmenšími blokmi, ktorý má nepárne bloky
+        while True:
+            pending = next((p for p in started if p.odd.any()), None)
+            if pending is None:
+                break
+            positions, bisect_leaked = pending.bisect(np.flatnonzero(pending.odd))
+            leaked += bisect_leaked
+            original = pending.originals(positions)
+            corrected[original] ^= 1
+            errors[original] ^= 1
+            for p in started:
+                p.flip(original)
+
+    residual = int(np.count_nonzero(errors))
+    return {
+        "key": corrected,
+        "bits": n,
+        "block_sizes": list(block_sizes),
+        "leaked_bits": leaked,
+        "corrected_bits": int(np.count_nonzero(corrected != bob_key)),
+        "residual_errors": residual,
+        "leak_rate": leaked / n if n else 0.0,
+        "efficiency": leaked / (n * binary_entropy(qber)) if n and 0 < qber < 1 else 0.0,
+    }
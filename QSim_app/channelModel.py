@@ -0,0 +1,201 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from QSim_app.bb84Engine import random_bits, run_bb84, DEFAULT_CHUNK_SIZE
+
+# Výsledky rozmietania cez vzdialenosť podľa hashu parametrov (najviac MAX_SWEEP_CACHE,
+# najstaršie sa zahodia)
+MAX_SWEEP_CACHE = 64
+_sweep_cache = {}
+
+
+class FiberChannel:
+    """Fyzická vrstva BB84: útlm vlákna, účinnosť a šum detektorov, mŕtvy čas a nesúosovosť.
+
+    Každý fotón sa po prvkoch poľa buď stratí, alebo dorazí k Bobovi. Bob má v
+    zvolenej báze dva detektory (0 a 1); každý môže navyše vydať temný impulz.
+    Dvojité kliknutie sa priradí náhodnému bitu. Mŕtvy čas platí pre celý Bobov
+    detekčný modul a meria sa v počte impulzov zdroja; zvyšok mŕtveho času na konci
+    bloku sa prenáša do ďalšieho volania transmit (reset_detector začne nový beh).
+    """
+
+    def __init__(self, distance_km=0.0, attenuation_db_km=0.2, detector_efficiency=0.1,
+                 dark_count_probability=1e-6, dead_time_s=0.0, pulse_rate_hz=1e9, misalignment=0.01):
+        """Inicializácia kanála s parametrami vlákna a detektorov"""
+        self.distance_km = distance_km
+        self.attenuation_db_km = attenuation_db_km
+        self.detector_efficiency = detector_efficiency
+        self.dark_count_probability = dark_count_probability
+        self.dead_time_s = dead_time_s
+        self.pulse_rate_hz = pulse_rate_hz
+        self.misalignment = misalignment
+        # Počet impulzov na začiatku ďalšieho bloku, počas ktorých je detektor ešte mŕtvy
+        self._dead_carry = 0
+
+    def parameters(self):
+        """Slovník parametrov kanála (kópia pre iné vzdialenosti, hash pre cache)"""
+        return {name: value for name, value in vars(self).items() if not name.startswith("_")}
+
+    def reset_detector(self):
+        """Detektor bez zvyšku mŕtveho času (začiatok nového behu)"""
+        self._dead_carry = 0
+
+    def at_distance(self, distance_km):
+        """Rovnaký kanál s inou dĺžkou vlákna"""
+        parameters = self.parameters()
+        parameters["distance_km"] = distance_km
+        return FiberChannel(**parameters)
+
+    def transmittance(self, distance_km=None):
+        """Celková priepustnosť vlákna a detektora (aj pre pole vzdialeností)"""
+        if distance_km is None:
+            distance_km = self.distance_km
+        return 10 ** (-self.attenuation_db_km * np.asarray(distance_km) / 10) * self.detector_efficiency
+
+    def dead_time_pulses(self):
+        """Mŕtvy čas detektora v počte impulzov zdroja"""
+        return int(np.ceil(self.dead_time_s * self.pulse_rate_hz))
+
+    def transmit(self, channel_bits, channel_bases, bob_bases, rng, arrival_probability=None):
+        """Prenos a detekcia poľa fotónov; vráti Bobove bity a masku zaznamenaných impulzov.
+
+        Pravdepodobnosť, že impulz vyvolá kliknutie signálom, je predvolene priepustnosť
+        kanála; pri viacfotónových impulzoch ju zadá zdroj pre každý impulz zvlášť.
+        """
+        n = len(channel_bits)
+        if arrival_probability is None:
+            arrival_probability = self.transmittance()
+        arrived = rng.random(n) < arrival_probability
+
+        # Pri zhodnej báze dopadne fotón na správny detektor, okrem chyby nesúosovosti
+        flip = rng.random(n) < self.misalignment
+        signal_bits = np.where(channel_bases == bob_bases, channel_bits ^ flip, random_bits(rng, n))
+
+        fire_0 = (arrived & (signal_bits == 0)) | (rng.random(n) < self.dark_count_probability)
+        fire_1 = (arrived & (signal_bits == 1)) | (rng.random(n) < self.dark_count_probability)
+        detected = fire_0 | fire_1
+        bob_bits = np.where(fire_0 & fire_1, random_bits(rng, n), fire_1.astype(np.uint8))
+
+        dead_pulses = self.dead_time_pulses()
+        if dead_pulses > 0:
+            detected, self._dead_carry = apply_dead_time(detected, dead_pulses, self._dead_carry)
+        return bob_bits, detected
+
+
+def apply_dead_time(detected, dead_pulses, carry=0):
+    """Vyradenie kliknutí počas mŕtveho času po predchádzajúcej detekcii.
+
+    carry je počet úvodných impulzov bloku, počas ktorých detektor ešte nie je
+    pripravený (zvyšok z predchádzajúceho bloku). Kliknutie vzdialené od
+    predchádzajúceho kliknutia aspoň o mŕtvy čas sa prijme vždy - to sa určí
+    vektorovo. Cyklus beží iba cez kliknutia v zhlukoch bližších ako mŕtvy čas.
+    Vráti masku prijatých kliknutí a carry pre ďalší blok.
+    """
+    n = len(detected)
+    clicks = np.flatnonzero(detected)
+    if len(clicks) == 0:
+        return np.zeros_like(detected), max(0, carry - n)
+
+    # Posledné prijaté kliknutie pred blokom (virtuálne, podľa carry)
+    gaps = np.diff(clicks, prepend=carry - dead_pulses)
+    accepted = gaps >= dead_pulses
+    last = carry - dead_pulses
+    for index in np.flatnonzero(~accepted).tolist():
+        # Predchádzajúce kliknutie bolo prijaté, inak je last z predchádzajúcej iterácie
+        if index > 0 and accepted[index - 1]:
+            last = int(clicks[index - 1])
+        if clicks[index] >= last + dead_pulses:
+            accepted[index] = True
+
+    accepted_clicks = clicks[accepted]
+    if len(accepted_clicks) == 0:
+        # Všetky kliknutia padli do mŕtveho času preneseného z predchádzajúceho bloku
+        return np.zeros_like(detected), max(0, carry - n)
+    result = np.zeros_like(detected)
+    result[accepted_clicks] = True
+    return result, max(0, int(accepted_clicks[-1]) + dead_pulses - n)
+
+
+def expected_rates(channel, distances_km):
+    """Analytický odhad rýchlosti preosiateho kľúča (na impulz) a QBER pre pole vzdialeností.
+
+    Mŕtvy čas sa v odhade zanedbáva.
+    """
+    eta = channel.transmittance(distances_km)
+    dark = channel.dark_count_probability
+    no_dark = (1 - dark) ** 2
+    click = 1 - (1 - eta) * no_dark
+    # Chybný detektor klikne pri nesúosovosti alebo temným impulzom, polovica dvojitých kliknutí je chybná
+    wrong = eta * channel.misalignment * (1 - dark) + (1 - eta) * dark * (1 - dark) + eta * dark / 2 \
+        + (1 - eta) * dark * dark / 2
+    return {"distance_km": np.asarray(distances_km, dtype=float), "sifted_rate": click / 2, "qber": wrong / click}
+
+
+def simulate_distance(channel, photons, rng=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Monte Carlo simulácia BB84 cez kanál: počty detekcií, preosiatych bitov a chýb"""
+    if rng is None:
+        rng = np.random.default_rng()
+    channel.reset_detector()
+    detected = 0
+    sifted_bits = 0
+    errors = 0
+    remaining = photons
+    while remaining > 0:
+        batch = run_bb84(min(chunk_size, remaining), rng, channel=channel)
+        alice_key, bob_key = batch.sifted_key()
+        detected += int(np.count_nonzero(batch.detected))
+        sifted_bits += len(alice_key)
+        errors += int(np.count_nonzero(alice_key != bob_key))
+        remaining -= len(batch)
+    return {
+        "distance_km": channel.distance_km,
+        "photons": photons,
+        "detected": detected,
+        "sifted_bits": sifted_bits,
+        "errors": errors,
+        "sifted_rate": sifted_bits / photons if photons else 0.0,
+        "qber": errors / sifted_bits if sifted_bits else 0.0,
+    }
+
+
+def _distance_sweep_point(args):
+    """Jeden bod rozmietania - spúšťa sa v samostatnom procese"""
+    parameters, photons, seed = args
+    return simulate_distance(FiberChannel(**parameters), photons, np.random.default_rng(seed))
+
+
+def parameter_hash(channel, distances_km, photons, seed):
+    """Hash parametrov rozmietania pre cache výsledkov"""
+    key = repr((sorted(channel.parameters().items()), [float(d) for d in distances_km], photons, seed))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def clear_sweep_cache():
+    """Vyprázdnenie cache výsledkov rozmietania"""
+    _sweep_cache.clear()
+
+
+def sweep_distance(channel, distances_km, photons, seed=None, processes=None):
+    """Krivky rýchlosti preosiateho kľúča a QBER cez vzdialenosť, paralelne v skupine procesov.
+
+    Výsledky sa ukladajú podľa hashu parametrov, takže opakované rozmietanie s
+    rovnakými parametrami (a rovnakým seed) sa nepočíta znova.
+    """
+    key = parameter_hash(channel, distances_km, photons, seed)
+    if seed is not None and key in _sweep_cache:
+        return _sweep_cache[key]
+
+    seeds = np.random.SeedSequence(seed).spawn(len(distances_km))
+    tasks = [(channel.at_distance(float(distance)).parameters(), photons, child)
+             for distance, child in zip(distances_km, seeds)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        points = list(pool.map(_distance_sweep_point, tasks, chunksize=max(1, len(tasks) // 64)))
+
+    result = {name: np.array([point[name] for point in points]) for name in points[0]} if points else {}
+    if seed is not None:
+        while len(_sweep_cache) >= MAX_SWEEP_CACHE:
+            _sweep_cache.pop(next(iter(_sweep_cache)))
+        _sweep_cache[key] = result
+    return result
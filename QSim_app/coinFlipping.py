@@ -1,19 +1,36 @@
-import random
-import json
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget, QTableWidgetItem, QHeaderView)
+import numpy as np
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableView, QHeaderView, QSpinBox)
 from PyQt6.QtCore import Qt
 
+from QSim_app import rngService
+from QSim_app.coinStrategies import measure_balanced
+from QSim_app.coinTournament import BASIS_NAMES, DEFAULT_PHOTONS
+from QSim_app.coinTableModel import CoinTableModel
+from QSim_app.coinResults import OrientationReveal, BitsReveal, AllBitsReveal, GuessOutcome
+
+# Najväčší počet fotónov v jednej hre
+MAX_PHOTONS = 10 ** 7
+
+# Počet odhalených bitov vypísaných v informačnom riadku
+REVEAL_PREVIEW = 24
+
+EMPTY_BITS = np.zeros(0, dtype=np.uint8)
+
+
 class CoinFlipping(QWidget):
     def __init__(self, parent=None):
         """Inicializácia komponentu pre kvantový hod mincou"""
         super().__init__(parent)
-        self.random_bits = []
+        # Stav hry sú NumPy stĺpce; bázy sú kódované ako v bb84Engine (BASIS_NAMES)
+        self.photons = DEFAULT_PHOTONS
+        self.random_bits = EMPTY_BITS
         self.alice_orientation = None
         self.bob_orientation = None
-        self.results = []
-        self.measurement_results = []
-        self.measurement_bases = []
-        self.alice_bits = {'rektilineárna': [], 'diagonálna': []}
+        self.results = EMPTY_BITS
+        self.measurement_results = EMPTY_BITS
+        self.measurement_bases = EMPTY_BITS
+        self.alice_bits = {'rektilineárna': EMPTY_BITS, 'diagonálna': EMPTY_BITS}
+        self.outcome = None
 
         self.initUI()
 
@@ -32,6 +49,12 @@ class CoinFlipping(QWidget):
         # Tlačidlá
         self.button_layout = QHBoxLayout()
 
+        self.button_layout.addWidget(QLabel("Počet fotónov:"))
+        self.photons_spinbox = QSpinBox()
+        self.photons_spinbox.setRange(2, MAX_PHOTONS)
+        self.photons_spinbox.setValue(self.photons)
+        self.button_layout.addWidget(self.photons_spinbox)
+
         self.start_button = QPushButton("Spustenie hry")
         self.start_button.clicked.connect(self.startGame)
         # Nastavenie pozadia pre start_button
@@ -71,9 +94,9 @@ class CoinFlipping(QWidget):
         self.layout.addLayout(self.button_layout)
 
         # Tabuľka
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["#", "Aliciné bity", "Aliciná báza", "Bobová báza", "Bobové bity", "Meranie v rovnakej bázi"])
+        self.table = QTableView()
+        self.table_model = CoinTableModel(self)
+        self.table.setModel(self.table_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.table.verticalHeader().setVisible(False)  # Skryť vertikálnu hlavičku, aby sa neduplikovali čísla riadkov
         self.layout.addWidget(self.table)
@@ -87,39 +110,29 @@ class CoinFlipping(QWidget):
         else:
             return None
 
-    def start_game(self):
+    def alice_basis(self):
+        """Kód Alicinej bázy (index do BASIS_NAMES)"""
+        return BASIS_NAMES.index(self.alice_orientation)
+
+    def start_game(self, photons=None):
         """Inicializuje nový stav hry a generuje náhodné bity"""
-        self.random_bits = [random.choice([0, 1]) for _ in range(12)]
+        if photons is not None:
+            self.photons = photons
+        self.random_bits = rngService.stream("coin.alice").bits(self.photons)
         self.alice_orientation = None
         self.bob_orientation = None
-        self.results = []
-        self.measurement_results = []
-        self.measurement_bases = []
-        self.alice_bits = {'rektilineárna': [], 'diagonálna': []}
+        self.results = EMPTY_BITS
+        self.measurement_results = EMPTY_BITS
+        self.measurement_bases = EMPTY_BITS
+        self.alice_bits = {'rektilineárna': EMPTY_BITS, 'diagonálna': EMPTY_BITS}
+        self.outcome = None
         return {"Náhodné bity": self.random_bits}
 
     def startGame(self):
         """Obsluha tlačidla pre začatie hry"""
-        data = self.start_game()
+        data = self.start_game(self.photons_spinbox.value())
         self.info_label.setText("Alice vygenerovala sekvenciu bitov a volí si svoju bázu.")
-        self.table.setRowCount(0)
-        bits = data["Náhodné bity"]
-        for i, b in enumerate(bits):
-            self.table.insertRow(i)
-            # Naplnenie tabuľky
-            self.table.setItem(i, 0, QTableWidgetItem(str(i+1)))
-            self.table.setItem(i, 1, QTableWidgetItem(str(b)))
-            self.table.setItem(i, 2, QTableWidgetItem("N/A"))
-            self.table.setItem(i, 3, QTableWidgetItem("N/A"))
-            self.table.setItem(i, 4, QTableWidgetItem("N/A"))
-            self.table.setItem(i, 5, QTableWidgetItem("N/A"))
-
-        # Centrovanie položiek
-        for r in range(self.table.rowCount()):
-            for c in range(self.table.columnCount()):
-                item = self.table.item(r, c)
-                if item is not None:
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table_model.set_game(data["Náhodné bity"])
 
     def choose_alice_orientation(self, orientation):
         """Logika pre výber Alicinej orientácie bázy"""
@@ -129,7 +142,7 @@ class CoinFlipping(QWidget):
         # Alice kóduje bity v zvolenej báze
         self.alice_bits[orientation] = self.random_bits.copy()
         other_orientation = self.opposite_orientation()
-        self.alice_bits[other_orientation] = [random.choice([0, 1]) for _ in self.random_bits]
+        self.alice_bits[other_orientation] = rngService.stream("coin.alice").bits(len(self.random_bits)).copy()
         return f"Alice si vybrala bázu. Bob začne meranie."
 
     def chooseAlice(self, orientation):
@@ -144,12 +157,11 @@ class CoinFlipping(QWidget):
         if len(self.measurement_results) > 0:
             return "Bob už vykonal meranie."
 
-        self.measurement_results = [True]*6 + [False]*6
-        random.shuffle(self.measurement_results)
-        self.measurement_bases = [
-            self.alice_orientation if correct else self.opposite_orientation()
-            for correct in self.measurement_results
-        ]
+        # Presne polovica fotónov (zaokrúhlené nadol) sa meria v Alicinej báze
+        photons = len(self.random_bits)
+        self.measurement_results = measure_balanced(rngService.generator("coin.bob"), 1, photons, None)[0].astype(bool)
+        alice_basis = self.alice_basis()
+        self.measurement_bases = np.where(self.measurement_results, alice_basis, 1 - alice_basis).astype(np.uint8)
         return "Bob vykonal meranie polovice fotónov v správnej báze a polovice v nesprávnej báze. Háda správnu bázu."
 
     def measureBob(self):
@@ -158,34 +170,28 @@ class CoinFlipping(QWidget):
         self.info_label.setText(msg)
 
     def choose_bob_orientation(self, orientation):
-        """Logika pre Bobov výber orientácie bázy"""
+        """Logika pre Bobov výber orientácie bázy; vráti GuessOutcome alebo chybovú správu"""
         if orientation not in ['rektilineárna', 'diagonálna']:
             return "Neplatná orientácia."
-        if not self.measurement_results:
+        if len(self.measurement_results) == 0:
             return "Bob musí najprv vykonať meranie."
         self.bob_orientation = orientation
         self.calculate_results()
-        if self.bob_orientation == self.alice_orientation:
-            outcome = f"Bob uhádol správnu bázu: {self.bob_orientation}."
-        else:
-            outcome = f"Bob uhádol nesprávnu bázu: {self.bob_orientation}."
-        return outcome
+        self.outcome = GuessOutcome(self.bob_orientation, self.alice_orientation)
+        return self.outcome
 
     def chooseBob(self, orientation):
         """Obsluha tlačidiel pre Bobov výber orientácie"""
-        msg = self.choose_bob_orientation(orientation)
-        self.info_label.setText(msg)
-
-        # Odhalenie Alicinej orientácie
-        alice_or = self.reveal_alice_orientation()
-        data = json.loads(alice_or)
-        self.info_label.setText(self.info_label.text())
-
-        # Odhalenie bitov
-        if "uhádol správnu bázu" in msg or "uhádol nesprávnu bázu" in msg:
+        outcome = self.choose_bob_orientation(orientation)
+        if isinstance(outcome, GuessOutcome):
+            # Odhalenie Alicinej orientácie a bitov v zvolenej báze
             bits = self.reveal_alice_bits()
-            bits_data = json.loads(bits)["Alice_bits"]
-            self.info_label.setText(self.info_label.text() + " Alice odhalila svoje bity v zvolenej báze: " + ", ".join(map(str,bits_data)) + ".")
+            shown = ", ".join(map(str, bits.bits[:REVEAL_PREVIEW]))
+            if len(bits.bits) > REVEAL_PREVIEW:
+                shown += f", … ({len(bits.bits)} bitov)"
+            self.info_label.setText(outcome.message + " Alice odhalila svoje bity v zvolenej báze: " + shown + ".")
+        else:
+            self.info_label.setText(outcome)
 
         self.updateResultsTable()
 
@@ -193,85 +199,30 @@ class CoinFlipping(QWidget):
         """Výpočet výsledkov meraní na základe báz"""
         if self.alice_orientation is None or self.bob_orientation is None:
             return
-        self.results = []
-        for i, bit in enumerate(self.random_bits):
-            if self.measurement_bases[i] == self.alice_orientation:
-                # Bob meral v rovnakej báze, ako Alice
-                result_bit = self.alice_bits[self.alice_orientation][i]
-            else:
-                # Nesprávna báza
-                result_bit = random.choice([0, 1])
-            self.results.append(result_bit)
+        # V rovnakej báze ako Alice Bob nameria jej bit, v nesprávnej náhodný bit
+        mismatch = self.measurement_bases != self.alice_basis()
+        random_fill = rngService.stream("coin.bob").bits(len(mismatch))
+        self.results = np.where(mismatch, random_fill, self.alice_bits[self.alice_orientation])
 
     def reveal_alice_orientation(self):
-        """Vráti Alicinu orientáciu"""
+        """Vráti Alicinu orientáciu (None, ak ešte nevybrala bázu)"""
         if self.alice_orientation is None:
-            return "Alice ešte nevybrala svoju bázu."
-        return json.dumps({"Alice_orientation": self.alice_orientation})
+            return None
+        return OrientationReveal(self.alice_orientation)
 
     def reveal_alice_bits(self):
-        """Vráti Alicine bity v zvolenej báze"""
+        """Vráti Alicine bity v zvolenej báze (None, ak ešte nevybrala bázu)"""
         if self.alice_orientation is None:
-            return "Alice ešte nevybrala svoju bázu."
-        return json.dumps({"Alice_bits": self.alice_bits[self.alice_orientation]})
+            return None
+        return BitsReveal(self.alice_orientation, self.alice_bits[self.alice_orientation])
 
     def reveal_all_alice_bits(self):
-        """Vráti všetky Alicine pôvodné bity"""
-        if not self.random_bits:
-            return "Hra ešte nebola spustená."
-        return json.dumps({"Alice_all_bits": self.random_bits})
-
-    def get_results(self):
-        """Získa kompletné výsledky pre zobrazenie v tabuľke"""
-        data = []
-        for i, bit in enumerate(self.random_bits):
-            alice_orientation = self.alice_orientation or "N/A"
-            bob_orientation = self.measurement_bases[i] if i < len(self.measurement_bases) else "N/A"
-            bob_bit = self.results[i] if i < len(self.results) else "N/A"
-            alice_bit = self.alice_bits[self.alice_orientation][i] if self.alice_orientation else "N/A"
-            measurement_correct = (bob_bit == alice_bit)
-            data.append({
-                "bit_number": i+1,
-                "alice_bit": bit,
-                "alice_orientation": alice_orientation,
-                "bob_orientation": bob_orientation,
-                "bob_bit": bob_bit,
-                "measurement_correct": measurement_correct
-            })
-        return data
+        """Vráti všetky Alicine pôvodné bity (None, ak hra ešte nebola spustená)"""
+        if len(self.random_bits) == 0:
+            return None
+        return AllBitsReveal(self.random_bits)
 
     def updateResultsTable(self):
-        """Aktualizuje tabuľku výsledkov s aktuálnymi údajmi"""
-        results = self.get_results()
-        self.table.setRowCount(0)
-        for i, item in enumerate(results):
-            self.table.insertRow(i)
-
-            bit_number_item = QTableWidgetItem(str(item["bit_number"]))
-            bit_number_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 0, bit_number_item)
-
-            alice_bit_item = QTableWidgetItem(str(item["alice_bit"]))
-            alice_bit_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 1, alice_bit_item)
-
-            alice_orientation_item = QTableWidgetItem(item["alice_orientation"])
-            alice_orientation_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 2, alice_orientation_item)
-
-            bob_orientation_item = QTableWidgetItem(item["bob_orientation"])
-            bob_orientation_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 3, bob_orientation_item)
-
-            bob_bit_item = QTableWidgetItem(str(item["bob_bit"]))
-            bob_bit_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 4, bob_bit_item)
-
-            # Kontrola rovnakej bázy
-            same_base = (item["alice_orientation"] == item["bob_orientation"]) and (
-                        item["alice_orientation"] in ['rektilineárna', 'diagonálna'])
-            sameBaseDisplay = "Áno" if same_base else "Nie"
-            sameBaseItem = QTableWidgetItem(sameBaseDisplay)
-            sameBaseItem.setForeground(Qt.GlobalColor.green if same_base else Qt.GlobalColor.red)
-            sameBaseItem.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(i, 5, sameBaseItem)
+        """Aktualizuje tabuľku výsledkov s aktuálnymi údajmi (iba zmenené stĺpce)"""
+        alice_basis = None if self.alice_orientation is None else self.alice_basis()
+        self.table_model.update_game(alice_basis, self.measurement_bases, self.results)
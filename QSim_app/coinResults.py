@@ -0,0 +1,67 @@
+import json
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+
+@dataclass(slots=True, frozen=True)
+class OrientationReveal:
+    """Alicino odhalenie zvolenej bázy"""
+    orientation: str
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class BitsReveal:
+    """Alicine bity (pole NumPy) odhalené v zvolenej báze"""
+    orientation: str
+    bits: np.ndarray
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class AllBitsReveal:
+    """Všetky Alicine pôvodné bity (pole NumPy)"""
+    bits: np.ndarray
+
+
+@dataclass(slots=True, frozen=True)
+class GuessOutcome:
+    """Výsledok Bobovho tipu Alicinej bázy"""
+    guess: str
+    alice_orientation: str
+
+    @property
+    def correct(self):
+        """Bob uhádol Alicinu bázu (vyhral hod mincou)"""
+        return self.guess == self.alice_orientation
+
+    @property
+    def message(self):
+        """Text výsledku pre informačný riadok"""
+        if self.correct:
+            return f"Bob uhádol správnu bázu: {self.guess}."
+        return f"Bob uhádol nesprávnu bázu: {self.guess}."
+
+
+# Typy výsledkov prenášané mimo procesu (napr. pri hre cez sieť)
+WIRE_TYPES = {cls.__name__: cls for cls in (OrientationReveal, BitsReveal, AllBitsReveal, GuessOutcome)}
+
+
+def to_wire(result):
+    """Serializácia výsledku do JSON - iba keď údaje opúšťajú proces (polia bitov ako zoznamy)"""
+    data = {}
+    for field in fields(result):
+        value = getattr(result, field.name)
+        data[field.name] = value.tolist() if isinstance(value, np.ndarray) else value
+    return json.dumps({"type": type(result).__name__, "data": data}, ensure_ascii=False)
+
+
+def from_wire(text):
+    """Výsledok z JSON vytvoreného funkciou to_wire; pri neznámom type vyvolá ValueError"""
+    message = json.loads(text)
+    cls = WIRE_TYPES.get(message.get("type"))
+    if cls is None:
+        raise ValueError(f"Neznámy typ výsledku: {message.get('type')}")
+    data = message["data"]
+    if "bits" in data:
+        data["bits"] = np.array(data["bits"], dtype=np.uint8)
+    return cls(**data)
@@ -0,0 +1,150 @@
+import numpy as np
+
+from QSim_app.bb84Engine import random_bits
+
+
+class HonestAlice:
+    """Poctivá Alica: náhodná báza mince, všetky fotóny v tejto báze, pravdivé odhalenie.
+
+    Bázy sú kódované ako v bb84Engine (0 = rektilineárna, 1 = diagonálna).
+    """
+
+    def __init__(self, rectilinear_probability=0.5):
+        """Inicializácia s pravdepodobnosťou voľby rektilineárnej bázy"""
+        self.rectilinear_probability = rectilinear_probability
+
+    def prepare(self, rng, games, photons):
+        """Báza mince, bázy a bity fotónov pre všetky hry (bázy fotónov None = previazané páry)"""
+        bases = (rng.random(games) >= self.rectilinear_probability).astype(np.uint8)
+        photon_bases = np.repeat(bases[:, None], photons, axis=1)
+        return bases, photon_bases, random_bits(rng, (games, photons))
+
+    def reveal(self, rng, bases, photon_bases, bits, guess, bob_bases, bob_bits):
+        """Odhalená báza a bity po Bobovom tipe"""
+        return bases, bits
+
+
+class UnbalancedAlice(HonestAlice):
+    """Alica s nevyváženou mincou - rektilineárnu bázu volí častejšie"""
+
+    def __init__(self, rectilinear_probability=0.75):
+        super().__init__(rectilinear_probability)
+
+
+class MixedAlice(HonestAlice):
+    """Podvádzajúca Alica so zmiešanou bázou.
+
+    Podiel mix fotónov pošle v opačnej báze, než je jej minca. Ak Bob uhádne,
+    tvrdí opačnú bázu; bity fotónov poslaných v inej než tvrdenej báze nepozná a
+    hádá ich, takže ju Bob môže odhaliť na fotónoch zmeraných v tvrdenej báze.
+    """
+
+    def __init__(self, mix=0.5, rectilinear_probability=0.5):
+        super().__init__(rectilinear_probability)
+        self.mix = mix
+
+    def prepare(self, rng, games, photons):
+        bases, photon_bases, bits = super().prepare(rng, games, photons)
+        flipped = rng.random((games, photons)) < self.mix
+        return bases, (photon_bases ^ flipped).astype(np.uint8), bits
+
+    def reveal(self, rng, bases, photon_bases, bits, guess, bob_bases, bob_bits):
+        claimed = np.where(guess == bases, 1 - bases, bases).astype(np.uint8)
+        known = photon_bases == claimed[:, None]
+        revealed = np.where(known, bits, random_bits(rng, bits.shape))
+        return claimed, revealed
+
+
+class EPRAlice(HonestAlice):
+    """Útok s previazanými pármi: Alica posiela polovice EPR párov a svoje polovice
+    zmeria až po Bobovom tipe v opačnej báze. Jej výsledky sa s Bobovými zhodujú
+    na všetkých fotónoch zmeraných v tvrdenej báze, takže podvod sa nedá odhaliť.
+    """
+
+    def prepare(self, rng, games, photons):
+        return random_bits(rng, games), None, None
+
+    def reveal(self, rng, bases, photon_bases, bits, guess, bob_bases, bob_bits):
+        claimed = (1 - guess).astype(np.uint8)
+        same_basis = bob_bases == claimed[:, None]
+        revealed = np.where(same_basis, bob_bits, random_bits(rng, bob_bits.shape))
+        return claimed, revealed
+
+
+# Stratégie Alice: trieda s prepare() a reveal(), parametre sa odovzdávajú konštruktoru
+ALICE_STRATEGIES = {
+    "honest": HonestAlice,
+    "unbalanced": UnbalancedAlice,
+    "mixed": MixedAlice,
+    "epr": EPRAlice,
+}
+
+
+def measure_random(rng, games, photons, committed):
+    """Každý fotón v nezávisle náhodnej báze"""
+    return random_bits(rng, (games, photons))
+
+
+def measure_balanced(rng, games, photons, committed):
+    """Presne polovica fotónov v každej báze (ako v karte CoinFlipping)"""
+    if games == 1:
+        # Jedna dlhá hra: výber polovice pozícií bez triedenia celého riadku
+        bases = np.zeros((1, photons), dtype=np.uint8)
+        bases[0, rng.choice(photons, photons // 2, replace=False)] = 1
+        return bases
+    # Náhodné poradie v každom riadku; prvá polovica poradia sa meria diagonálne
+    order = np.argsort(rng.random((games, photons)), axis=1)
+    return (order < photons // 2).astype(np.uint8)
+
+
+def measure_committed(rng, games, photons, committed):
+    """Bob sa rozhodne pre tip vopred a všetky fotóny meria v opačnej báze.
+
+    Bázy nezávisia od výsledkov meraní (tie pred Alicinym odhalením o jej báze nič
+    neprezradia), ide teda o pevnú voľbu bázy. Podvádzajúca Alica však musí po
+    Bobovom tipe tvrdiť práve túto bázu, takže Bob overí všetky fotóny a podvod
+    so zmiešanou bázou odhalí s najväčšou šancou.
+    """
+    return np.repeat((1 - committed)[:, None], photons, axis=1).astype(np.uint8)
+
+
+# Spôsoby Bobovho merania: funkcia (rng, hry, fotóny, vopred zvolený tip) → bázy
+BOB_MEASUREMENTS = {
+    "random": measure_random,
+    "balanced": measure_balanced,
+    "committed": measure_committed,
+}
+
+
+def guess_random(bob_bases, bob_bits, committed, rng):
+    """Bob háda Alicinu bázu náhodne (tip zvolený pred meraním)"""
+    return committed
+
+
+def guess_rectilinear(bob_bases, bob_bits, committed, rng):
+    """Bob vždy tipuje rektilineárnu bázu"""
+    return np.zeros(len(bob_bases), dtype=np.uint8)
+
+
+def guess_parity(bob_bases, bob_bits, committed, rng):
+    """Bob tipuje paritu svojich výsledkov merania"""
+    return (np.count_nonzero(bob_bits, axis=1) & 1).astype(np.uint8)
+
+
+def guess_majority_basis(bob_bases, bob_bits, committed, rng):
+    """Bob tipuje bázu, v ktorej meral najviac fotónov (pri remíze náhodne)"""
+    diagonal = np.count_nonzero(bob_bases, axis=1)
+    rectilinear = bob_bases.shape[1] - diagonal
+    guess = (diagonal > rectilinear).astype(np.uint8)
+    tie = diagonal == rectilinear
+    guess[tie] = random_bits(rng, int(np.count_nonzero(tie)))
+    return guess
+
+
+# Stratégie Boba: funkcia (bázy, výsledky merania, vopred zvolený tip, rng) → tip Alicinej bázy
+BOB_STRATEGIES = {
+    "random": guess_random,
+    "rectilinear": guess_rectilinear,
+    "parity": guess_parity,
+    "majority_basis": guess_majority_basis,
+}
@@ -0,0 +1,113 @@
+import numpy as np
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+from QSim_app.coinTournament import BASIS_NAMES
+
+
+class CoinTableModel(QAbstractTableModel):
+    """Model tabuľky výsledkov hodu mincou nad stĺpcami stavu hry.
+
+    Model drží iba NumPy stĺpce (Alicine bity, Bobove bázy a bity, bázy kódované
+    ako v bb84Engine) a text buniek vytvára až v data() pre zobrazené riadky,
+    takže tabuľka zostáva svižná aj pri miliónoch fotónov. Pri aktualizácii sa dataChanged odošle iba pre
+    stĺpce, ktorých hodnoty sa naozaj zmenili.
+    """
+
+    HEADERS = ["#", "Aliciné bity", "Aliciná báza", "Bobová báza", "Bobové bity", "Meranie v rovnakej bázi"]
+
+    # Stĺpce tabuľky odvodené od jednotlivých častí stavu hry
+    ALICE_COLUMNS = (2, 5)
+    BOB_BASIS_COLUMNS = (3, 5)
+    BOB_BIT_COLUMNS = (4,)
+
+    MISSING = "N/A"
+    EMPTY = np.zeros(0, dtype=np.uint8)
+    GREEN = QColor("green")
+    RED = QColor("red")
+
+    def __init__(self, parent=None):
+        """Inicializácia prázdneho modelu"""
+        super().__init__(parent)
+        self.alice_bits = self.EMPTY
+        self.alice_basis = None
+        self.bob_bases = self.EMPTY
+        self.bob_bits = self.EMPTY
+
+    def set_game(self, alice_bits):
+        """Nová hra - Alicine bity, ostatné stĺpce sú zatiaľ prázdne"""
+        self.beginResetModel()
+        self.alice_bits = alice_bits
+        self.alice_basis = None
+        self.bob_bases = self.EMPTY
+        self.bob_bits = self.EMPTY
+        self.endResetModel()
+
+    def update_game(self, alice_basis, bob_bases, bob_bits):
+        """Aktualizácia stavu hry (kód Alicinej bázy alebo None, Bobove stĺpce);
+        prekreslia sa iba stĺpce so zmenenými hodnotami"""
+        changed = set()
+        if alice_basis != self.alice_basis:
+            self.alice_basis = alice_basis
+            changed.update(self.ALICE_COLUMNS)
+        if not self.same_column(bob_bases, self.bob_bases):
+            self.bob_bases = bob_bases
+            changed.update(self.BOB_BASIS_COLUMNS)
+        if not self.same_column(bob_bits, self.bob_bits):
+            self.bob_bits = bob_bits
+            changed.update(self.BOB_BIT_COLUMNS)
+        if changed and len(self.alice_bits):
+            self.dataChanged.emit(self.index(0, min(changed)), self.index(len(self.alice_bits) - 1, max(changed)))
+
+    @staticmethod
+    def same_column(new, old):
+        """Vektorové porovnanie stĺpca (ten istý objekt sa neporovnáva)"""
+        return new is old or np.array_equal(new, old)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.alice_bits)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.cell(index.row(), index.column())
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() == 5 and self.bob_basis(index.row()) is not None:
+            return self.GREEN if self.same_basis(index.row()) else self.RED
+        return None
+
+    def bob_basis(self, row):
+        """Kód Bobovej bázy fotónu alebo None pred meraním"""
+        return int(self.bob_bases[row]) if row < len(self.bob_bases) else None
+
+    def same_basis(self, row):
+        """Bob meral fotón v Alicinej báze"""
+        return self.alice_basis is not None and self.bob_basis(row) == self.alice_basis
+
+    def cell(self, row, column):
+        """Text jednej bunky vypočítaný zo stĺpcov stavu hry"""
+        if column == 0:
+            return str(row + 1)
+        if column == 1:
+            return str(self.alice_bits[row])
+        if column == 2:
+            return self.MISSING if self.alice_basis is None else BASIS_NAMES[self.alice_basis]
+        if column == 3:
+            basis = self.bob_basis(row)
+            return self.MISSING if basis is None else BASIS_NAMES[basis]
+        if column == 4:
+            return str(self.bob_bits[row]) if row < len(self.bob_bits) else self.MISSING
+        if self.bob_basis(row) is None:
+            return self.MISSING
+        return "Áno" if self.same_basis(row) else "Nie"
@@ -0,0 +1,224 @@
+import hashlib
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from QSim_app.bb84Engine import random_bits, qber_confidence_interval, DEFAULT_CHUNK_SIZE
+from QSim_app.coinStrategies import ALICE_STRATEGIES, BOB_MEASUREMENTS, BOB_STRATEGIES
+
+# Kódovanie báz ako v bb84Engine: 0 = rektilineárna, 1 = diagonálna
+BASIS_NAMES = ("rektilineárna", "diagonálna")
+
+# Predvolený počet fotónov v jednej hre (ako v karte CoinFlipping)
+DEFAULT_PHOTONS = 12
+
+# Počty, podľa ktorých sa sčítavajú výsledky blokov
+COUNT_NAMES = ("games", "bob_wins", "alice_wins", "aborted")
+
+# Výsledky analýzy stratégií podľa hashu scenára a parametrov (najviac MAX_ANALYSIS_CACHE,
+# najstaršie sa zahodia)
+MAX_ANALYSIS_CACHE = 256
+_analysis_cache = {}
+
+
+def play_games(games, photons=DEFAULT_PHOTONS, rng=None, bob_strategy="random", bob_measurement="random",
+               alice_strategy="honest", alice_params=None):
+    """Odohranie games hier naraz; vráti počty výhier Boba, Alice a prerušených hier.
+
+    Alica zvolí bázu (hodnotu mince) a pošle fotóny s náhodnými bitmi v tejto báze.
+    Bob zmeria fotóny a tipne Alicinu bázu - ak uhádne, vyhráva. Alica potom odhalí
+    bázu aj bity a Bob overí fotóny zmerané v odhalenej báze; nezhoda znamená
+    podvod a hra sa preruší. Stratégie strán sú v coinStrategies.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    alice = ALICE_STRATEGIES[alice_strategy](**(alice_params or {}))
+
+    bases, photon_bases, bits = alice.prepare(rng, games, photons)
+
+    # Bob si môže tip zvoliť už pred meraním (meranie v báze podľa tipu)
+    committed = random_bits(rng, games)
+    bob_bases = BOB_MEASUREMENTS[bob_measurement](rng, games, photons, committed)
+    if photon_bases is None:
+        # Polovica previazaného páru dáva Bobovi náhodný výsledok v ľubovoľnej báze
+        bob_bits = random_bits(rng, (games, photons))
+    else:
+        bob_bits = np.where(bob_bases == photon_bases, bits, random_bits(rng, (games, photons)))
+
+    guess = BOB_STRATEGIES[bob_strategy](bob_bases, bob_bits, committed, rng)
+    claimed, revealed = alice.reveal(rng, bases, photon_bases, bits, guess, bob_bases, bob_bits)
+
+    # Overenie odhalenia na fotónoch, ktoré Bob meral v odhalenej báze
+    aborted = np.any((bob_bases == claimed[:, None]) & (bob_bits != revealed), axis=1)
+    bob_wins = (guess == claimed) & ~aborted
+    return {
+        "games": games,
+        "bob_wins": int(np.count_nonzero(bob_wins)),
+        "alice_wins": int(np.count_nonzero(~bob_wins & ~aborted)),
+        "aborted": int(np.count_nonzero(aborted)),
+    }
+
+
+def tournament_statistics(counts, confidence=0.95):
+    """Pravdepodobnosti výhry, odchýlka mince od 1/2 a ich Wilsonove intervaly spoľahlivosti"""
+    games = counts["games"]
+    stats = dict(counts)
+    for name in ("bob_wins", "alice_wins", "aborted"):
+        # Wilsonov interval pre podiel (rovnaký výpočet ako pri QBER)
+        low, high = qber_confidence_interval(counts[name], games, confidence)
+        stats[name + "_p"] = counts[name] / games if games else 0.0
+        stats[name + "_low"], stats[name + "_high"] = low, high
+    stats["bias"] = stats["bob_wins_p"] - 0.5
+    stats["bias_low"] = stats["bob_wins_low"] - 0.5
+    stats["bias_high"] = stats["bob_wins_high"] - 0.5
+    # Výhoda Alice oproti férovej minci (pri podvádzajúcej Alici)
+    stats["alice_advantage"] = stats["alice_wins_p"] - 0.5
+    return stats
+
+
+def make_scenario(alice_strategy="honest", alice_params=None, bob_measurement="random", bob_strategy="random"):
+    """Scenár turnaja - kombinácia stratégií Alice a Boba s parametrami"""
+    if alice_strategy not in ALICE_STRATEGIES:
+        raise ValueError(f"Neznáma stratégia Alice: {alice_strategy}")
+    if bob_measurement not in BOB_MEASUREMENTS:
+        raise ValueError(f"Neznámy spôsob merania Boba: {bob_measurement}")
+    if bob_strategy not in BOB_STRATEGIES:
+        raise ValueError(f"Neznáma stratégia Boba: {bob_strategy}")
+    return {
+        "alice_strategy": alice_strategy,
+        "alice_params": dict(alice_params or {}),
+        "bob_measurement": bob_measurement,
+        "bob_strategy": bob_strategy,
+    }
+
+
+def _tournament_chunk(args):
+    """Jeden blok hier - spúšťa sa v samostatnom procese"""
+    games, photons, scenario, seed = args
+    return play_games(games, photons, np.random.default_rng(seed), scenario["bob_strategy"],
+                      scenario["bob_measurement"], scenario["alice_strategy"], scenario["alice_params"])
+
+
+def tournament_chunks(games, photons):
+    """Rozdelenie hier na bloky s približne DEFAULT_CHUNK_SIZE fotónmi"""
+    chunk_games = max(1, DEFAULT_CHUNK_SIZE // photons)
+    return [min(chunk_games, games - start) for start in range(0, games, chunk_games)]
+
+
+def scenario_hash(scenario, games, photons, seed):
+    """Hash scenára a parametrov turnaja pre cache výsledkov"""
+    key = repr((scenario["alice_strategy"], sorted(scenario["alice_params"].items()), scenario["bob_measurement"],
+                scenario["bob_strategy"], games, photons, seed))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def clear_analysis_cache():
+    """Vyprázdnenie cache výsledkov analýzy stratégií"""
+    _analysis_cache.clear()
+
+
+def _store_analysis(key, stats):
+    """Uloženie výsledku do cache; pri plnej cache sa zahodí najstarší záznam"""
+    while len(_analysis_cache) >= MAX_ANALYSIS_CACHE:
+        _analysis_cache.pop(next(iter(_analysis_cache)))
+    _analysis_cache[key] = stats
+
+
+def analyze_strategies(scenarios, games, photons=DEFAULT_PHOTONS, confidence=0.95, seed=None, processes=None):
+    """Výhoda každého scenára (make_scenario) z games hier, všetko v jednej skupine procesov.
+
+    Bloky všetkých scenárov sa spracúvajú spoločne, takže aj krátke scenáre
+    vyťažia všetky jadrá. Prúd náhodných čísel scenára je odvodený zo seed a
+    hashu scenára (nie z poradia v zozname), takže výsledok nezávisí od ostatných
+    scenárov. Výsledky so zadaným seed sa ukladajú podľa tohto hashu a pri
+    opakovanej analýze sa nepočítajú znova.
+    """
+    keys = [scenario_hash(scenario, games, photons, seed) for scenario in scenarios]
+    # Rovnaký scenár sa v jednom volaní počíta iba raz
+    missing = {}
+    for scenario, key in zip(scenarios, keys):
+        if key not in missing and (seed is None or key not in _analysis_cache):
+            missing[key] = scenario
+
+    sizes = tournament_chunks(games, photons)
+    entropy = np.random.SeedSequence(seed).entropy
+    tasks, owners = [], []
+    for key, scenario in missing.items():
+        sequence = np.random.SeedSequence(entropy, spawn_key=(int(key[:8], 16),))
+        for size, child in zip(sizes, sequence.spawn(len(sizes))):
+            tasks.append((size, photons, scenario, child))
+            owners.append(key)
+
+    chunks = []
+    if tasks:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chunks = list(pool.map(_tournament_chunk, tasks))
+
+    results = {}
+    for key, scenario in missing.items():
+        counts = dict.fromkeys(COUNT_NAMES, 0)
+        for owner, chunk in zip(owners, chunks):
+            if owner == key:
+                for name in COUNT_NAMES:
+                    counts[name] += chunk[name]
+        stats = tournament_statistics(counts, confidence)
+        stats.update(scenario, photons=photons)
+        results[key] = stats
+        if seed is not None:
+            _store_analysis(key, stats)
+    return [results[key] if key in results else _analysis_cache[key] for key in keys]
+
+
+def play_tournament(games, photons=DEFAULT_PHOTONS, bob_strategy="random", bob_measurement="random",
+                    confidence=0.95, seed=None, processes=None, alice_strategy="honest", alice_params=None):
+    """Turnaj Monte Carlo: games hier po blokoch, paralelne v skupine procesov.
+
+    Každý blok dostane nezávislý prúd náhodných čísel odvodený zo seed, takže
+    výsledok je pri rovnakom seed reprodukovateľný bez ohľadu na počet procesov.
+    """
+    scenario = make_scenario(alice_strategy, alice_params, bob_measurement, bob_strategy)
+    return analyze_strategies([scenario], games, photons, confidence, seed, processes)[0]
+
+
+def format_statistics(stats):
+    """Textový prehľad výsledkov turnaja"""
+    alice_params = ", ".join(f"{name}={value}" for name, value in sorted(stats["alice_params"].items()))
+    return (f"{stats['games']} hier po {stats['photons']} fotónoch, Alica {stats['alice_strategy']}"
+            f"{f' ({alice_params})' if alice_params else ''}, meranie Boba {stats['bob_measurement']}, "
+            f"stratégia Boba {stats['bob_strategy']}:\n"
+            f"  Bob vyhral: {stats['bob_wins_p']:.4f} [{stats['bob_wins_low']:.4f}, {stats['bob_wins_high']:.4f}]\n"
+            f"  Alica vyhrala: {stats['alice_wins_p']:.4f} "
+            f"[{stats['alice_wins_low']:.4f}, {stats['alice_wins_high']:.4f}]\n"
+            f"  prerušené (odhalený podvod): {stats['aborted_p']:.4f}\n"
+            f"  výhoda Alice: {stats['alice_advantage']:+.4f}\n"
+            f"  odchýlka mince: {stats['bias']:+.4f} [{stats['bias_low']:+.4f}, {stats['bias_high']:+.4f}]")
+
+
+def default_scenarios():
+    """Prehľad poctivých aj podvádzajúcich stratégií na porovnanie"""
+    return [
+        make_scenario(),
+        make_scenario(bob_measurement="balanced", bob_strategy="majority_basis"),
+        make_scenario("unbalanced", {"rectilinear_probability": 0.75}, bob_strategy="rectilinear"),
+        make_scenario("mixed", {"mix": 0.5}),
+        make_scenario("mixed", {"mix": 0.5}, bob_measurement="committed"),
+        make_scenario("mixed", {"mix": 0.1}, bob_measurement="committed"),
+        make_scenario("epr"),
+        make_scenario("epr", bob_measurement="committed"),
+    ]
+
+
+def main(argv):
+    """Spustenie analýzy z príkazového riadka: počet hier a počet fotónov"""
+    games = int(float(argv[0])) if argv else 10 ** 6
+    photons = int(argv[1]) if len(argv) > 1 else DEFAULT_PHOTONS
+    start = time.perf_counter()
+    for stats in analyze_strategies(default_scenarios(), games, photons):
+        print(format_statistics(stats))
+    print(f"čas: {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,311 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from QSim_app.bb84Engine import random_bits, DEFAULT_CHUNK_SIZE
+from QSim_app.channelModel import FiberChannel
+
+# Neefektívnosť opravy chýb oproti Shannonovej hranici
+ERROR_CORRECTION_EFFICIENCY = 1.16
+
+# Počet smerodajných odchýlok pri štatistických fluktuáciách konečného kľúča
+DEFAULT_N_ALPHA = 5.0
+
+# Pravdepodobnosť zlyhania zosilnenia súkromia pri konečnom kľúči
+DEFAULT_EPSILON = 1e-10
+
+# Najväčší počet fotónov v impulze, s ktorým sa ráta pri útoku PNS
+MAX_PHOTONS = 64
+
+# Najmenší relatívny rozdiel intenzít signálu a návnady; pri bližších intenzitách
+# je menovateľ odhadu Y1 takmer nulový a odhad sa nepoužije
+MIN_INTENSITY_GAP = 1e-3
+
+
+class DecoySource:
+    """Zdroj slabých koherentných impulzov so signálnou, návnadovou a vákuovou intenzitou.
+
+    Počet fotónov v impulze má Poissonovo rozdelenie so strednou hodnotou podľa
+    triedy impulzu; trieda sa volí náhodne s pravdepodobnosťami probabilities.
+    """
+
+    CLASSES = ("signal", "decoy", "vacuum")
+
+    def __init__(self, signal=0.5, decoy=0.1, vacuum=0.0, probabilities=(0.8, 0.1, 0.1)):
+        """Inicializácia zdroja s intenzitami (stredný počet fotónov) a pravdepodobnosťami tried"""
+        self.intensities = np.array([signal, decoy, vacuum], dtype=float)
+        self.probabilities = np.asarray(probabilities, dtype=float) / np.sum(probabilities)
+
+    def emit(self, n, rng):
+        """Vygenerovanie tried a počtov fotónov pre n impulzov"""
+        classes = rng.choice(len(self.CLASSES), size=n, p=self.probabilities).astype(np.uint8)
+        return classes, rng.poisson(self.intensities[classes])
+
+
+def poisson_pmf(mu, k):
+    """Poissonovo rozdelenie P(k) pre pole počtov fotónov"""
+    k = np.asarray(k)
+    log_factorial = np.array([math.lgamma(value + 1) for value in k.ravel()]).reshape(k.shape)
+    with np.errstate(divide="ignore"):
+        return np.exp(-mu + k * np.log(mu) - log_factorial) if mu > 0 else (k == 0).astype(float)
+
+
+def pns_strategy(mu, channel):
+    """Stratégia útoku rozdelenia počtu fotónov (PNS) naladená na signálnu intenzitu.
+
+    Eva si z viacfotónových impulzov ponechá jeden fotón a zvyšok pošle bezstratovým
+    kanálom; jednofotónové impulzy prepustí iba s takou pravdepodobnosťou, aby zisk
+    signálnych impulzov u Boba zostal rovnaký ako v poctivom kanáli. Vráti
+    pravdepodobnosť prepustenia jednofotónových a viacfotónových impulzov.
+    """
+    eta = channel.transmittance()
+    eta_detector = channel.detector_efficiency
+    honest_gain = 1 - math.exp(-eta * mu)
+    k = np.arange(2, MAX_PHOTONS)
+    multi_gain = float(np.sum(poisson_pmf(mu, k) * (1 - (1 - eta_detector) ** (k - 1))))
+    single = float(poisson_pmf(mu, np.array([1]))[0]) * eta_detector
+    multi_pass = min(1.0, honest_gain / multi_gain) if multi_gain > 0 else 0.0
+    single_pass = min(1.0, max(0.0, (honest_gain - multi_gain) / single)) if single > 0 else 0.0
+    return single_pass, multi_pass
+
+
+def arrival_probability(photons, channel, pns=None):
+    """Pravdepodobnosť kliknutia signálom pre každý impulz podľa počtu fotónov"""
+    eta = channel.transmittance()
+    if pns is None:
+        return 1 - (1 - eta) ** photons
+    # Pri útoku PNS je vlákno bezstratové, Bob dostane o jeden fotón menej z viacfotónových impulzov
+    single_pass, multi_pass = pns
+    eta_detector = channel.detector_efficiency
+    multi = multi_pass * (1 - (1 - eta_detector) ** np.maximum(photons - 1, 0))
+    return np.where(photons == 1, single_pass * eta_detector, np.where(photons >= 2, multi, 0.0))
+
+
+def simulate_decoy(channel, photons, source=None, rng=None, pns=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Monte Carlo simulácia BB84 so slabými koherentnými impulzmi.
+
+    Pre každú triedu impulzov vráti počet impulzov so zhodnou bázou, počet kliknutí
+    a chýb; pri útoku PNS aj počet signálnych bitov kľúča, ktoré Eva pozná.
+    """
+    if source is None:
+        source = DecoySource()
+    if rng is None:
+        rng = np.random.default_rng()
+    strategy = pns_strategy(source.intensities[0], channel) if pns else None
+    channel.reset_detector()
+
+    classes_count = len(DecoySource.CLASSES)
+    pulses = np.zeros(classes_count, dtype=np.int64)
+    detections = np.zeros(classes_count, dtype=np.int64)
+    errors = np.zeros(classes_count, dtype=np.int64)
+    eve_known = 0
+    remaining = photons
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        classes, photon_numbers = source.emit(n, rng)
+        alice_bits = random_bits(rng, n)
+        alice_bases = random_bits(rng, n)
+        bob_bases = random_bits(rng, n)
+        bob_bits, detected = channel.transmit(alice_bits, alice_bases, bob_bases, rng,
+                                              arrival_probability(photon_numbers, channel, strategy))
+
+        match = alice_bases == bob_bases
+        sifted = match & detected
+        wrong = sifted & (alice_bits != bob_bits)
+        pulses += np.bincount(classes[match], minlength=classes_count)
+        detections += np.bincount(classes[sifted], minlength=classes_count)
+        errors += np.bincount(classes[wrong], minlength=classes_count)
+        if pns:
+            # Eva si ponechala fotón z každého viacfotónového impulzu a po ohlásení báz pozná bit
+            eve_known += int(np.count_nonzero(sifted & (classes == 0) & (photon_numbers >= 2)))
+        remaining -= n
+
+    return {
+        "intensities": source.intensities,
+        "pulses": pulses,
+        "detections": detections,
+        "errors": errors,
+        "gains": np.divide(detections, pulses, out=np.zeros(classes_count), where=pulses > 0),
+        "qbers": np.divide(errors, detections, out=np.zeros(classes_count), where=detections > 0),
+        "eve_known_bits": eve_known,
+    }
+
+
+def expected_observables(mu, channel, distance_km=None):
+    """Analytický zisk Q a chybovosť E impulzov s intenzitou mu (aj pre polia parametrov)"""
+    eta = channel.transmittance(distance_km)
+    y0 = 1 - (1 - channel.dark_count_probability) ** 2
+    signal = 1 - np.exp(-eta * mu)
+    gain = y0 + signal - y0 * signal
+    error = (0.5 * y0 + channel.misalignment * signal) / gain
+    return gain, error
+
+
+def separated_intensities(mu, nu):
+    """Návnada je zreteľne slabšia ako signál (odhad Y1 je dobre podmienený)"""
+    return nu < mu * (1 - MIN_INTENSITY_GAP)
+
+
+def decoy_estimate(mu, nu, q_mu, q_nu, e_nu, y0, e0=0.5, y0_error=None):
+    """Odhad dolnej hranice výťažku Y1 a hornej hranice chybovosti e1 jednofotónových impulzov.
+
+    Metóda s vákuovou a slabou návnadou (Lo, Ma, Chen); pracuje po prvkoch polí.
+    y0_error je výťažok vákua pre odhad e1 (pri konečnom kľúči jeho dolná hranica),
+    predvolene y0. Pre intenzity bez zreteľného rozdielu je Y1_L = 0.
+    Vráti Y1_L, e1_U a zisk jednofotónových signálnych impulzov Q1_L.
+    """
+    if y0_error is None:
+        y0_error = y0
+    # Aj skalárne intenzity ako polia NumPy, aby delenie nulou skončilo cez errstate, nie výnimkou
+    mu, nu = np.asarray(mu, dtype=float), np.asarray(nu, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y1 = mu / (mu * nu - nu * nu) * (q_nu * np.exp(nu) - q_mu * np.exp(mu) * nu * nu / (mu * mu)
+                                         - (mu * mu - nu * nu) / (mu * mu) * y0)
+        y1 = np.where(separated_intensities(mu, nu), np.clip(np.nan_to_num(y1), 0.0, 1.0), 0.0)
+        e1 = np.where(y1 > 0, (e_nu * q_nu * np.exp(nu) - e0 * y0_error) / (y1 * nu), 0.5)
+    e1 = np.clip(np.nan_to_num(e1, nan=0.5), 0.0, 0.5)
+    return y1, e1, y1 * mu * np.exp(-mu)
+
+
+def entropy(p):
+    """Binárna entropia pre pole pravdepodobností"""
+    p = np.clip(np.asarray(p, dtype=float), 1e-15, 1 - 1e-15)
+    return -p * np.log2(p) - (1 - p) * np.log2(1 - p)
+
+
+def asymptotic_key_rate(mu, q_mu, e_mu, q1, e1, efficiency=ERROR_CORRECTION_EFFICIENCY):
+    """Asymptotická rýchlosť bezpečného kľúča na impulz (GLLP s návnadami, sifting 1/2)"""
+    rate = 0.5 * (q1 * (1 - entropy(e1)) - q_mu * efficiency * entropy(e_mu))
+    return np.maximum(rate, 0.0)
+
+
+def fluctuation(value, count, n_alpha=DEFAULT_N_ALPHA):
+    """Štatistická odchýlka odhadu pravdepodobnosti z count pokusov"""
+    return n_alpha * np.sqrt(np.maximum(value, 0.0) / np.maximum(count, 1))
+
+
+def finite_key_rate(mu, nu, q_mu, e_mu, q_nu, e_nu, y0, counts, n_alpha=DEFAULT_N_ALPHA,
+                    epsilon=DEFAULT_EPSILON, efficiency=ERROR_CORRECTION_EFFICIENCY):
+    """Rýchlosť bezpečného kľúča pri konečnom počte impulzov.
+
+    counts sú počty impulzov (signál, návnada, vákuum) so zhodnou bázou. Namerané
+    zisky sa posunú o n_alpha smerodajných odchýlok v nepriaznivom smere a od
+    výsledku sa odpočíta cena zosilnenia súkromia 2 * log2(1 / epsilon).
+    """
+    n_mu, n_nu, n_vacuum = counts
+    q_nu_low = q_nu - fluctuation(q_nu, n_nu, n_alpha)
+    q_mu_high = q_mu + fluctuation(q_mu, n_mu, n_alpha)
+    # Horná hranica Y0 je konzervatívna pre Y1, dolná pre e1
+    y0_high = y0 + fluctuation(y0, n_vacuum, n_alpha)
+    y0_low = np.maximum(y0 - fluctuation(y0, n_vacuum, n_alpha), 0.0)
+    eq_nu_high = e_nu * q_nu + fluctuation(e_nu * q_nu, n_nu, n_alpha)
+    e_nu_high = np.divide(eq_nu_high, q_nu_low, out=np.full_like(np.asarray(eq_nu_high, dtype=float), 0.5),
+                          where=np.asarray(q_nu_low) > 0)
+
+    y1, e1, q1 = decoy_estimate(mu, nu, q_mu_high, q_nu_low, e_nu_high, y0_high, y0_error=y0_low)
+    rate = asymptotic_key_rate(mu, q_mu, e_mu, q1, e1, efficiency)
+    # Zhodná báza je v polovici impulzov, cena zosilnenia súkromia sa rozdelí na všetky impulzy
+    total = 2 * (n_mu + n_nu + n_vacuum)
+    return np.maximum(rate - 2 * math.log2(1 / epsilon) / total, 0.0)
+
+
+def estimate_from_simulation(result, finite_key=False):
+    """Odhad Y1, e1 a rýchlosti kľúča z výsledku simulate_decoy.
+
+    S finite_key sa rýchlosť počíta aj s korekciou konečného kľúča pre počty
+    impulzov zo simulácie (result["pulses"]).
+    """
+    mu, nu, _ = result["intensities"]
+    q_mu, q_nu, y0 = result["gains"]
+    e_mu, e_nu, _ = result["qbers"]
+    y1, e1, q1 = decoy_estimate(mu, nu, q_mu, q_nu, e_nu, y0)
+    estimate = {
+        "y1_low": float(y1),
+        "e1_high": float(e1),
+        "q1_low": float(q1),
+        "asymptotic_rate": float(asymptotic_key_rate(mu, q_mu, e_mu, q1, e1)),
+    }
+    if finite_key:
+        estimate["finite_rate"] = float(finite_key_rate(mu, nu, q_mu, e_mu, q_nu, e_nu, y0, result["pulses"]))
+    return estimate
+
+
+def key_rate_grid(channel, distances_km, signal_intensities, decoy_intensities, pulses=None):
+    """Rýchlosť kľúča pre mriežku vzdialenosť x signál x návnada, vypočítaná naraz.
+
+    Bez pulses sa počíta asymptotická rýchlosť, inak rýchlosť konečného kľúča pre
+    daný celkový počet impulzov rozdelený podľa pravdepodobností predvoleného zdroja.
+    Kombinácie s návnadou nie zreteľne slabšou ako signál majú rýchlosť 0.
+    """
+    distance = np.asarray(distances_km, dtype=float)[:, None, None]
+    mu = np.asarray(signal_intensities, dtype=float)[None, :, None]
+    nu = np.asarray(decoy_intensities, dtype=float)[None, None, :]
+
+    q_mu, e_mu = expected_observables(mu, channel, distance)
+    q_nu, e_nu = expected_observables(nu, channel, distance)
+    y0 = 1 - (1 - channel.dark_count_probability) ** 2
+    if pulses is None:
+        _, e1, q1 = decoy_estimate(mu, nu, q_mu, q_nu, e_nu, y0)
+        rate = asymptotic_key_rate(mu, q_mu, e_mu, q1, e1)
+    else:
+        # Bázy sa zhodujú v polovici impulzov
+        counts = DecoySource().probabilities * pulses / 2
+        rate = finite_key_rate(mu, nu, q_mu, e_mu, q_nu, e_nu, y0, counts)
+    return np.where(separated_intensities(mu, nu), rate, 0.0)
+
+
+def best_operating_points(channel, distances_km, signal_intensities, decoy_intensities, pulses=None):
+    """Najlepšia dvojica intenzít (signál, návnada) a rýchlosť kľúča pre každú vzdialenosť"""
+    rates = key_rate_grid(channel, distances_km, signal_intensities, decoy_intensities, pulses)
+    flat = rates.reshape(len(rates), -1)
+    best = flat.argmax(axis=1)
+    signal_index, decoy_index = np.unravel_index(best, rates.shape[1:])
+    return {
+        "distance_km": np.asarray(distances_km, dtype=float),
+        "signal": np.asarray(signal_intensities, dtype=float)[signal_index],
+        "decoy": np.asarray(decoy_intensities, dtype=float)[decoy_index],
+        "rate": flat[np.arange(len(flat)), best],
+    }
+
+
+def _key_rate_sweep_part(args):
+    """Časť rozmietania intenzít pre úsek vzdialeností - spúšťa sa v samostatnom procese"""
+    parameters, distances_km, signal_intensities, decoy_intensities, pulses = args
+    return best_operating_points(FiberChannel(**parameters), distances_km, signal_intensities,
+                                 decoy_intensities, pulses)
+
+
+def sweep_operating_points(channel, distances_km, signal_intensities, decoy_intensities, pulses=None,
+                           processes=None, parts=None):
+    """Rozmietanie intenzít a vzdialeností: vzdialenosti sa rozdelia medzi procesy,
+    každý proces vyhodnotí svoju časť mriežky vektorovo naraz."""
+    distances_km = np.asarray(distances_km, dtype=float)
+    if parts is None:
+        parts = processes or 4
+    tasks = [(channel.parameters(), part, signal_intensities, decoy_intensities, pulses)
+             for part in np.array_split(distances_km, parts) if len(part)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(_key_rate_sweep_part, tasks))
+    return {name: np.concatenate([result[name] for result in results]) for name in results[0]}
+
+
+def _decoy_sweep_point(args):
+    """Jeden bod Monte Carlo rozmietania cez vzdialenosť - spúšťa sa v samostatnom procese"""
+    parameters, photons, intensities, probabilities, pns, seed = args
+    source = DecoySource(*intensities, probabilities=probabilities)
+    result = simulate_decoy(FiberChannel(**parameters), photons, source, np.random.default_rng(seed), pns)
+    result.update(estimate_from_simulation(result, finite_key=True))
+    result["distance_km"] = parameters["distance_km"]
+    return result
+
+
+def sweep_decoy(channel, distances_km, photons, source=None, pns=False, seed=None, processes=None):
+    """Monte Carlo simulácia s návnadami pre viacero vzdialeností v skupine procesov"""
+    if source is None:
+        source = DecoySource()
+    seeds = np.random.SeedSequence(seed).spawn(len(distances_km))
+    tasks = [(channel.at_distance(float(distance)).parameters(), photons, tuple(source.intensities),
+              tuple(source.probabilities), pns, child) for distance, child in zip(distances_km, seeds)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_decoy_sweep_point, tasks))
@@ -0,0 +1,66 @@
+import importlib
+import sys
+import time
+
+from QSim_app import quantumBackend, startupProfiler
+
+# Moduly aplikácie v poradí, v akom ich načítava hlavné okno
+APP_MODULES = [
+    "QSim_app.qkdProtocol",
+    "QSim_app.coinFlipping",
+    "QSim_app.quantumCommitment",
+    "QSim_app.qss",
+    "QSim_app.byzantineAgreement",
+    "QSim_app.qrng",
+    "QSim_app.qpv",
+    "QSim_app.qst",
+    "QSim_app.lazyTab",
+    "mw.mainWindow",
+]
+
+# Rozpočet času importu jedného modulu v sekundách
+IMPORT_BUDGET_S = 0.25
+
+
+def time_imports(module_names=None):
+    """Postupný import modulov a meranie času každého z nich.
+
+    Čas modulu zahŕňa aj jeho závislosti, ktoré ešte nenačítal žiadny
+    predchádzajúci modul. Už načítané moduly majú čas 0.
+    """
+    if module_names is None:
+        module_names = APP_MODULES
+
+    timings = []
+    for name in module_names:
+        if name in sys.modules:
+            timings.append((name, 0.0))
+            continue
+        start = time.perf_counter()
+        with startupProfiler.span(f"import {name}", "import"):
+            importlib.import_module(name)
+        timings.append((name, time.perf_counter() - start))
+    return timings
+
+
+def format_import_report(timings, budget=IMPORT_BUDGET_S):
+    """Textový prehľad času importu modulov s označením prekročeného rozpočtu"""
+    width = max(len(name) for name, _ in timings)
+    lines = [f"Čas importu modulov (rozpočet {budget * 1000:.0f} ms na modul):"]
+    for name, elapsed in timings:
+        mark = "  <-- nad rozpočet" if elapsed > budget else ""
+        lines.append(f"  {name:<{width}}  {elapsed * 1000:8.1f} ms{mark}")
+    total = sum(elapsed for _, elapsed in timings)
+    lines.append(f"  {'spolu':<{width}}  {total * 1000:8.1f} ms")
+
+    # Qiskit sa načítava odložene, preto sa uvádza samostatne
+    if quantumBackend.is_loaded():
+        lines.append(f"  {'qiskit (odložený)':<{width}}  {quantumBackend.load_time * 1000:8.1f} ms")
+    else:
+        lines.append(f"  {'qiskit (odložený)':<{width}}  ešte nenačítaný")
+    return "\n".join(lines)
+
+
+def over_budget(timings, budget=IMPORT_BUDGET_S):
+    """Vráti moduly, ktorých import prekročil rozpočet"""
+    return [(name, elapsed) for name, elapsed in timings if elapsed > budget]
@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+
+from PyQt6.QtWidgets import QCheckBox
+
+INSTANT_TEXT = "Okamžitý výpočet"
+INSTANT_TOOLTIP = "Protokol sa dopočíta hneď bez animácie a zobrazí sa iba konečný stav"
+
+
+def instant_checkbox(parent=None):
+    """Zaškrtávacie pole režimu okamžitého výpočtu (protokol bez animácie)"""
+    checkbox = QCheckBox(INSTANT_TEXT, parent)
+    checkbox.setToolTip(INSTANT_TOOLTIP)
+    return checkbox
+
+
+@contextmanager
+def batched_update(widget):
+    """Potlačenie prekresľovania widgetu počas výpočtu - na konci sa prekreslí iba raz"""
+    widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        widget.setUpdatesEnabled(True)
+        widget.update()
@@ -0,0 +1,237 @@
+import sys
+import time
+
+import numpy as np
+
+from QSim_app.bb84Engine import random_bits, measure, intercept_resend, qber_confidence_interval, DEFAULT_CHUNK_SIZE
+from QSim_app.cascade import reconcile
+from QSim_app.privacyAmplification import amplify, secure_key_length
+
+# Predvolená dĺžka výstupného bloku kľúča v bitoch
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# Predvolený podiel preosiatych bitov obetovaných na odhad QBER
+DEFAULT_SAMPLE_FRACTION = 0.1
+
+
+class StageCounter:
+    """Počítadlo priepustnosti jednej fázy prúdového spracovania"""
+
+    def __init__(self, name, unit):
+        """Inicializácia počítadla s názvom fázy a jednotkou spracovaných položiek"""
+        self.name = name
+        self.unit = unit
+        self.chunks = 0
+        self.items = 0
+        self.seconds = 0.0
+
+    def add(self, items):
+        """Započítanie jedného spracovaného bloku (čas meria KeyPipeline.timed)"""
+        self.chunks += 1
+        self.items += items
+
+    def rate(self):
+        """Priepustnosť fázy v položkách za sekundu (iba čas strávený v tejto fáze)"""
+        return self.items / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.name}: {self.items} {self.unit} v {self.chunks} blokoch, "
+                f"{self.seconds:.2f} s, {self.rate():.3g} {self.unit}/s")
+
+
+class KeyPipeline:
+    """Prúdové spracovanie BB84 s konštantnou pamäťou.
+
+    Fázy sú generátory zapojené za sebou: generovanie fotónov → kanál → detekcia →
+    preosievanie → odhad parametrov → bloky kľúča (→ voliteľne oprava chýb a
+    zosilnenie súkromia). Každá fáza spracúva bloky pevnej veľkosti, takže pamäť
+    nezávisí od celkového počtu fotónov a prvý blok kľúča je k dispozícii hneď,
+    ako sa nazbiera. Bity a bázy používajú kódovanie bb84Engine (0 = ⨁, 1 = ⨂),
+    ktoré zodpovedá tabuľke polarizácií QKDProtocol.bases.
+    """
+
+    def __init__(self, photons, chunk_size=DEFAULT_CHUNK_SIZE, block_size=DEFAULT_BLOCK_SIZE,
+                 sample_fraction=DEFAULT_SAMPLE_FRACTION, eve_fraction=0.0, eve_basis=None, seed=None):
+        """Inicializácia prúdu pre daný počet fotónov a parametre kanála"""
+        self.photons = int(photons)
+        self.chunk_size = int(chunk_size)
+        self.block_size = int(block_size)
+        self.sample_fraction = sample_fraction
+        self.eve_fraction = eve_fraction
+        self.eve_basis = eve_basis
+        self.rng = np.random.default_rng(seed)
+
+        # Priebežný odhad QBER zo vzorky preosiatych bitov
+        self.sampled_bits = 0
+        self.sampled_errors = 0
+
+        # Čas celého prúdu - súčet výhradných časov všetkých fáz
+        self.measured = 0.0
+
+        self.counters = {
+            "generate": StageCounter("generovanie fotónov", "fotónov"),
+            "channel": StageCounter("kvantový kanál", "fotónov"),
+            "detect": StageCounter("detekcia", "fotónov"),
+            "sift": StageCounter("preosievanie", "fotónov"),
+            "estimate": StageCounter("odhad parametrov", "bitov"),
+            "blocks": StageCounter("bloky kľúča", "bitov"),
+            "distill": StageCounter("oprava chýb a zosilnenie súkromia", "bitov"),
+        }
+
+    def generate(self):
+        """Alica generuje náhodné bity a bázy po blokoch"""
+        counter = self.counters["generate"]
+        remaining = self.photons
+        while remaining > 0:
+            n = min(self.chunk_size, remaining)
+            chunk = {"alice_bits": random_bits(self.rng, n), "alice_bases": random_bits(self.rng, n)}
+            remaining -= n
+            counter.add(n)
+            yield chunk
+
+    def channel(self, chunks):
+        """Prenos kanálom - pri zapnutej Eve útok zachyť a pošli ďalej"""
+        counter = self.counters["channel"]
+        for chunk in chunks:
+            if self.eve_fraction > 0:
+                chunk["channel_bits"], chunk["channel_bases"], _ = intercept_resend(
+                    chunk["alice_bits"], chunk["alice_bases"], self.rng, self.eve_fraction, self.eve_basis)
+            else:
+                chunk["channel_bits"], chunk["channel_bases"] = chunk["alice_bits"], chunk["alice_bases"]
+            counter.add(len(chunk["alice_bits"]))
+            yield chunk
+
+    def detect(self, chunks):
+        """Bob meria každý fotón v náhodnej báze"""
+        counter = self.counters["detect"]
+        for chunk in chunks:
+            n = len(chunk["alice_bits"])
+            chunk["bob_bases"] = random_bits(self.rng, n)
+            chunk["bob_bits"] = measure(chunk["channel_bits"], chunk["channel_bases"], chunk["bob_bases"], self.rng)
+            counter.add(n)
+            yield chunk
+
+    def sift(self, chunks):
+        """Ponechanie iba pozícií so zhodnou bázou (ostatné polia bloku sa uvoľnia)"""
+        counter = self.counters["sift"]
+        for chunk in chunks:
+            match = chunk["alice_bases"] == chunk["bob_bases"]
+            sifted = {"alice_key": chunk["alice_bits"][match], "bob_key": chunk["bob_bits"][match]}
+            counter.add(len(match))
+            yield sifted
+
+    def estimate(self, chunks):
+        """Zverejnenie náhodnej vzorky bitov na odhad QBER; vzorka sa z kľúča vyradí"""
+        counter = self.counters["estimate"]
+        for chunk in chunks:
+            alice_key, bob_key = chunk["alice_key"], chunk["bob_key"]
+            sample = self.rng.random(len(alice_key)) < self.sample_fraction
+            self.sampled_bits += int(np.count_nonzero(sample))
+            self.sampled_errors += int(np.count_nonzero(alice_key[sample] != bob_key[sample]))
+            kept = {"alice_key": alice_key[~sample], "bob_key": bob_key[~sample]}
+            counter.add(len(alice_key))
+            yield kept
+
+    def key_blocks(self, chunks):
+        """Zoskupenie preosiatych bitov do blokov pevnej dĺžky (posledný môže byť kratší)"""
+        counter = self.counters["blocks"]
+        alice_parts, bob_parts, buffered = [], [], 0
+        for chunk in chunks:
+            alice_parts.append(chunk["alice_key"])
+            bob_parts.append(chunk["bob_key"])
+            buffered += len(chunk["alice_key"])
+            while buffered >= self.block_size:
+                alice_all, bob_all = np.concatenate(alice_parts), np.concatenate(bob_parts)
+                block = self.make_block(alice_all[:self.block_size], bob_all[:self.block_size])
+                alice_parts, bob_parts = [alice_all[self.block_size:]], [bob_all[self.block_size:]]
+                buffered -= self.block_size
+                counter.add(self.block_size)
+                yield block
+        if buffered:
+            block = self.make_block(np.concatenate(alice_parts), np.concatenate(bob_parts))
+            counter.add(buffered)
+            yield block
+
+    def make_block(self, alice_key, bob_key):
+        """Blok kľúča spolu s aktuálnym odhadom QBER a jeho intervalom spoľahlivosti"""
+        low, high = qber_confidence_interval(self.sampled_errors, self.sampled_bits)
+        return {
+            "alice_key": alice_key,
+            "bob_key": bob_key,
+            "qber": self.qber(),
+            "qber_low": low,
+            "qber_high": high,
+        }
+
+    def distill(self, blocks):
+        """Oprava chýb (Cascade) a zosilnenie súkromia (Toeplitz) každého bloku"""
+        counter = self.counters["distill"]
+        for block in blocks:
+            # Horná hranica QBER je konzervatívny odhad informácie Evy
+            reconciliation = reconcile(block["alice_key"], block["bob_key"], max(block["qber"], 1e-6), rng=self.rng)
+            length = secure_key_length(len(block["alice_key"]), block["qber_high"], reconciliation["leaked_bits"])
+            block["key"], _ = amplify(reconciliation["key"], length, self.rng)
+            block["leaked_bits"] = reconciliation["leaked_bits"]
+            block["residual_errors"] = reconciliation["residual_errors"]
+            counter.add(len(block["alice_key"]))
+            yield block
+
+    def timed(self, name, stage):
+        """Prechod fázou s meraním času stráveného výhradne v nej.
+
+        Krok fázy (next) spúšťa aj predchádzajúce fázy; ich čas (pripočítaný k
+        self.measured) sa od kroku odpočíta, takže sa časy fáz neprekrývajú a ich
+        súčet je čas celého prúdu.
+        """
+        counter = self.counters[name]
+        iterator = iter(stage)
+        while True:
+            start = time.perf_counter()
+            upstream = self.measured
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                own = time.perf_counter() - start - (self.measured - upstream)
+                counter.seconds += own
+                self.measured += own
+            yield item
+
+    def blocks(self, distill=False):
+        """Celý prúd ako generátor blokov kľúča"""
+        stream = self.timed("generate", self.generate())
+        stream = self.timed("channel", self.channel(stream))
+        stream = self.timed("detect", self.detect(stream))
+        stream = self.timed("sift", self.sift(stream))
+        stream = self.timed("estimate", self.estimate(stream))
+        stream = self.timed("blocks", self.key_blocks(stream))
+        return self.timed("distill", self.distill(stream)) if distill else stream
+
+    def qber(self):
+        """Priebežný odhad QBER"""
+        return self.sampled_errors / self.sampled_bits if self.sampled_bits else 0.0
+
+    def report(self):
+        """Textový prehľad priepustnosti všetkých fáz"""
+        lines = [f"Prúdové spracovanie BB84 ({self.photons} fotónov):"]
+        lines.extend(f"  {counter}" for counter in self.counters.values() if counter.chunks)
+        rate = self.photons / self.measured if self.measured else 0.0
+        lines.append(f"  spolu: {self.measured:.2f} s, {rate:.3g} fotónov/s")
+        lines.append(f"  odhad QBER: {self.qber() * 100:.3f} %")
+        return "\n".join(lines)
+
+
+def main(argv):
+    """Spustenie prúdu z príkazového riadka a výpis priepustnosti fáz"""
+    photons = int(float(argv[0])) if argv else 10 ** 8
+    pipeline = KeyPipeline(photons, eve_fraction=float(argv[1]) if len(argv) > 1 else 0.0)
+    key_bits = 0
+    for block in pipeline.blocks(distill="--distill" in argv):
+        key_bits += len(block.get("key", block["alice_key"]))
+    print(pipeline.report())
+    print(f"  bitov kľúča: {key_bits}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,52 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from PyQt6.QtCore import pyqtSignal
+
+from QSim_app import startupProfiler
+from QSim_app.tabScheduler import TabTimerScheduler
+
+
+class LazyTab(QWidget):
+    """Zástupná karta, ktorá vytvorí skutočný widget protokolu až pri prvom zobrazení"""
+
+    # Signál s vytvoreným widgetom protokolu
+    built = pyqtSignal(QWidget)
+
+    def __init__(self, factory, name="", parent=None):
+        """Inicializácia zástupnej karty s továrenskou funkciou pre widget protokolu"""
+        super().__init__(parent)
+        self.factory = factory
+        self.name = name
+        self.widget = None
+        self.scheduler = None
+
+        # Layout bez okrajov, aby sa skutočný widget zobrazil rovnako ako priamo v karte
+        self.tab_layout = QVBoxLayout(self)
+        self.tab_layout.setContentsMargins(0, 0, 0, 0)
+
+    def is_built(self):
+        """Vráti, či už bol widget protokolu vytvorený"""
+        return self.widget is not None
+
+    def ensure_built(self):
+        """Vytvorenie widgetu protokolu, ak ešte neexistuje"""
+        if self.widget is None:
+            with startupProfiler.span(f"vytvorenie karty {self.name}", "protocol"):
+                self.widget = self.factory()
+            self.tab_layout.addWidget(self.widget)
+            # Protokol uvádza svoje animačné časovače cez animation_timers()
+            timers = self.widget.animation_timers() if hasattr(self.widget, "animation_timers") else ()
+            self.scheduler = TabTimerScheduler(self.widget, timers)
+            self.built.emit(self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        """Pri prvom zobrazení karty sa vytvorí skutočný widget"""
+        self.ensure_built()
+        self.scheduler.resume()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Skrytá karta pozastaví časovače a prekresľovanie svojho protokolu"""
+        if self.scheduler is not None:
+            self.scheduler.suspend()
+        super().hideEvent(event)
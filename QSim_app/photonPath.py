@@ -0,0 +1,21 @@
+import numpy as np
+
+
+class PhotonPath:
+    """Lomená dráha fotónu v scéne s predpočítanými dĺžkami úsekov.
+
+    Poloha sa vzorkuje podľa prejdenej vzdialenosti, takže fotón sa pohybuje
+    konštantnou rýchlosťou a polohy mnohých fotónov na tej istej dráhe sa
+    vypočítajú jedným volaním sample().
+    """
+
+    def __init__(self, points):
+        """Inicializácia dráhy z postupnosti bodov (QPointF)"""
+        self.x = np.array([point.x() for point in points], dtype=float)
+        self.y = np.array([point.y() for point in points], dtype=float)
+        self.distances = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(self.x), np.diff(self.y)))))
+        self.length = float(self.distances[-1])
+
+    def sample(self, distance):
+        """Súradnice bodov vo vzdialenosti distance od začiatku (aj pre pole vzdialeností)"""
+        return np.interp(distance, self.distances, self.x), np.interp(distance, self.distances, self.y)
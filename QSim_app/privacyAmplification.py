@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+
+from QSim_app.cascade import binary_entropy
+
+# Do tejto veľkosti (n * m) sa hash počíta priamou konvolúciou, nad ňou cez FFT
+DIRECT_LIMIT = 1 << 20
+
+# Predvolená pravdepodobnosť zlyhania zosilnenia súkromia (bezpečnostný parameter)
+DEFAULT_EPSILON = 1e-10
+
+
+def secure_key_length(n, qber, leaked_bits, epsilon=DEFAULT_EPSILON):
+    """Dĺžka bezpečného kľúča po zosilnení súkromia.
+
+    Od n bitov sa odpočíta informácia, ktorú mohla získať Eva z kanála (n * h(QBER)),
+    paritné bity odhalené pri oprave chýb a 2 * log2(1 / epsilon). Pri epsilon=None
+    sa použije asymptotický odhad bez poslednej korekcie.
+    """
+    length = n * (1 - binary_entropy(qber)) - leaked_bits
+    if epsilon is not None:
+        length -= 2 * math.log2(1 / epsilon)
+    return max(0, int(length))
+
+
+def toeplitz_seed(rng, n, m):
+    """Náhodná Toeplitzova matica m x n zadaná prvým stĺpcom a riadkom (n + m - 1 bitov)"""
+    return rng.integers(0, 2, size=n + m - 1, dtype=np.uint8)
+
+
+def fft_length(size):
+    """Najmenšia mocnina dvoch, ktorá je aspoň size"""
+    return 1 << max(0, (size - 1).bit_length())
+
+
+def toeplitz_hash(key, seed, m):
+    """Zahashovanie kľúča Toeplitzovou maticou: y = T x (mod 2).
+
+    Prvok T[i, j] = seed[i - j + n - 1], takže súčin je úsek lineárnej konvolúcie
+    seed * x. Malé bloky sa počítajú priamo, veľké cez FFT v čase O(N log N);
+    súčty sú celé čísla najviac n, preto stačí výsledok zaokrúhliť a vziať mod 2.
+    Pri cyklickej konvolúcii dĺžky aspoň n + m - 1 zasiahne pretečenie iba prvých
+    n - 1 prvkov, ktoré sa nepoužívajú.
+    """
+    key = np.asarray(key, dtype=np.uint8)
+    n = len(key)
+    if m <= 0 or n == 0:
+        return np.zeros(0, dtype=np.uint8)
+
+    if n * m <= DIRECT_LIMIT:
+        convolution = np.convolve(seed.astype(np.int64), key.astype(np.int64))
+    else:
+        size = fft_length(len(seed))
+        spectrum = np.fft.rfft(seed, size) * np.fft.rfft(key, size)
+        convolution = np.rint(np.fft.irfft(spectrum, size)).astype(np.int64)
+    return (convolution[n - 1:n - 1 + m] & 1).astype(np.uint8)
+
+
+def amplify(key, m, rng=None):
+    """Zosilnenie súkromia jedného bloku na dĺžku m s novou náhodnou maticou.
+
+    Vráti výsledný kľúč a seed matice (Alica ho Bobovi pošle verejným kanálom).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    seed = toeplitz_seed(rng, len(key), m)
+    return toeplitz_hash(key, seed, m), seed
+
+
+def amplify_stream(blocks, length, rng=None):
+    """Zosilnenie súkromia prúdu blokov kľúča (generátor).
+
+    Parameter length je buď pomer kompresie (0 - 1), alebo funkcia, ktorá z dĺžky
+    bloku vráti dĺžku výstupu. Každý blok dostane vlastnú Toeplitzovu maticu,
+    takže pamäť zostáva ohraničená veľkosťou jedného bloku.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    for block in blocks:
+        n = len(block)
+        m = length(n) if callable(length) else int(n * length)
+        key, _ = amplify(block, m, rng)
+        yield key
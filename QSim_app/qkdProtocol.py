@@ -1,22 +1,46 @@
-from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, \
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QTableView, \
     QGraphicsScene, QGraphicsView, QHeaderView, QGraphicsPixmapItem, QGraphicsRectItem, QGraphicsLineItem, \
-    QGraphicsPolygonItem, QGraphicsPathItem, QGraphicsItemGroup, QLineEdit, QCheckBox, QHBoxLayout, QSizePolicy
-from PyQt6.QtCore import QTimer, QPointF, Qt, QRectF
+    QGraphicsPolygonItem, QGraphicsPathItem, QGraphicsItemGroup, QGraphicsItem, QLineEdit, QCheckBox, QHBoxLayout, \
+    QSizePolicy, QFileDialog, QSpinBox, QDoubleSpinBox
+from PyQt6.QtCore import QPointF, Qt, QRectF
 from PyQt6.QtGui import QPixmap, QColor, QFont, QPen, QBrush, QPainterPath, QPolygonF, QTransform
 from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtSvgWidgets import QGraphicsSvgItem
-from PyQt6 import uic
-import random
+from QSim_app.uiLoader import load_ui
+from QSim_app.animationClock import ClockTimer
+from QSim_app.bb84Engine import run_bb84, BASIS_SYMBOLS
+from QSim_app.bitSource import BitFile, parse_text
+from QSim_app.cascade import reconcile
+from QSim_app.channelModel import FiberChannel
+from QSim_app.privacyAmplification import amplify, secure_key_length
+from QSim_app.statisticsWorker import FileStatisticsWorker
+from QSim_app.qkdTableModel import QKDTableModel
+from QSim_app.photonPath import PhotonPath
+from QSim_app.instantMode import batched_update
+from QSim_app import rngService
 import sys
 import math
 
+import numpy as np
+
+# Najviac toľko Alicinych bitov sa vypíše vo výstupe (pri veľkom počte fotónov)
+OUTPUT_PREVIEW = 64
+
+
+def preview_bits(bits):
+    """Text bitov pre výstup - pri dlhej sekvencii iba začiatok a celkový počet"""
+    text = ''.join(map(str, bits[:OUTPUT_PREVIEW]))
+    if len(bits) > OUTPUT_PREVIEW:
+        text += f"… ({len(bits)} bitov)"
+    return text
+
 
 class QKDProtocol(QWidget):
     def __init__(self):
         super().__init__()
 
         # Načítanie UI
-        uic.loadUi('mw/qkd_protocol.ui', self)
+        load_ui('mw/qkd_protocol.ui', self)
 
         # Nastavenie vlastností okna
         self.setStyleSheet("background-color: white")
@@ -34,48 +58,82 @@ class QKDProtocol(QWidget):
         # Nájdenie prvkov UI
         self.output_label = self.findChild(QLabel, "output_label")
         self.view = self.findChild(QGraphicsView, "graphics_view")
-        self.table = self.findChild(QTableWidget, "result_table")
+        self.table = self.findChild(QTableView, "result_table")
         self.use_custom_bits = self.findChild(QCheckBox, "use_custom_bits")
         self.custom_bits_input = self.findChild(QLineEdit, "custom_bits_input")
+        self.load_bits_button = self.findChild(QPushButton, "load_bits_button")
+        self.use_eve = self.findChild(QCheckBox, "use_eve")
+        self.instant_mode = self.findChild(QCheckBox, "instant_mode")
+        self.num_bits_input = self.findChild(QSpinBox, "num_bits_input")
+        self.photon_rate_input = self.findChild(QDoubleSpinBox, "photon_rate_input")
+        self.use_channel = self.findChild(QCheckBox, "use_channel")
+        self.distance_input = self.findChild(QDoubleSpinBox, "distance_input")
         self.start_button = self.findChild(QPushButton, "start_button")
 
         # Pripojenie signálov
         self.start_button.clicked.connect(self.start_simulation)
         self.use_custom_bits.stateChanged.connect(self.toggle_custom_bits_input)
-
-        # Inicializácia scény
+        self.load_bits_button.clicked.connect(self.load_bits_file)
+        self.custom_bits_input.textEdited.connect(self.forget_bits_file)
+        self.photon_rate_input.valueChanged.connect(self.set_photon_rate)
+        self.use_channel.toggled.connect(self.distance_input.setEnabled)
+
+        # Inicializácia scény - statická lavica sa nehýbe a fotóny sa posúvajú každú snímku,
+        # preto scéna nepoužíva BSP index (jeho aktualizácia pri každom posune je drahšia
+        # ako lineárne prechádzanie niekoľkých desiatok prvkov)
         self.scene = QGraphicsScene()
+        self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
         self.view.setScene(self.scene)
 
-        # Počet simulovaných fotónov (bitov)
-        self.num_bits = 8
+        # Skupina prvkov statickej optickej lavice (vytvorí sa raz v draw_static_elements)
+        self.bench = None
+
+        # Počet simulovaných fotónov (bitov) - nastavuje sa pri spustení z num_bits_input
+        self.num_bits = self.num_bits_input.value()
+
+        # Eva medzi Alicou a Bobom: podiel zachytených fotónov a báza merania (None = náhodná)
+        self.eve_fraction = 1.0
+        self.eve_basis = None
+
+        # Súbor s Alicinými bitmi (bitSource.BitFile) a súbor použitý v aktuálnom behu
+        self.bit_file = None
+        self.run_bit_file = None
+        self.custom_bits_placeholder = self.custom_bits_input.placeholderText()
+
+        # Štatistiky celého súboru sa počítajú v pracovnom vlákne (statisticsWorker);
+        # results_text je výstup behu, ku ktorému sa dopisuje priebeh a výsledok
+        self.file_worker = None
+        self.results_text = ""
+        QApplication.instance().aboutToQuit.connect(self.stop_file_statistics)
+
+        # Fyzický kanál (channelModel.FiberChannel); None = ideálny kanál bez strát.
+        # Nastavuje sa pri spustení podľa prepínača use_channel a dĺžky vlákna
+        self.channel = None
 
-        # Timer pre posielanie fotónov
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.send_next_photon)
+        # Timer animácie - tiká raz za snímku spoločných animačných hodín
+        self.animation_timer = ClockTimer(self)
+        self.animation_timer.setInterval(0)
+        self.animation_timer.timeout.connect(self.animate_photons)
 
-        # Timer pre animáciu fotónu
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self.animate_photon_step)
+        # Parametre animácie: frekvencia vysielania fotónov a ich rýchlosť v scéne (px/s)
+        self.photons_per_second = self.photon_rate_input.value()
+        self.photon_speed = 120.0
+        self.emit_credit = 0.0
+        self.next_photon = 0
+        self.finished_photons = 0
 
-        # Parametre animácie
-        self.animation_total_steps = 100
-        self.current_step = 0
-        self.animation_phase = None
-        self.photon_in_flight = False
+        # Fotóny na ceste (naraz ich môže letieť ľubovoľne veľa)
+        self.photons_in_flight = []
 
         # Alice vygeneruje náhodnú sekvenciu bitov
         self.alice_bits = []
 
+        # Výsledky BB84 pre zobrazované fotóny (počíta ich bb84Engine, animácia ich iba zobrazuje)
+        self.batch = None
+
         # Výsledný kľúč po "preosievaní"
         self.shared_key = []
 
-        # Aktuálny fotón a jeho atribúty
-        self.photon = None
-        self.alice_bit = None
-        self.alice_basis = None
-        self.bob_basis = None
-
         # Základné pozície
         self.scene_width = 800
         self.scene_height = 400
@@ -120,12 +178,20 @@ class QKDProtocol(QWidget):
             "↗": (QColor(0, 0, 255), 315)  # Modrá, 135°
         }
 
+        # Dráhy fotónov k jednotlivým detektorom
+        self.photon_paths = self.build_photon_paths()
+
         # Základné nastavenie
         self.setup_table()
         self.draw_static_elements()
 
+    def animation_timers(self):
+        """Časovače animácie, ktoré sa pozastavia so skrytou kartou"""
+        return [self.animation_timer]
+
     def toggle_custom_bits_input(self, state):
         """Prepína režim vlastných a náhodných bitov"""
+        self.load_bits_button.setEnabled(bool(state))
         if state:
             self.custom_bits_input.setEnabled(True)
             self.custom_bits_input.setStyleSheet("background-color: white; color: black; font-size: 14px;")
@@ -134,23 +200,46 @@ class QKDProtocol(QWidget):
             self.custom_bits_input.setEnabled(False)
             self.custom_bits_input.setStyleSheet("background-color: lightgray; color: gray; font-size: 14px;")
 
+    def load_bits_file(self):
+        """Výber súboru s Alicinými bitmi; súbor sa mapuje do pamäte a skontroluje po blokoch"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Aliciné bity zo súboru", "",
+            "Sekvencie bitov (*.txt *.bin *.dat *.raw *.npy);;Všetky súbory (*)")
+        if not path:
+            return
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            self.bit_file = BitFile(path)
+        except (ValueError, OSError) as e:
+            self.forget_bits_file()
+            self.output_label.setText(f"Chyba pri načítaní súboru: {e}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.custom_bits_input.clear()
+        self.custom_bits_input.setPlaceholderText(f"Súbor {self.bit_file.name}: {len(self.bit_file)} bitov")
+        self.output_label.setText(f"Načítaný súbor {self.bit_file.name} ({len(self.bit_file)} bitov).")
+
+    def forget_bits_file(self):
+        """Ručne zadaná sekvencia nahradí načítaný súbor"""
+        self.bit_file = None
+        self.custom_bits_input.setPlaceholderText(self.custom_bits_placeholder)
+
     def setup_table(self):
-        """Nastavenie tabuľky pre výsledky"""
-        self.table.setRowCount(self.num_bits)
-        self.table.setColumnCount(8)
-        self.table.setHorizontalHeaderLabels(["Aliciný bit", "Alicin fotón", "Bob vyberá bázu",
-                                              "Bobov výsledok", "Bobov bit", "Bob oznámi bázu",
-                                              "Zhoda s Alicou", "Hrubý kľúč"])
+        """Nastavenie tabuľky pre výsledky (model nad NumPy stĺpcami bb84Engine)"""
+        self.table_model = QKDTableModel(self.bases, BASIS_SYMBOLS, self)
+        self.table_model.clear(self.num_bits)
+        self.table.setModel(self.table_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
-        # Nastavenie farby hlavičky na čiernu
-        for col in range(8):
-            item = self.table.horizontalHeaderItem(col)
-            item.setForeground(QColor("black"))
+        # Pevná výška riadkov - tabuľka nemusí merať obsah ani pri státisícoch riadkov
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
 
     def draw_static_elements(self):
-        """Vykreslenie všetkých statických prvkov scény"""
-        self.scene.clear()
+        """Vykreslenie statickej optickej lavice - iba raz, do jednej skupiny s cache"""
+        if self.bench is not None:
+            return
 
         # Vykreslenie hlavných komponentov
         self.draw_alice_area()
@@ -158,6 +247,12 @@ class QKDProtocol(QWidget):
         self.draw_quantum_channel()
         self.draw_polarizers_and_detectors()
 
+        # Lavica sa už nemení - každý prvok sa rastruje raz do cache v súradniciach zariadenia
+        # a ďalšie snímky iba kopírujú hotové pixmapy (texty sa znova nesádzajú)
+        self.bench = self.scene.createItemGroup(self.scene.items())
+        for item in self.bench.childItems():
+            item.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
     def draw_alice_area(self):
         """Vykreslenie oblasti Alice s červeným rámčekom"""
         # Červený rámček pre Alicu
@@ -653,336 +748,310 @@ class QKDProtocol(QWidget):
 
         return line, head
 
-    def animate_photon_step(self):
-        """Animácia jedného kroku pohybu fotónu v kvantovom kanáli"""
-        try:
-            if self.current_step >= self.animation_total_steps:
-                self.animation_timer.stop()
-
-                # Pridané overenie existencie animačnej fázy
-                if not hasattr(self, 'animation_phase') or self.animation_phase is None:
-                    print("No animation phase defined!")
-                    return
+    def build_photon_paths(self):
+        """Predpočítanie dráh fotónu od zdroja k detektorom podľa Bobovej bázy a výsledku"""
+        table_width = 80
+        table_right_edge = self.alice_area.x() + (self.alice_area.width() - table_width) / 2 + table_width
+        bs = self.beam_splitter_pos
+        to_beam_splitter = [QPointF(table_right_edge, self.channel_y), QPointF(self.alice_area.right(), self.channel_y),
+                            QPointF(bs.x() - 15, bs.y())]
+
+        # Diagonálna báza: delič 50:50 → rotátor → horný polarizačný delič → detektor
+        diagonal = to_beam_splitter + [QPointF(bs.x(), bs.y() - 15),
+                                       QPointF(self.rotator_pos.x(), self.rotator_pos.y() + 10),
+                                       QPointF(self.rotator_pos.x(), self.rotator_pos.y() - 10),
+                                       QPointF(self.diagonal_polarizer_pos.x(), self.diagonal_polarizer_pos.y() + 15)]
+        # Rektilineárna báza: delič 50:50 → pravý polarizačný delič → detektor
+        rect = to_beam_splitter + [QPointF(bs.x() + 15, bs.y()),
+                                   QPointF(self.rect_polarizer_pos.x() - 15, self.rect_polarizer_pos.y())]
+
+        dp, rp = self.diagonal_polarizer_pos, self.rect_polarizer_pos
+        # Kľúč dráhy je (index bázy v bb84Engine, Bobov bit)
+        return {
+            (1, 0): PhotonPath(diagonal + [QPointF(dp.x(), dp.y() - 15),
+                                           QPointF(self.diagonal_detector_0_pos.x(), self.diagonal_detector_0_pos.y() + 15)]),
+            (1, 1): PhotonPath(diagonal + [QPointF(dp.x() + 15, dp.y()),
+                                           QPointF(self.diagonal_detector_1_pos.x() - 15, self.diagonal_detector_1_pos.y())]),
+            (0, 0): PhotonPath(rect + [QPointF(rp.x(), rp.y() + 15),
+                                       QPointF(rp.x(), self.rect_detector_0_pos.y() - 15)]),
+            (0, 1): PhotonPath(rect + [QPointF(rp.x() + 15, rp.y()),
+                                       QPointF(self.rect_detector_1_pos.x() - 15, self.rect_detector_1_pos.y())]),
+        }
 
-                if self.animation_phase == "to_beam_splitter":
-                    # Prechod do ďalšej fázy: podľa Bobovej bázy
-                    if self.bob_basis == "⨂":  # Diagonálna báza-pohyb k hornému deliču
-                        self.animation_phase = "to_diagonal_polarizer"
-                    else:  # Rektilineárna báza-pohyb k pravému deliču
-                        self.animation_phase = "to_rect_polarizer"
-                    self.current_step = 0
-                    self.animation_timer.start(10)
-
-                elif self.animation_phase == "to_diagonal_polarizer":
-                    # Prechod k jednému z detektorov pre diagonálnu bázu
-                    if self.alice_basis == self.bob_basis and self.alice_bit == 0:
-                        self.animation_phase = "to_diagonal_detector_0"
-                    elif self.alice_basis == self.bob_basis and self.alice_bit == 1:
-                        self.animation_phase = "to_diagonal_detector_1"
-                    else:
-                        # Ak sa bázy nezhodujú, náhodný výber detektora
-                        self.animation_phase = random.choice(["to_diagonal_detector_0", "to_diagonal_detector_1"])
-                    self.current_step = 0
-                    self.animation_timer.start(10)
-
-                elif self.animation_phase == "to_rect_polarizer":
-                    # Prechod k jednému z detektorov pre rektilineárnu bázu
-                    if self.alice_basis == self.bob_basis and self.alice_bit == 0:
-                        self.animation_phase = "to_rect_detector_0"
-                    elif self.alice_basis == self.bob_basis and self.alice_bit == 1:
-                        self.animation_phase = "to_rect_detector_1"
-                    else:
-                        # Ak sa bázy nezhodujú, náhodný výber detektora
-                        self.animation_phase = random.choice(["to_rect_detector_0", "to_rect_detector_1"])
-                    self.current_step = 0
-                    self.animation_timer.start(10)
-
-                elif self.animation_phase in ["to_diagonal_detector_0", "to_diagonal_detector_1",
-                                              "to_rect_detector_0", "to_rect_detector_1"]:
-                    # Fotón dorazil k detektoru
-                    self.scene.removeItem(self.photon_line)
-                    self.scene.removeItem(self.photon_head)
-                    self.photon_in_flight = False
-
-                    # Vyhodnotenie merania: ak sa bázy zhodujú, Bob dostane rovnaký bit ako Alice
-                    if self.alice_basis == self.bob_basis:
-                        measured_bit = self.alice_bit
-                        self.shared_key.append(measured_bit)
+    def animate_photons(self):
+        """Jedna snímka animácie: vyslanie nových fotónov a posun všetkých fotónov na ceste"""
+        try:
+            dt = self.animation_timer.frame_time()
+
+            # Alica vysiela fotóny s nastavenou frekvenciou, bez čakania na predchádzajúce
+            self.emit_credit += dt * self.photons_per_second
+            while self.emit_credit >= 1 and self.next_photon < self.num_bits:
+                self.emit_credit -= 1
+                self.send_next_photon()
+
+            # Posun fotónov - polohy na každej dráhe sa vypočítajú naraz
+            travelled = dt * self.photon_speed
+            for path_key, photons in self.photons_by_path().items():
+                path = self.photon_paths[path_key]
+                distances = np.array([photon["distance"] for photon in photons]) + travelled
+                xs, ys = path.sample(distances)
+                for photon, distance, x, y in zip(photons, distances, xs, ys):
+                    photon["distance"] = distance
+                    if distance >= path.length:
+                        self.detect_photon(photon)
                     else:
-                        # Ak sa bázy nezhodujú, bit je náhodný
-                        if self.animation_phase == "to_diagonal_detector_0" or self.animation_phase == "to_rect_detector_0":
-                            measured_bit = 0
-                        else:
-                            measured_bit = 1
-
-                    # Aktualizácia tabuľky
-                    self.update_table(self.current_bit, self.alice_bit, self.alice_basis, self.bob_basis, measured_bit)
-
-                    self.current_bit += 1
-                return
-
-            # Určenie počiatočnej a cieľovej pozície podľa fázy animácie
-            if self.animation_phase == "to_beam_splitter":
-                # Pohyb z hranice Alice k deliču 50:50
-                start_pos = QPointF(self.alice_area.right(), self.channel_y)
-                end_pos = QPointF(self.beam_splitter_pos.x() - 15, self.beam_splitter_pos.y())
-
-            elif self.animation_phase == "to_diagonal_polarizer":
-                # Pohyb od deliča 50:50 k rotátoru a potom k hornému polarizačnému deliču
-                if self.current_step < self.animation_total_steps / 2:
-                    # Prvá polovica - pohyb k rotátoru
-                    start_pos = QPointF(self.beam_splitter_pos.x(), self.beam_splitter_pos.y() - 15)
-                    end_pos = QPointF(self.rotator_pos.x(), self.rotator_pos.y() + 10)
-                    t = 2 * self.current_step / self.animation_total_steps
-                else:
-                    # Druhá polovica - pohyb od rotátora k hornému polarizačnému deliču
-                    start_pos = QPointF(self.rotator_pos.x(), self.rotator_pos.y() - 10)
-                    end_pos = QPointF(self.diagonal_polarizer_pos.x(), self.diagonal_polarizer_pos.y() + 15)
-                    t = 2 * (self.current_step - self.animation_total_steps / 2) / self.animation_total_steps
-
-                # Lineárna interpolácia
-                new_x = (1 - t) * start_pos.x() + t * end_pos.x()
-                new_y = (1 - t) * start_pos.y() + t * end_pos.y()
-                self.photon_line.setPos(new_x, new_y)
-                self.photon_head.setPos(new_x, new_y)
-                self.current_step += 1
-                return
-
-            elif self.animation_phase == "to_rect_polarizer":
-                # Pohyb od deliča 50:50 k pravému polarizačnému deliču
-                start_pos = QPointF(self.beam_splitter_pos.x() + 15, self.beam_splitter_pos.y())
-                end_pos = QPointF(self.rect_polarizer_pos.x() - 15, self.rect_polarizer_pos.y())
-
-            elif self.animation_phase == "to_diagonal_detector_0":
-                # Pohyb od horného polarizačného deliča k hornému detektoru (0)
-                start_pos = QPointF(self.diagonal_polarizer_pos.x(), self.diagonal_polarizer_pos.y() - 15)
-                end_pos = QPointF(self.diagonal_detector_0_pos.x(), self.diagonal_detector_0_pos.y() + 15)
-
-            elif self.animation_phase == "to_diagonal_detector_1":
-                # Pohyb od horného polarizačného deliča k pravému detektoru (1)
-                start_pos = QPointF(self.diagonal_polarizer_pos.x() + 15, self.diagonal_polarizer_pos.y())
-                end_pos = QPointF(self.diagonal_detector_1_pos.x() - 15, self.diagonal_detector_1_pos.y())
-
-            elif self.animation_phase == "to_rect_detector_0":
-                # Pohyb od pravého polarizačného deliča k dolnému detektoru (0)
-                start_pos = QPointF(self.rect_polarizer_pos.x(), self.rect_polarizer_pos.y() + 15)
-                end_pos = QPointF(self.rect_polarizer_pos.x(), self.rect_detector_0_pos.y() - 15)
-
-            elif self.animation_phase == "to_rect_detector_1":
-                # Pohyb od pravého polarizačného deliča k pravému detektoru (1)
-                start_pos = QPointF(self.rect_polarizer_pos.x() + 15, self.rect_polarizer_pos.y())
-                end_pos = QPointF(self.rect_detector_1_pos.x() - 15, self.rect_detector_1_pos.y())
-
-            else:
-                self.animation_timer.stop()
-                return
-
-            # Lineárna interpolácia pozície fotónu
-            t = self.current_step / self.animation_total_steps
-            new_x = (1 - t) * start_pos.x() + t * end_pos.x()
-            new_y = (1 - t) * start_pos.y() + t * end_pos.y()
+                        photon["line"].setPos(x, y)
+                        photon["head"].setPos(x, y)
 
-            self.photon_line.setPos(new_x, new_y)
-            self.photon_head.setPos(new_x, new_y)
-
-            self.current_step += 1
-
-            # Pridané globálne zachytávanie výnimiek
-            if not hasattr(self, 'photon_line') or not hasattr(self, 'photon_head'):
-                print("Photon line or head not initialized!")
-                return
-
-            # Zvyšok pôvodného kódu s pridaným ladením
+            if self.finished_photons >= self.num_bits:
+                self.finish_simulation()
         except Exception as e:
-            print(f"Unexpected error in animate_photon_step: {e}")
+            print(f"Unexpected error in animate_photons: {e}")
             import traceback
             traceback.print_exc()
             self.animation_timer.stop()
             self.start_button.setEnabled(True)
 
-    def send_next_photon(self):
-        """Odoslanie ďalšieho fotónu z Alicinej sekvencie"""
-        try:
-            if self.current_bit < self.num_bits and not self.photon_in_flight:
-                # Overenie, že máme dostatok bitov v sekvencii
-                if len(self.alice_bits) <= self.current_bit:
-                    print(
-                        f"Error: Not enough bits. Current bit: {self.current_bit}, Total bits: {len(self.alice_bits)}")
-                    self.timer.stop()
-                    self.start_button.setEnabled(True)
-                    return
-
-                # Získame bit z Alicinej sekvencie
-                self.alice_bit = self.alice_bits[self.current_bit]
-
-                # Pre Alicu a Boba vyberieme bázu náhodne (rektilineárna '⨁' alebo diagonálna '⨂')
-                self.alice_basis = random.choice(["⨁", "⨂"])
-                self.bob_basis = random.choice(["⨁", "⨂"])
-
-                # Overenie, že máme platný stav pre daný bit a bázu
-                try:
-                    photon_state = self.bases[self.alice_basis][self.alice_bit]
-                except KeyError as e:
-                    print(f"Error creating photon state: {e}")
-                    print(f"Alice basis: {self.alice_basis}, Alice bit: {self.alice_bit}")
-                    self.timer.stop()
-                    self.start_button.setEnabled(True)
-                    return
-
-                # Vytvorenie šípky fotónu
-                try:
-                    self.photon_line, self.photon_head = self.create_photon(photon_state)
-                    self.scene.addItem(self.photon_line)
-                    self.scene.addItem(self.photon_head)
-                except Exception as e:
-                    print(f"Error creating photon: {e}")
-                    self.timer.stop()
-                    self.start_button.setEnabled(True)
-                    return
-
-                # Výpočet pozície pravého okraja tabuľky zdroja fotónov
-                table_width = 80
-                table_x = self.alice_area.x() + (self.alice_area.width() - table_width) / 2
-                table_right_edge = table_x + table_width
-
-                # Nastavenie pozície fotónu na pravý okraj tabuľky
-                self.photon_line.setPos(table_right_edge, self.channel_y)
-                self.photon_head.setPos(table_right_edge, self.channel_y)
-
-                self.photon_in_flight = True
-                self.animation_phase = "to_beam_splitter"
-                self.current_step = 0
-
-                # Pridané bezpečnostné overenie
-                if not self.animation_timer.isActive():
-                    self.animation_timer.start(10)
-                else:
-                    print("Animation timer already active!")
-
-            elif self.current_bit >= self.num_bits:
-                # Keď už sme odoslali všetky bity, zastavíme timer a povolíme tlačidlo
-                self.timer.stop()
-                self.start_button.setEnabled(True)
-
-                # Vypíšeme výsledný preosiaty kľúč
-                final_key = ''.join(map(str, self.shared_key))
-                current_text = self.output_label.text()
-                self.output_label.setText(
-                    current_text + f"\n\nPreosiaty kľúč (po zahodení nezhodných báz): {final_key}"
-                )
-        except Exception as e:
-            print(f"Unexpected error in send_next_photon: {e}")
-            import traceback
-            traceback.print_exc()
-            self.timer.stop()
-            self.start_button.setEnabled(True)
-
-    def update_table(self, bit_index, alice_bit, alice_basis, bob_basis, bob_bit):
-        """Aktualizácia tabuľky s výsledkami meraní"""
-        def create_table_item(text, color, is_bold=False, size=14):
-            item = QTableWidgetItem(str(text))
-            font = QFont()
-            font.setPointSize(size)
-            if is_bold:
-                font.setBold(True)
-            item.setFont(font)
-            item.setForeground(QColor(color))
-            return item
-
-        # Aliciný bit
-        self.table.setItem(bit_index, 0, create_table_item(alice_bit, "black", True))
-
-        # Mapovanie fotónov na farby
-        photon_colors = {
-            "↑": QColor(0, 128, 0),  # zelená
-            "→": QColor(255, 0, 0),  # červená
-            "↗": QColor(0, 0, 255),  # modrá
-            "↘": QColor(255, 165, 0)  # oranžová
-        }
-
-        # Alicin fotón
-        alice_photon_state = self.bases[alice_basis][alice_bit]
-        # Farba bázy - rektilineárna (⨁) modrá, diagonálna (⨂) čierna
-        basis_color = QColor("blue") if alice_basis == "⨁" else QColor("black")
-        self.table.setItem(bit_index, 1, create_table_item(alice_photon_state, photon_colors[alice_photon_state], True))
+    def set_photon_rate(self, photons_per_second):
+        """Nastavenie frekvencie vysielania fotónov (platí hneď, aj počas animácie)"""
+        self.photons_per_second = photons_per_second
 
-        # Bobom vybraná báza
-        basis_color = QColor("blue") if bob_basis == "⨁" else QColor("black")
-        self.table.setItem(bit_index, 2, create_table_item(bob_basis, basis_color, True))
+    def photons_by_path(self):
+        """Rozdelenie letiacich fotónov podľa dráhy"""
+        groups = {}
+        for photon in self.photons_in_flight:
+            groups.setdefault(photon["path"], []).append(photon)
+        return groups
 
-        # Bobov výsledok
-        bob_photon_state = self.bases[bob_basis][bob_bit]
-        self.table.setItem(bit_index, 3, create_table_item(bob_photon_state, photon_colors[bob_photon_state], True))
-
-        # Bobov bit
-        self.table.setItem(bit_index, 4, create_table_item(bob_bit, "black", True))
-
-        # Bob oznamí bázu
-        basis_color = QColor("blue") if bob_basis == "⨁" else QColor("black")
-        self.table.setItem(bit_index, 5, create_table_item(bob_basis, basis_color, True))
-
-        # Alice oznamí shodu
-        if alice_basis == bob_basis:
-            self.table.setItem(bit_index, 6, create_table_item("✓", "green", True))
-            # Hrubý kľúč
-            self.table.setItem(bit_index, 7, create_table_item(bob_bit, "black", True))
-        else:
-            self.table.setItem(bit_index, 6, create_table_item("✗", "red", True))
-            # Prázdna bunka pre hrubý kľúč
-            self.table.setItem(bit_index, 7, create_table_item("", "black", True))
+    def send_next_photon(self):
+        """Odoslanie ďalšieho fotónu z Alicinej sekvencie"""
+        index = self.next_photon
+        self.next_photon += 1
+
+        # Bit, bázy aj výsledok merania vypočítal bb84Engine (rektilineárna '⨁' alebo diagonálna '⨂')
+        alice_basis = BASIS_SYMBOLS[self.batch.alice_bases[index]]
+        alice_bit = int(self.batch.alice_bits[index])
+        photon_state = self.bases[alice_basis][alice_bit]
+
+        # Vytvorenie šípky fotónu na začiatku dráhy
+        line, head = self.create_photon(photon_state)
+        self.scene.addItem(line)
+        self.scene.addItem(head)
+        path = (int(self.batch.bob_bases[index]), int(self.batch.bob_bits[index]))
+        start_x, start_y = self.photon_paths[path].sample(0.0)
+        line.setPos(start_x, start_y)
+        head.setPos(start_x, start_y)
+
+        self.photons_in_flight.append({"index": index, "path": path, "distance": 0.0, "line": line, "head": head})
+
+    def detect_photon(self, photon):
+        """Fotón dorazil k detektoru - odstránenie zo scény a zápis výsledku do tabuľky"""
+        self.scene.removeItem(photon["line"])
+        self.scene.removeItem(photon["head"])
+        self.photons_in_flight.remove(photon)
+        self.update_table(photon["index"])
+        self.finished_photons += 1
+
+    def finish_simulation(self):
+        """Ukončenie animácie a vypísanie výsledného kľúča"""
+        self.animation_timer.stop()
+        self.start_button.setEnabled(True)
+
+        # Fotóny na rôzne dlhých dráhach dorazia v inom poradí, kľúč sa skladá v poradí odoslania
+        # (stratený fotón alebo nezhodná báza sa nezapočíta)
+        self.shared_key = self.batch.bob_bits[self.batch.sifted].tolist()
+
+        # Vypíšeme výsledný preosiaty kľúč
+        final_key = preview_bits(self.shared_key)
+        current_text = self.output_label.text()
+        self.output_label.setText(
+            current_text + f"\n\nPreosiaty kľúč (po zahodení nezhodných báz): {final_key}"
+            + self.qber_text()
+            + self.reconciliation_text()
+        )
+        self.start_file_statistics()
+
+    def compute_instantly(self):
+        """Dokončenie simulácie bez animácie - celá tabuľka a výsledky sa zobrazia naraz"""
+        with batched_update(self):
+            self.next_photon = self.finished_photons = self.num_bits
+            self.table_model.reveal_all()
+            self.finish_simulation()
+
+    def clear_photons(self):
+        """Odstránenie všetkých letiacich fotónov zo scény"""
+        for photon in self.photons_in_flight:
+            self.scene.removeItem(photon["line"])
+            self.scene.removeItem(photon["head"])
+        self.photons_in_flight = []
+
+    def eve_parameters(self):
+        """Parametre útoku Evy pre bb84Engine podľa stavu prepínača v UI"""
+        if self.use_eve.isChecked():
+            return {"eve_fraction": self.eve_fraction, "eve_basis": self.eve_basis}
+        return {}
+
+    def start_file_statistics(self):
+        """Spustenie výpočtu štatistík BB84 pre celý súbor Alicinych bitov v pracovnom vlákne"""
+        if self.run_bit_file is None:
+            return
+        self.results_text = self.output_label.text()
+        self.file_worker = FileStatisticsWorker(self.run_bit_file, self.channel, self.rng_parties(),
+                                                self.eve_parameters(), self)
+        self.file_worker.progress.connect(self.show_file_progress)
+        self.file_worker.statistics.connect(self.show_file_statistics)
+        self.file_worker.failed.connect(self.show_file_error)
+        self.file_worker.finished.connect(self.file_worker.deleteLater)
+        self.set_file_status(self.progress_text(0, len(self.run_bit_file)))
+        self.file_worker.start()
+
+    def stop_file_statistics(self):
+        """Prerušenie rozbehnutého výpočtu štatistík súboru (počká sa na dokončenie bloku)"""
+        if self.file_worker is not None:
+            self.file_worker.requestInterruption()
+            self.file_worker.wait()
+            self.file_worker = None
+
+    def from_file_worker(self):
+        """Signál pochádza z práve bežiaceho výpočtu (nie z prerušeného predchádzajúceho)"""
+        return self.file_worker is not None and self.sender() is self.file_worker
+
+    def set_file_status(self, text):
+        """Riadok so stavom spracovania súboru pod výstupom behu"""
+        self.output_label.setText(self.results_text + f"\nCelý súbor {self.run_bit_file.name}: {text}")
+
+    @staticmethod
+    def progress_text(done, total):
+        """Text priebehu spracovania súboru"""
+        percent = 100 * done / total if total else 100
+        return f"spracovaných {done}/{total} bitov ({percent:.0f} %)"
+
+    def show_file_progress(self, done, total):
+        """Priebeh spracovania súboru"""
+        if self.from_file_worker():
+            self.set_file_status(self.progress_text(done, total))
+
+    def show_file_statistics(self, stats):
+        """Výsledné štatistiky BB84 pre celý súbor"""
+        if self.from_file_worker():
+            self.file_worker = None
+            self.set_file_status(f"{stats['photons']} fotónov, {stats['sifted_bits']} preosiatych bitov, "
+                                 f"QBER {stats['qber'] * 100:.2f} %")
+
+    def show_file_error(self, message):
+        """Chyba pri čítaní súboru v pracovnom vlákne"""
+        if self.from_file_worker():
+            self.file_worker = None
+            self.set_file_status(f"chyba pri spracovaní: {message}")
+
+    def rng_parties(self):
+        """Nezávislé náhodné prúdy Alice, Boba a Evy zo spoločnej služby rngService"""
+        return rngService.parties("qkd", "alice", "bob", "eve")
+
+    def qber_text(self):
+        """Text s chybovosťou preosiateho kľúča (pri odpočúvaní ju spôsobuje Eva)"""
+        stats = self.batch.statistics()
+        text = f"\nChybovosť (QBER): {stats['errors']}/{stats['sifted_bits']} = {stats['qber'] * 100:.1f} %"
+        if self.channel is not None:
+            text += (f"\nBob zaznamenal {int(self.batch.detected.sum())} z {len(self.batch)} fotónov "
+                     f"(vlákno {self.channel.distance_km:g} km)")
+        if self.batch.intercepted is not None:
+            text += f"\nEva zachytila {int(self.batch.intercepted.sum())} z {len(self.batch)} fotónov"
+        return text
+
+    def reconciliation_text(self):
+        """Text s Bobovým kľúčom po oprave chýb protokolom Cascade"""
+        alice_key, _ = self.batch.sifted_key()
+        # Permutácie Cascade aj seed Toeplitzovej matice volí Alica a zverejní ich
+        result = reconcile(alice_key, self.shared_key, rng=rngService.generator("qkd.alice"))
+        return (f"\nKľúč po oprave chýb (Cascade): {preview_bits(result['key'])}"
+                f" (odhalené paritné bity: {result['leaked_bits']})"
+                + self.privacy_amplification_text(result))
+
+    def privacy_amplification_text(self, reconciliation):
+        """Text s výsledným kľúčom po zosilnení súkromia Toeplitzovým hashom"""
+        # Pri niekoľkých fotónoch by konečná korekcia zjedla celý kľúč - použije sa asymptotický odhad
+        length = secure_key_length(reconciliation["bits"], self.batch.statistics()["qber"],
+                                   reconciliation["leaked_bits"], epsilon=None)
+        if length == 0:
+            return "\nPo zosilnení súkromia nezostal žiadny bezpečný bit."
+        final_key, _ = amplify(reconciliation["key"], length, rngService.generator("qkd.alice"))
+        return f"\nKľúč po zosilnení súkromia (Toeplitz): {preview_bits(final_key)}"
+
+    def update_table(self, bit_index):
+        """Zobrazenie výsledku merania fotónu v tabuľke"""
+        self.table_model.reveal(bit_index)
 
     def start_simulation(self):
         """Spustenie simulácie protokolu BB84"""
         try:
+            # Štatistiky súboru z predchádzajúceho behu by používali rovnaké náhodné prúdy
+            self.stop_file_statistics()
+            self.num_bits = self.num_bits_input.value()
+            self.channel = FiberChannel(distance_km=self.distance_input.value()) \
+                if self.use_channel.isChecked() else None
+
             # Determine whether to use custom or random bits
+            self.run_bit_file = None
             if self.use_custom_bits.isChecked():
-                # Get custom bits from input field
                 custom_sequence = self.custom_bits_input.text().strip()
-
-                # Validate input (only 0s and 1s)
-                if not all(bit in '01' for bit in custom_sequence):
-                    self.output_label.setText("Chyba: Vlastná sekvencia môže obsahovať iba 0 a 1.")
-                    return
+                if self.bit_file is not None and not custom_sequence:
+                    # Animuje sa začiatok súboru, štatistiky sa na konci spočítajú z celého súboru
+                    custom_bits = self.bit_file.head(self.num_bits)
+                    self.run_bit_file = self.bit_file
+                    source_text = f"sekvenciu bitov zo súboru {self.bit_file.name}"
+                else:
+                    # Vektorová kontrola zadaného textu (iba 0, 1 a medzery)
+                    custom_bits = parse_text(custom_sequence)
+                    if custom_bits is None:
+                        self.output_label.setText("Chyba: Vlastná sekvencia môže obsahovať iba 0 a 1.")
+                        return
+                    source_text = "manuálne vygenerovanú sekvenciu bitov"
 
                 # Make sure we have enough bits
-                if len(custom_sequence) < self.num_bits:
+                if len(custom_bits) < self.num_bits:
                     self.output_label.setText(f"Chyba: Očakáva sa aspoň {self.num_bits}-bitový vstup.")
                     return
 
-                # Convert string to list of integers and use only first num_bits
-                self.alice_bits = [int(bit) for bit in custom_sequence[:self.num_bits]]
-                source_text = "manuálne vygenerovanú sekvenciu bitov"
+                # Use only first num_bits
+                self.alice_bits = custom_bits[:self.num_bits].tolist()
+                self.batch = run_bb84(alice_bits=self.alice_bits, channel=self.channel,
+                                      parties=self.rng_parties(), **self.eve_parameters())
             else:
-                # Use original random generation
-                self.alice_bits = [random.choice([0, 1]) for _ in range(self.num_bits)]
+                # Náhodné bity, bázy aj Bobove merania vygeneruje bb84Engine naraz
+                self.batch = run_bb84(self.num_bits, channel=self.channel, parties=self.rng_parties(),
+                                      **self.eve_parameters())
+                self.alice_bits = self.batch.alice_bits.tolist()
                 source_text = "náhodne vygenerovanú sekvenciu bitov"
 
-            self.output_label.setText(f"Výstup: \nAlice použila {source_text}: "
-                                      f"{''.join(map(str, self.alice_bits))}")
+            self.output_label.setText(f"Výstup: \nAlice použila {source_text}: {preview_bits(self.alice_bits)}")
 
             # Reset všetkých kľúčových premenných
-            self.current_bit = 0
             self.shared_key = []
-            self.photon_in_flight = False
-
-            # Reset animačných premenných
-            self.current_step = 0
-            self.animation_phase = None
 
-            # Zastavenie všetkých timerov pred reštartom
-            self.timer.stop()
+            # Zastavenie animácie a odstránenie fotónov z predchádzajúceho behu
             self.animation_timer.stop()
+            self.clear_photons()
+
+            # Reset animačných premenných - prvý fotón sa vyšle hneď
+            self.emit_credit = 1.0
+            self.next_photon = 0
+            self.finished_photons = 0
 
             self.start_button.setEnabled(False)
 
-            # Reset tabuľky
-            self.table.clearContents()
+            # Reset tabuľky - nové riadky zatiaľ bez výsledkov
+            self.table_model.set_batch(self.batch)
 
-            # Prekresliť statické prvky
+            # Statická lavica zostáva v scéne, odstránili sa iba fotóny
             self.draw_static_elements()
 
-            # Spustí timer pre odosielanie fotónov (každých 1000 ms)
-            self.timer.start(1000)
+            if self.instant_mode.isChecked():
+                self.compute_instantly()
+                return
+
+            # Spustenie animácie (fotóny sa vysielajú podľa photons_per_second)
+            self.animation_timer.start()
         except Exception as e:
             print(f"Error in start_simulation: {e}")
             import traceback
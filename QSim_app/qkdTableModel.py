@@ -0,0 +1,147 @@
+import numpy as np
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt6.QtGui import QColor, QFont
+
+
+class QKDTableModel(QAbstractTableModel):
+    """Model tabuľky výsledkov BB84 nad NumPy stĺpcami bb84Engine.
+
+    Model si nepamätá žiadne bunky - text, farba aj písmo sa vytvoria až v data()
+    pre riadky, ktoré tabuľka práve zobrazuje, takže pamäť nezávisí od počtu
+    fotónov. Riadky sa odkrývajú postupne podľa animácie; zmeny z jednej iterácie
+    slučky udalostí sa odošlú jediným signálom dataChanged.
+    """
+
+    HEADERS = ["Aliciný bit", "Alicin fotón", "Bob vyberá bázu", "Bobov výsledok", "Bobov bit",
+               "Bob oznámi bázu", "Zhoda s Alicou", "Hrubý kľúč"]
+
+    # Farby fotónov podľa polarizácie
+    PHOTON_COLORS = {
+        "↑": QColor(0, 128, 0),  # zelená
+        "→": QColor(255, 0, 0),  # červená
+        "↗": QColor(0, 0, 255),  # modrá
+        "↘": QColor(255, 165, 0)  # oranžová
+    }
+
+    # Farba bázy - rektilineárna (⨁) modrá, diagonálna (⨂) čierna
+    BASIS_COLORS = (QColor("blue"), QColor("black"))
+
+    BLACK = QColor("black")
+    GRAY = QColor("gray")
+    GREEN = QColor("green")
+    RED = QColor("red")
+
+    def __init__(self, bases, basis_symbols, parent=None):
+        """Inicializácia prázdneho modelu s tabuľkou polarizácií (QKDProtocol.bases)"""
+        super().__init__(parent)
+        self.basis_symbols = basis_symbols
+        # Symbol fotónu podľa [báza][bit] v kódovaní bb84Engine
+        self.photon_symbols = [[bases[symbol][bit] for bit in (0, 1)] for symbol in basis_symbols]
+
+        self.font = QFont()
+        self.font.setPointSize(14)
+        self.font.setBold(True)
+
+        self.batch = None
+        self.rows = 0
+        self.revealed = np.zeros(0, dtype=bool)
+
+        # Rozsah riadkov zmenených od posledného odoslania dataChanged
+        self.dirty_first = None
+        self.dirty_last = None
+
+    def set_batch(self, batch, rows=None):
+        """Nastavenie nového bloku výsledkov; všetky riadky sú zatiaľ prázdne"""
+        self.beginResetModel()
+        self.batch = batch
+        self.rows = len(batch) if rows is None else rows
+        self.revealed = np.zeros(self.rows, dtype=bool)
+        self.dirty_first = self.dirty_last = None
+        self.endResetModel()
+
+    def clear(self, rows):
+        """Prázdna tabuľka s daným počtom riadkov (pred spustením simulácie)"""
+        self.set_batch(None, rows)
+
+    def reveal(self, first, last=None):
+        """Odkrytie výsledkov riadkov first..last (signál sa odošle v ďalšej iterácii slučky)"""
+        if last is None:
+            last = first
+        self.revealed[first:last + 1] = True
+        if self.dirty_first is None:
+            self.dirty_first, self.dirty_last = first, last
+            QTimer.singleShot(0, self.flush)
+        else:
+            self.dirty_first = min(self.dirty_first, first)
+            self.dirty_last = max(self.dirty_last, last)
+
+    def reveal_all(self):
+        """Odkrytie všetkých riadkov naraz"""
+        if self.rows:
+            self.reveal(0, self.rows - 1)
+
+    def flush(self):
+        """Odoslanie jedného dataChanged pre všetky riadky zmenené od posledného volania"""
+        if self.dirty_first is None:
+            return
+        first, last = self.dirty_first, self.dirty_last
+        self.dirty_first = self.dirty_last = None
+        self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self.HEADERS[section]
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return self.BLACK
+        elif role == Qt.ItemDataRole.DisplayRole:
+            return section + 1
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self.batch is None or not self.revealed[index.row()]:
+            return None
+        if role == Qt.ItemDataRole.FontRole:
+            return self.font
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ForegroundRole):
+            text, color = self.cell(index.row(), index.column())
+            return text if role == Qt.ItemDataRole.DisplayRole else color
+        return None
+
+    def cell(self, row, column):
+        """Text a farba jednej bunky vypočítané z NumPy stĺpcov"""
+        batch = self.batch
+        alice_bit = int(batch.alice_bits[row])
+        alice_basis = int(batch.alice_bases[row])
+        bob_basis = int(batch.bob_bases[row])
+        detected = bool(batch.detected[row])
+        bob_bit = int(batch.bob_bits[row])
+
+        if column == 0:
+            return str(alice_bit), self.BLACK
+        if column == 1:
+            symbol = self.photon_symbols[alice_basis][alice_bit]
+            return symbol, self.PHOTON_COLORS[symbol]
+        if column in (2, 5):
+            return self.basis_symbols[bob_basis], self.BASIS_COLORS[bob_basis]
+        if column == 3:
+            # Stratený fotón detektor nezaznamenal
+            if not detected:
+                return "–", self.GRAY
+            symbol = self.photon_symbols[bob_basis][bob_bit]
+            return symbol, self.PHOTON_COLORS[symbol]
+        if column == 4:
+            return (str(bob_bit), self.BLACK) if detected else ("–", self.GRAY)
+
+        sifted = bool(batch.sifted[row])
+        if column == 6:
+            return ("✓", self.GREEN) if sifted else ("✗", self.RED)
+        # Hrubý kľúč
+        return (str(bob_bit) if sifted else ""), self.BLACK
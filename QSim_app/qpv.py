@@ -1,15 +1,16 @@
 from PyQt6.QtWidgets import (QWidget, QApplication, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QLineEdit, QTextEdit, QGroupBox, QTabWidget, QFrame, QSizePolicy)
-from PyQt6.QtCore import Qt, QTimer, QPoint, QRectF
+from PyQt6.QtCore import Qt, QPoint, QRectF
 from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QLinearGradient, QBrush
 
-# Qiskit importy pre kvantovú simuláciu
-from qiskit import QuantumCircuit, Aer, execute
-from qiskit.quantum_info import Statevector
+# Qiskit pre kvantovú simuláciu sa načítava až pri prvom použití
+from QSim_app import quantumBackend
+from QSim_app.animationClock import ClockTimer
+from QSim_app.instantMode import instant_checkbox, batched_update
+from QSim_app import rngService
 
 import sys
 import math
-import random
 import numpy as np
 import time
 
@@ -65,6 +66,9 @@ class ClassicalChannel:
 
 
 class QuantumPositionVerification(QWidget):
+    # Posledný krok protokolu - výsledok overenia
+    FINAL_STEP = 6
+
     def __init__(self, parent=None):
         """Inicializácia protokolu QPV widgetu"""
         super().__init__(parent)
@@ -119,7 +123,6 @@ class QuantumPositionVerification(QWidget):
         self.animation_v2_signal_start_time = 0.0  # Čas začiatku signálu od V2
         self.animation_response_v1_start_time = 0.0  # Čas začiatku odpovede k V1
         self.animation_response_v2_start_time = 0.0  # Čas začiatku odpovede k V2
-        self.dt = 0.05  # časový krok animácie
         self.signal_position_v1 = 0  # Pozícia signálu od V1 (0-100%)
         self.signal_position_v2 = 0  # Pozícia signálu od V2 (0-100%)
         self.response_position_v1 = 0  # Pozícia odpoveďového signálu k V1 (0-100%)
@@ -155,10 +158,11 @@ class QuantumPositionVerification(QWidget):
             "Stanovenie výsledku overenia - podvod odhalený"
         ]
 
-        # Časovač animácie
-        self.timer = QTimer(self)
+        # Časovač animácie - každá snímka spoločných hodín, čas animácie
+        # sa posúva o skutočne uplynutý čas snímky
+        self.timer = ClockTimer(self)
         self.timer.timeout.connect(self.update_animation)
-        self.timer.setInterval(50)  # 50ms = 20fps
+        self.timer.setInterval(0)
 
         # Inicializácia kvantových obvodov
         self.prepare_quantum_circuits()
@@ -166,6 +170,10 @@ class QuantumPositionVerification(QWidget):
         # Nastavenie používateľského rozhrania
         self.setup_ui()
 
+    def animation_timers(self):
+        """Časovače animácie, ktoré sa pozastavia so skrytou kartou"""
+        return [self.timer]
+
     def setup_ui(self):
         """Nastavenie používateľského rozhrania"""
         main_layout = QVBoxLayout(self)
@@ -250,9 +258,13 @@ class QuantumPositionVerification(QWidget):
         self.reset_button = QPushButton("Resetovať")
         self.reset_button.clicked.connect(self.reset_ui)
 
+        # Pri okamžitom výpočte spustenie protokolu prejde všetky kroky naraz
+        self.instant_mode = instant_checkbox()
+
         button_layout.addWidget(self.start_button)
         button_layout.addWidget(self.next_step_button)
         button_layout.addWidget(self.reset_button)
+        button_layout.addWidget(self.instant_mode)
         control_layout.addLayout(button_layout)
 
         main_layout.addWidget(control_box)
@@ -294,8 +306,9 @@ class QuantumPositionVerification(QWidget):
 
     def prepare_quantum_circuits(self):
         """Inicializácia kvantových obvodov pre protokol."""
-        # Základný jednoqubitový obvod
-        self.circuit = QuantumCircuit(1)
+        # Jednoqubitový obvod sa vytvára až pri generovaní výzvy, aby sa Qiskit
+        # nenačítaval pri samotnom vytvorení widgetu
+        self.circuit = None
 
     def start_protocol(self):
         """Spustenie protokolu s aktuálnymi nastaveniami."""
@@ -333,6 +346,10 @@ class QuantumPositionVerification(QWidget):
             self.start_button.setEnabled(False)
             self.next_step_button.setEnabled(True)
 
+            if self.instant_mode.isChecked():
+                self.complete_instantly()
+                return
+
             # Spustenie animácie
             self.timer.start()
 
@@ -344,6 +361,17 @@ class QuantumPositionVerification(QWidget):
             # Neplatný vstup - nič nerobíme (bez výpisu do konzoly)
             pass
 
+    def complete_instantly(self):
+        """Vykonanie všetkých krokov protokolu naraz - signály sa zobrazia už doručené"""
+        with batched_update(self):
+            while 0 <= self.protocol_step < self.FINAL_STEP:
+                self.next_protocol_step()
+
+            # Všetky signály a odpovede dorazili do cieľa
+            self.signal_position_v1 = self.signal_position_v2 = 1.0
+            self.response_position_v1 = self.response_position_v2 = 1.0
+            self.visualization_area.set_protocol_state(self.get_current_state())
+
     def add_classical_message(self, message):
         """Pridanie správy do zoznamu klasickej komunikácie na zobrazenie."""
         self.classical_messages.append(message)
@@ -549,7 +577,7 @@ class QuantumPositionVerification(QWidget):
             # Zastaviť animáciu po dokončení overenia
             self.timer.stop()
 
-        self.animation_time += self.dt
+        self.animation_time += self.timer.frame_time()
 
         # Aktualizácia pozície signálu od V1 (kvantový stav)
         if self.v1_signal_active:
@@ -620,10 +648,10 @@ class QuantumPositionVerification(QWidget):
     def generate_challenge(self):
         """Vygenerovanie náhodného kvantového stavu a bázy merania."""
         # Generovanie náhodného qubitového stavu (|0⟩, |1⟩, |+⟩, |−⟩)
-        self.qubit_type = random.randint(0, 3)
+        self.qubit_type = rngService.stream("qpv.v1").integer(0, 4)
 
         # Vytvorenie nového obvodu pre toto kolo
-        self.circuit = QuantumCircuit(1)
+        self.circuit = quantumBackend.load().QuantumCircuit(1)
 
         # Príprava stavu na základe typu
         if self.qubit_type == 0:  # |0⟩
@@ -640,7 +668,7 @@ class QuantumPositionVerification(QWidget):
         self.original_state = self.circuit.copy()
 
         # Generovanie náhodnej bázy merania
-        self.basis = random.randint(0, 1)  # 0: Z-báza {|0⟩, |1⟩}, 1: X-báza {|+⟩, |−⟩}
+        self.basis = rngService.stream("qpv.v2").integer(0, 2)  # 0: Z-báza {|0⟩, |1⟩}, 1: X-báza {|+⟩, |−⟩}
 
         # Výpočet očakávaného výsledku merania
         if self.basis == 0:  # Z-báza
@@ -700,8 +728,9 @@ class QuantumPositionVerification(QWidget):
         measurement_circuit.measure_all()
 
         # Vykonanie merania
-        backend = Aer.get_backend('qasm_simulator')
-        job = execute(measurement_circuit, backend, shots=1)
+        backend = quantumBackend.get_backend('qasm_simulator')
+        job = quantumBackend.load().execute(measurement_circuit, backend, shots=1,
+                                              seed_simulator=rngService.simulator_seed("qpv.sim"))
         result = job.result()
         counts = result.get_counts()
         self.measurement_result = int(list(counts.keys())[0])
@@ -743,8 +772,8 @@ class QuantumPositionVerification(QWidget):
 
         else:
             # Pre poctivého dôkazníka - časy sú rovnaké ako očakávané s malou odchýlkou
-            self.response_time_v1 = self.expected_time_v1 + random.normalvariate(0, 0.000001)
-            self.response_time_v2 = self.expected_time_v2 + random.normalvariate(0, 0.000001)
+            self.response_time_v1 = self.expected_time_v1 + rngService.generator("qpv.prover").normal(0, 0.000001)
+            self.response_time_v2 = self.expected_time_v2 + rngService.generator("qpv.prover").normal(0, 0.000001)
 
     def verify_response(self):
         """Overenie odpovede dôkazníka."""
@@ -1,10 +1,12 @@
-from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtSvgWidgets import QGraphicsSvgItem
 from PyQt6.QtWidgets import QApplication, QWidget, QGraphicsScene, QGraphicsView, QVBoxLayout, QLabel, QPushButton, \
     QGraphicsPixmapItem
-from PyQt6.QtCore import QTimer, QPointF, Qt
-from PyQt6.QtGui import QPixmap
-import random
+from PyQt6.QtCore import QPointF, Qt
+
+from QSim_app.assetCache import svg_renderer, svg_pixmap
+from QSim_app.animationClock import ClockTimer
+from QSim_app.instantMode import instant_checkbox, batched_update
+from QSim_app import rngService
 
 
 class QRNG(QWidget):
@@ -45,14 +47,19 @@ class QRNG(QWidget):
 
         self.main_layout.addWidget(container_widget)
 
+        # Režim okamžitého výpočtu - bity sa vygenerujú bez animácie fotónov
+        self.instant_mode = instant_checkbox()
+        self.instant_mode.setStyleSheet("color: black; font-size: 14px;")
+        self.main_layout.addWidget(self.instant_mode)
+
         # Tlačidlo pre generovanie
         self.generate_button = QPushButton("Generovať sekvenciu bitov")
         self.generate_button.setStyleSheet("background-color: gray; color: black; font-size: 16px;")
         self.generate_button.clicked.connect(self.start_animation)
         self.main_layout.addWidget(self.generate_button)
 
-        # Časovač pre animáciu
-        self.timer = QTimer()
+        # Časovač pre animáciu (poháňaný spoločnými animačnými hodinami)
+        self.timer = ClockTimer(self)
         self.timer.timeout.connect(self.update_animation)
 
         # Premenné pre animáciu
@@ -63,7 +70,7 @@ class QRNG(QWidget):
         self.photon_in_flight = None
 
         # Časovač pre kroky animácie
-        self.animation_timer = QTimer()
+        self.animation_timer = ClockTimer(self)
         self.animation_timer.timeout.connect(self.animate_photon_step)
         self.animation_steps = 100
         self.current_step = 0
@@ -78,33 +85,37 @@ class QRNG(QWidget):
 
         self.draw_static_elements()
 
+    def animation_timers(self):
+        """Časovače animácie, ktoré sa pozastavia so skrytou kartou"""
+        return [self.timer, self.animation_timer]
+
     def draw_static_elements(self):
         """Vykreslenie statických prvkov na scéne (zdroj fotónov, polarizátor, detektory)"""
         # Zdroj fotónov
-        source_svg_renderer = QSvgRenderer("icon/zdroj_fotonov.svg")
+        source_svg_renderer = svg_renderer("icon/zdroj_fotonov.svg")
         source_item = QGraphicsSvgItem()
         source_item.setSharedRenderer(source_svg_renderer)
         source_item.setPos(self.source_pos.x() - 20, self.source_pos.y() - 20)
         self.scene.addItem(source_item)
 
         # Polarizátor
-        splitter_svg_renderer = QSvgRenderer("icon/splitter.svg")
+        splitter_svg_renderer = svg_renderer("icon/splitter.svg")
         splitter_item = QGraphicsSvgItem()
         splitter_item.setSharedRenderer(splitter_svg_renderer)
         splitter_item.setPos(self.splitter_pos.x() - 20, self.splitter_pos.y() - 20)
         self.scene.addItem(splitter_item)
 
         # Detektor 0
-        detector_0_svg_renderer = QSvgRenderer("icon/D0.svg")
+        detector_0_svg_renderer = svg_renderer("icon/D0.svg")
         detector_0_item = QGraphicsSvgItem()
         detector_0_item.setSharedRenderer(detector_0_svg_renderer)
         detector_0_item.setPos(self.detector_0_pos.x() - 35, self.detector_0_pos.y() - 20)
         self.scene.addItem(detector_0_item)
 
         # Detektor 1
-        svg_renderer = QSvgRenderer("icon/D1.svg")
+        detector_1_svg_renderer = svg_renderer("icon/D1.svg")
         detector_1_item = QGraphicsSvgItem()
-        detector_1_item.setSharedRenderer(svg_renderer)
+        detector_1_item.setSharedRenderer(detector_1_svg_renderer)
         detector_1_item.setPos(self.detector_1_pos.x() - 35, self.detector_1_pos.y() - 20)
         self.scene.addItem(detector_1_item)
 
@@ -114,13 +125,32 @@ class QRNG(QWidget):
         self.random_bits = []
         self.current_bit = 0
         self.photons = []
+        if self.instant_mode.isChecked():
+            self.generate_instantly()
+            return
         self.timer.start(800)
 
+    def generate_instantly(self):
+        """Vygenerovanie všetkých bitov naraz bez animácie"""
+        with batched_update(self):
+            # Zrušenie prípadnej rozbehnutej animácie
+            self.timer.stop()
+            self.animation_timer.stop()
+            if self.photon_in_flight:
+                self.scene.removeItem(self.photon_in_flight)
+                self.photon_in_flight = None
+
+            # Každý fotón skončí na polarizačnom deliči v detektore 0 alebo 1 s rovnakou pravdepodobnosťou
+            self.random_bits = rngService.stream("qrng.source").bits(self.num_bits).tolist()
+            self.current_bit = self.num_bits
+            self.output_label.setText(f"Generované bity: {''.join(map(str, self.random_bits))}")
+
     def update_animation(self):
         """Aktualizácia animácie - vytváranie nových fotónov a spustenie ich pohybu"""
         if self.current_bit < self.num_bits and not self.photon_in_flight:
-            bit = random.choice([0, 1])
-            photon_image = QPixmap("icon/B.svg")
+            bit = rngService.stream("qrng.source").bit()
+            # Obrázok fotónu sa rastruje iba raz a zdieľa sa v cache
+            photon_image = svg_pixmap("icon/B.svg")
             photon = QGraphicsPixmapItem(photon_image)
             photon.setScale(1)
             photon.setPos(self.source_pos)
@@ -145,9 +175,9 @@ class QRNG(QWidget):
             if self.animation_phase == 'to_polarizer':
                 # Určenie nasledujúcej fázy
                 if self.bit == 0:
-                    self.photon.setPixmap(QPixmap("icon/B0.svg"))
+                    self.photon.setPixmap(svg_pixmap("icon/B0.svg"))
                 else:
-                    self.photon.setPixmap(QPixmap("icon/B1.svg"))
+                    self.photon.setPixmap(svg_pixmap("icon/B1.svg"))
                 self.animation_phase = 'to_detector'
                 self.animation_steps = 0
                 self.current_step = 0
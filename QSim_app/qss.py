@@ -1,13 +1,14 @@
 from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt, QTimer, QPointF, QRectF, QLineF
+from PyQt6.QtCore import Qt, QPointF, QRectF, QLineF
 from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QPainter, QLinearGradient
 
-import random
 import math
 import traceback
 
-from qiskit import QuantumCircuit, Aer, execute
-from qiskit.quantum_info import Statevector
+from QSim_app import quantumBackend
+from QSim_app.animationClock import ClockTimer
+from QSim_app.instantMode import instant_checkbox, batched_update
+from QSim_app import rngService
 
 
 class ParticleItem(QGraphicsItem):
@@ -234,12 +235,18 @@ class QSSProtocolUI(QWidget):
 
         # Animácia
         self.animation_step = 0
-        self.distribution_timer = QTimer()
+        self.distribution_timer = ClockTimer(self)
         self.distribution_timer.timeout.connect(self.next_distribution_step)
-        self.measurement_timer = QTimer()
+        self.measurement_timer = ClockTimer(self)
+
+        # Odložené kroky merania a rekonštrukcie (jednorazový časovač na spoločných hodinách)
+        self.step_timer = ClockTimer(self)
+        self.step_timer.setSingleShot(True)
+        self.step_timer.timeout.connect(self.run_pending_step)
+        self.pending_step = None
 
         # Timer pre všetky entanglement čiary
-        self.entanglement_timer = QTimer()
+        self.entanglement_timer = ClockTimer(self)
         self.entanglement_timer.timeout.connect(self.update_all_entanglements)
 
         # Inicializácia UI a scény
@@ -253,6 +260,10 @@ class QSSProtocolUI(QWidget):
         # Pripojenie signálu pre meranie
         self.measurement_timer.timeout.connect(self.next_measurement_step)
 
+    def animation_timers(self):
+        """Časovače animácie, ktoré sa pozastavia so skrytou kartou"""
+        return [self.distribution_timer, self.measurement_timer, self.entanglement_timer, self.step_timer]
+
     def update_all_entanglements(self):
         """Aktualizácia všetkých entanglement čiar naraz"""
         for line in self.entanglement_lines:
@@ -327,6 +338,10 @@ class QSSProtocolUI(QWidget):
         self.reset_btn.clicked.connect(self.reset_protocol)
         controls_layout.addWidget(self.reset_btn)
 
+        # Distribúcia aj meranie sa pri okamžitom výpočte vykonajú bez animácie
+        self.instant_mode = instant_checkbox()
+        controls_layout.addWidget(self.instant_mode)
+
         controls_group.setLayout(controls_layout)
         left_panel.addWidget(controls_group)
 
@@ -573,11 +588,12 @@ class QSSProtocolUI(QWidget):
         self.secret = int(self.secret_combo.currentText())
         n = self.n_spinner.value()
 
-        # Inicializácia simulátora
-        self.simulator = Aer.get_backend('statevector_simulator')
+        # Inicializácia simulátora (Qiskit sa načíta až tu)
+        qiskit = quantumBackend.load()
+        self.simulator = quantumBackend.get_backend('statevector_simulator')
 
         # Vytvorenie obvodu
-        self.circuit = QuantumCircuit(n, n)
+        self.circuit = qiskit.QuantumCircuit(n, n)
         self.circuit.h(0)  # Krok 1: Stav |+⟩ na prvom qubite
 
         # Krok 2: CNOT na vytvorenie previazania
@@ -657,10 +673,20 @@ class QSSProtocolUI(QWidget):
             self.animation_step = 0
             self.distribute_btn.setEnabled(False)
             self.status_label.setText("Alice distribuuje kvantové podiely ostatným účastníkom...")
+            if self.instant_mode.isChecked():
+                self.distribute_instantly()
+                return
             self.distribution_timer.start(500)  # 500ms interval
         except Exception as e:
             self.show_error(f"Chyba pri distribúcii podielov: {str(e)}")
 
+    def distribute_instantly(self):
+        """Presun všetkých qubitov k účastníkom naraz bez animácie"""
+        with batched_update(self):
+            # Každý krok presunie jeden qubit, posledný krok povolí rekonštrukciu
+            for _ in range(self.n_spinner.value()):
+                self.next_distribution_step()
+
     def next_distribution_step(self):
         """Animácia distribúcie ďalšieho qubitu"""
         try:
@@ -716,21 +742,23 @@ class QSSProtocolUI(QWidget):
                 "Alice, Bob a Charlie nezávisle merajú svoje qubity v náhodných bázach (X alebo Z)...")
 
             # Náhodný výber meracích báz
-            self.measurement_bases = [random.choice(["X", "Z"]) for _ in range(n)]
+            self.measurement_bases = ["X" if bit else "Z" for bit in rngService.stream("qss.participants").bits(n).tolist()]
 
             # Vytvorenie meracieho obvodu
             try:
                 # Inicializácia simulátora, ak nie je
+                qiskit = quantumBackend.load()
                 if self.simulator is None:
-                    self.simulator = Aer.get_backend('statevector_simulator')
+                    self.simulator = quantumBackend.get_backend('statevector_simulator')
 
                 # Simulácia merania qubitu
-                statevector_job = execute(self.circuit, self.simulator)
+                statevector_job = qiskit.execute(self.circuit, self.simulator,
+                                                 seed_simulator=rngService.simulator_seed("qss.sim"))
                 statevector = statevector_job.result().get_statevector()
 
                 # Vytvorenie meracieho obvodu
-                measurement_circuit = QuantumCircuit(n, n)
-                measurement_circuit.initialize(Statevector(statevector), range(n))
+                measurement_circuit = qiskit.QuantumCircuit(n, n)
+                measurement_circuit.initialize(qiskit.Statevector(statevector), range(n))
 
                 # Aplikácia Hadamard pre X-bázu
                 for i in range(n):
@@ -739,8 +767,9 @@ class QSSProtocolUI(QWidget):
 
                 # Meranie qubitov
                 measurement_circuit.measure(range(n), range(n))
-                qasm_simulator = Aer.get_backend('qasm_simulator')
-                qasm_job = execute(measurement_circuit, qasm_simulator, shots=1)
+                qasm_simulator = quantumBackend.get_backend('qasm_simulator')
+                qasm_job = qiskit.execute(measurement_circuit, qasm_simulator, shots=1,
+                                          seed_simulator=rngService.simulator_seed("qss.sim"))
                 measurement_string = list(qasm_job.result().get_counts().keys())[0]
                 measurement_bits = [int(bit) for bit in measurement_string]
 
@@ -749,12 +778,16 @@ class QSSProtocolUI(QWidget):
             except Exception as e:
                 # Ak nastane chyba v simulácii, použijú sa náhodné výsledky
                 self.show_error(f"Chyba v kvantovej simulácii: {str(e)}. Použité náhodné výsledky.")
-                self.measurements = [random.randint(0, 1) for _ in range(n)]
+                self.measurements = rngService.stream("qss.measurement").bits(n).tolist()
 
             # Aktualizácia tabuľky s bázami
             for i in range(n):
                 self.shares_table.setItem(i, 2, QTableWidgetItem(self.measurement_bases[i]))
 
+            if self.instant_mode.isChecked():
+                self.measure_instantly()
+                return
+
             # Spustenie animácie merania
             self.measurement_timer.start(400)
         except Exception as e:
@@ -788,8 +821,8 @@ class QSSProtocolUI(QWidget):
                 qubit.startMeasurementAnimation()
 
                 # Po krátkom čase dokončíme meranie
-                QTimer.singleShot(300, lambda q=qubit, r=result, b=basis, i=self.animation_step:
-                self.finish_measurement_for_qubit(q, r, b, i))
+                self.schedule_step(300, lambda q=qubit, r=result, b=basis, i=self.animation_step:
+                                   self.finish_measurement_for_qubit(q, r, b, i))
 
                 # Zastavenie timera počas animácie
                 self.measurement_timer.stop()
@@ -798,40 +831,65 @@ class QSSProtocolUI(QWidget):
                 self.measurement_timer.stop()
                 self.status_label.setText(
                     "Merania dokončené. Účastníci verejne oznámia svoje meracie bázy (nie výsledky merania)...")
-                QTimer.singleShot(1500, self.show_reconstruction_result)
+                self.schedule_step(1500, self.show_reconstruction_result)
         except Exception as e:
             self.measurement_timer.stop()
             self.show_error(f"Chyba pri meraní qubitov: {str(e)}")
 
+    def measure_instantly(self):
+        """Zobrazenie všetkých meraní naraz a okamžitá rekonštrukcia tajomstva"""
+        with batched_update(self):
+            count = min(len(self.qubit_items), len(self.measurements), len(self.measurement_bases))
+            for index in range(count):
+                self.show_measurement(self.qubit_items[index], self.measurements[index],
+                                      self.measurement_bases[index], index)
+            self.animation_step = count
+            self.show_reconstruction_result()
+
+    def show_measurement(self, qubit, result, basis, index):
+        """Nastavenie nameraného stavu qubitu a zápis výsledku do tabuľky"""
+        # Zastavenie animácie merania
+        qubit.stopMeasurementAnimation()
+        qubit.measuring = False
+
+        # Nastavenie výsledného stavu - explicitne ako číslo
+        result_colors = [QColor(50, 200, 50), QColor(200, 50, 50)]  # Zelená pre 0, červená pre 1
+        qubit.color = result_colors[result]
+        qubit.setState(str(result))  # Číselný výsledok bez špeciálneho formátovania
+        qubit.setMeasurementBasis(basis)
+
+        # Vynútenie prekreslenia
+        qubit.update()
+        if self.scene:
+            self.scene.update()
+
+        # Aktualizácia tabuľky
+        if index < self.shares_table.rowCount():
+            self.shares_table.setItem(index, 3, QTableWidgetItem(str(result)))
+
     def finish_measurement_for_qubit(self, qubit, result, basis, index):
         """Dokončenie merania qubitu a zobrazenie výsledku"""
         try:
-            # Zastavenie animácie merania
-            qubit.stopMeasurementAnimation()
-            qubit.measuring = False
-
-            # Nastavenie výsledného stavu - explicitne ako číslo
-            result_colors = [QColor(50, 200, 50), QColor(200, 50, 50)]  # Zelená pre 0, červená pre 1
-            qubit.color = result_colors[result]
-            qubit.setState(str(result))  # Číselný výsledok bez špeciálneho formátovania
-            qubit.setMeasurementBasis(basis)
-
-            # Vynútenie prekreslenia
-            qubit.update()
-            if self.scene:
-                self.scene.update()
-
-            # Aktualizácia tabuľky
-            if index < self.shares_table.rowCount():
-                self.shares_table.setItem(index, 3, QTableWidgetItem(str(result)))
+            self.show_measurement(qubit, result, basis, index)
 
             # Ďalší krok
             self.animation_step += 1
-            QTimer.singleShot(300, lambda: self.measurement_timer.start())
+            self.schedule_step(300, self.measurement_timer.start)
         except Exception as e:
             self.show_error(f"Chyba pri dokončení merania: {str(e)}")
             self.animation_step += 1
-            QTimer.singleShot(300, lambda: self.measurement_timer.start())
+            self.schedule_step(300, self.measurement_timer.start)
+
+    def schedule_step(self, msec, callback):
+        """Odložené vykonanie kroku animácie cez spoločné hodiny (zastaví sa s animáciou)"""
+        self.pending_step = callback
+        self.step_timer.start(msec)
+
+    def run_pending_step(self):
+        """Vykonanie odloženého kroku animácie"""
+        callback, self.pending_step = self.pending_step, None
+        if callback is not None:
+            callback()
 
     def show_reconstruction_result(self):
         """Zobrazenie výsledku rekonštrukcie tajomstva"""
@@ -885,7 +943,7 @@ class QSSProtocolUI(QWidget):
             if len(self.measurement_bases) < n or len(self.measurements) < n:
                 n = min(len(self.measurement_bases), len(self.measurements))
                 if n == 0:
-                    return random.randint(0, 1)
+                    return rngService.stream("qss.measurement").bit()
 
             # Rozdelenie meraní podľa báz
             x_indices = [i for i in range(n) if self.measurement_bases[i] == "X"]
@@ -898,7 +956,7 @@ class QSSProtocolUI(QWidget):
                 z_consistent = all(z == z_values[0] for z in z_values)
 
                 if not z_consistent:
-                    return random.randint(0, 1)  # Nekonzistentné merania
+                    return rngService.stream("qss.measurement").bit()  # Nekonzistentné merania
 
                 z_value = z_values[0]
 
@@ -921,7 +979,7 @@ class QSSProtocolUI(QWidget):
                 return x_parity
         except Exception as e:
             self.error_label.setText(f"Chyba pri výpočte tajomstva: {str(e)}")
-            return random.randint(0, 1)
+            return rngService.stream("qss.measurement").bit()
 
     def reset_protocol(self, recreate_scene=True):
         """Reset protokolu do počiatočného stavu"""
@@ -930,6 +988,8 @@ class QSSProtocolUI(QWidget):
             self.distribution_timer.stop()
             self.measurement_timer.stop()
             self.entanglement_timer.stop()
+            self.step_timer.stop()
+            self.pending_step = None
 
             # Reset stavových premenných
             self.animation_step = 0
@@ -1,14 +1,15 @@
 from PyQt6.QtWidgets import (QWidget, QApplication, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QLineEdit, QTextEdit, QGroupBox, QTabWidget, QFrame, QSizePolicy)
-from PyQt6.QtCore import Qt, QTimer, QPoint, QRectF
+from PyQt6.QtCore import Qt, QPoint, QRectF
 from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QLinearGradient, QBrush
 
-from qiskit import QuantumCircuit, Aer, execute
-from qiskit.quantum_info import Statevector
+from QSim_app import quantumBackend
+from QSim_app.animationClock import ClockTimer
+from QSim_app.instantMode import instant_checkbox, batched_update
+from QSim_app import rngService
 
 import sys
 import math
-import random
 
 
 class BlochSphereWidget(QWidget):
@@ -328,7 +329,6 @@ class QuantumTimeSync(QWidget):
         # Inicializácia parametrov pred nastavením používateľského rozhrania
         self.omega = 6.28  # uhlová frekvencia (rad/s) - približne 2π, zaokrúhlené na 2 desatinné miesta
         self.delta = 0.79  # počiatočný fázový posun pre Boba (rad) - približne π/4, zaokrúhlené na 2 desatinné miesta
-        self.dt = 0.05  # časový krok na tik časovača (s)
         self.current_time = 0.0
         self.synced = False
         self.entanglement_prepared = False
@@ -347,18 +347,27 @@ class QuantumTimeSync(QWidget):
             "Synchronizované qubitové hodiny"
         ]
 
-        # Časovač pre animáciu (precesiu)
-        self.timer = QTimer()
+        # Časovač pre animáciu (precesiu) - každá snímka spoločných hodín,
+        # čas sa posúva o skutočne uplynutý čas snímky
+        self.timer = ClockTimer(self)
         self.timer.timeout.connect(self.advance_animation)
-        self.timer.setInterval(50)  # ms
+        self.timer.setInterval(0)
 
-        # Kvantový obvod pre simuláciu
-        self.prepare_quantum_circuits()
+        # Kvantové obvody sa pripravia až pri spustení protokolu (Qiskit sa načíta neskôr)
+        self.alice_circuit = None
+        self.bob_circuit = None
+        self.entangled_circuit = None
 
         self.setup_ui()
 
+    def animation_timers(self):
+        """Časovače animácie, ktoré sa pozastavia so skrytou kartou"""
+        return [self.timer]
+
     def prepare_quantum_circuits(self):
         """Príprava kvantových obvodov pre simuláciu"""
+        QuantumCircuit = quantumBackend.load().QuantumCircuit
+
         # Kvantový obvod pre Alicu
         self.alice_circuit = QuantumCircuit(1)
         self.alice_circuit.h(0)  # Uvedenie do superpozície
@@ -408,6 +417,10 @@ class QuantumTimeSync(QWidget):
         self.reset_button.clicked.connect(self.reset_protocol)
         control_layout.addWidget(self.reset_button)
 
+        # Pri okamžitom výpočte sa po spustení prejdú všetky kroky protokolu naraz
+        self.instant_mode = instant_checkbox()
+        control_layout.addWidget(self.instant_mode)
+
         main_layout.addWidget(control_box)
 
         # Oblasť animácie pre Blochove sféry (použitie vlastného widgetu)
@@ -469,9 +482,18 @@ class QuantumTimeSync(QWidget):
 
             self.animation_area.update()
 
+            if self.instant_mode.isChecked():
+                self.complete_instantly()
+
         except ValueError:
             self.status_label.setText("Neplatné parametre. Zadajte čísla.")
 
+    def complete_instantly(self):
+        """Vykonanie všetkých krokov protokolu naraz až po synchronizované hodiny"""
+        with batched_update(self):
+            while not self.synced and self.protocol_step < len(self.protocol_steps) - 1:
+                self.next_protocol_step()
+
     def next_protocol_step(self):
         """Prechod na ďalší krok protokolu"""
         self.protocol_step += 1
@@ -496,7 +518,7 @@ class QuantumTimeSync(QWidget):
             self.animation_area.entanglement_prepared = True
 
             # Vytvorenie Bellovho stavu pomocou Qiskit pre simuláciu
-            self.entangled_circuit = QuantumCircuit(2)
+            self.entangled_circuit = quantumBackend.load().QuantumCircuit(2)
             self.entangled_circuit.h(0)
             self.entangled_circuit.cx(0, 1)
 
@@ -542,7 +564,7 @@ class QuantumTimeSync(QWidget):
             self.timer.stop()
 
             try:
-                simulator = Aer.get_backend('qasm_simulator')
+                simulator = quantumBackend.get_backend('qasm_simulator')
                 # Vytvorenie obvodu pre meranie fázového rozdielu
                 meas_circuit = self.entangled_circuit.copy()
                 # Aplikácia fázovej korekcie na základe nameraného rozdielu
@@ -550,7 +572,8 @@ class QuantumTimeSync(QWidget):
                 meas_circuit.measure_all()
 
                 # Vykonanie a získanie výsledku
-                job = execute(meas_circuit, simulator, shots=1)
+                job = quantumBackend.load().execute(meas_circuit, simulator, shots=1,
+                                                         seed_simulator=rngService.simulator_seed("qst.sim"))
                 result = job.result()
 
                 measured_diff = self.delta % (2 * math.pi)
@@ -610,7 +633,7 @@ class QuantumTimeSync(QWidget):
 
     def advance_animation(self):
         """Posun animácie v čase"""
-        self.current_time += self.dt
+        self.current_time += self.timer.frame_time()
         self.animation_area.current_time = self.current_time
         self.animation_area.update()
 
@@ -618,17 +641,18 @@ class QuantumTimeSync(QWidget):
         """Simulácia kvantového stavu pre vizualizáciu"""
         try:
             # Pre Alicu
-            simulator = Aer.get_backend('statevector_simulator')
+            execute = quantumBackend.load().execute
+            simulator = quantumBackend.get_backend('statevector_simulator')
             alice_rotated = self.alice_circuit.copy()
             alice_rotated.p(self.omega * self.current_time, 0)
-            alice_job = execute(alice_rotated, simulator)
+            alice_job = execute(alice_rotated, simulator, seed_simulator=rngService.simulator_seed("qst.sim"))
             alice_result = alice_job.result()
             alice_statevector = alice_result.get_statevector()
 
             # Pre Boba
             bob_rotated = self.bob_circuit.copy()
             bob_rotated.p(self.omega * self.current_time, 0)
-            bob_job = execute(bob_rotated, simulator)
+            bob_job = execute(bob_rotated, simulator, seed_simulator=rngService.simulator_seed("qst.sim"))
             bob_result = bob_job.result()
             bob_statevector = bob_result.get_statevector()
 
@@ -0,0 +1,67 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from QSim_app import startupProfiler
+
+# Načítané triedy Qiskitu (None, kým ich nikto nepotrebuje)
+_qiskit = None
+_lock = threading.Lock()
+_backends = {}
+
+# Čas importu Qiskitu v sekundách (None, ak ešte nebol načítaný)
+load_time = None
+
+
+def load():
+    """Vráti menný priestor s triedami Qiskitu, pri prvom volaní ich naimportuje.
+
+    Import qiskit-terra a Aer trvá niekoľko sekúnd, preto sa nerobí pri importe
+    modulov protokolov, ale až keď je kvantový obvod naozaj potrebný.
+    """
+    global _qiskit, load_time
+    if _qiskit is None:
+        with _lock:
+            if _qiskit is None:
+                start = time.perf_counter()
+                with startupProfiler.span("import qiskit", "import"):
+                    from qiskit import QuantumCircuit, Aer, execute
+                    from qiskit.quantum_info import Statevector
+                load_time = time.perf_counter() - start
+                _qiskit = SimpleNamespace(QuantumCircuit=QuantumCircuit, Aer=Aer,
+                                          execute=execute, Statevector=Statevector)
+    return _qiskit
+
+
+def is_loaded():
+    """Vráti, či už bol Qiskit naimportovaný"""
+    return _qiskit is not None
+
+
+def get_backend(name):
+    """Vráti (a uloží do cache) simulátor Aer s daným menom"""
+    backend = _backends.get(name)
+    if backend is None:
+        backend = load().Aer.get_backend(name)
+        _backends[name] = backend
+    return backend
+
+
+def warm_up():
+    """Načítanie Qiskitu na pozadí, aby bol pripravený pri prvom kvantovom obvode"""
+    if is_loaded():
+        return None
+    thread = threading.Thread(target=_warm_up_worker, name="qiskit-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def _warm_up_worker():
+    """Vlákno, ktoré naimportuje Qiskit a pripraví používané simulátory"""
+    try:
+        load()
+        get_backend('statevector_simulator')
+        get_backend('qasm_simulator')
+    except Exception as e:
+        # Chyba sa zopakuje (a zobrazí) pri prvom skutočnom použití
+        print(f"Načítanie Qiskitu na pozadí zlyhalo: {e}")
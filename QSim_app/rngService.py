@@ -0,0 +1,144 @@
+import zlib
+
+import numpy as np
+
+# Počet bitov vygenerovaných naraz do zásoby jedného prúdu
+DEFAULT_BLOCK_SIZE = 4096
+
+# Horná hranica seedu simulátora Qiskit Aer (seed_simulator)
+MAX_SIMULATOR_SEED = 2 ** 31 - 1
+
+
+def party_key(party):
+    """Stabilný číselný kľúč mena strany (nezávislý od PYTHONHASHSEED)"""
+    return zlib.crc32(party.encode("utf-8"))
+
+
+class PartyStream:
+    """Náhodný prúd jednej strany protokolu: NumPy Generator so zásobou bitov.
+
+    Jednotlivé bity sa neberú po jednom z generátora, ale zo zásoby vygenerovanej
+    po blokoch, takže aj animácie ťahajúce bit po bite platia réžiu NumPy iba raz
+    za blok. Väčšie požiadavky idú priamo do generátora.
+    """
+
+    def __init__(self, name, generator, block_size=DEFAULT_BLOCK_SIZE):
+        """Inicializácia prúdu s menom strany a jej generátorom"""
+        self.name = name
+        self.generator = generator
+        self.block_size = block_size
+        self.buffer = np.empty(0, dtype=np.uint8)
+        # Tá istá zásoba ako zoznam int - jeden bit sa vyberie bez réžie NumPy skalára
+        self.values = []
+        self.position = 0
+
+    def refill(self):
+        """Doplnenie zásoby o ďalší blok (nevyčerpané bity zostanú na začiatku)"""
+        rest = self.buffer[self.position:]
+        self.buffer = np.concatenate((rest, self.generator.integers(0, 2, size=self.block_size, dtype=np.uint8)))
+        self.values = self.buffer.tolist()
+        self.position = 0
+
+    def bits(self, n):
+        """n náhodných bitov (uint8)"""
+        if n > self.block_size:
+            return self.generator.integers(0, 2, size=n, dtype=np.uint8)
+        if self.position + n > len(self.buffer):
+            self.refill()
+        result = self.buffer[self.position:self.position + n]
+        self.position += n
+        return result
+
+    def bit(self):
+        """Jeden náhodný bit ako int"""
+        if self.position >= len(self.values):
+            self.refill()
+        value = self.values[self.position]
+        self.position += 1
+        return value
+
+    def integer(self, low, high):
+        """Náhodné celé číslo z intervalu [low, high)"""
+        if high - low == 2:
+            return low + self.bit()
+        return int(self.generator.integers(low, high))
+
+    def choice(self, options):
+        """Náhodný prvok zo zoznamu možností"""
+        return options[self.integer(0, len(options))]
+
+    def permutation(self, values):
+        """Náhodne poprehadzovaná kópia zoznamu"""
+        return [values[i] for i in self.generator.permutation(len(values))]
+
+
+class RNGService:
+    """Centrálny zdroj nezávislých reprodukovateľných náhodných prúdov.
+
+    Prúd strany (napr. "qkd.alice", "qkd.eve", "qpv.v1") je odvodený zo seedu a
+    mena strany cez SeedSequence, nie z poradia, v akom sa prúdy vyžiadajú. Zapnutie
+    Evy preto nezmení Alicine bity a beh so zadaným seedom sa dá zopakovať.
+    """
+
+    def __init__(self, seed=None, block_size=DEFAULT_BLOCK_SIZE):
+        """Inicializácia služby; bez seedu sa použije náhodná entropia"""
+        self.block_size = block_size
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """Nový seed - všetky prúdy začnú od začiatku"""
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.streams = {}
+
+    def stream(self, party):
+        """Prúd strany (vytvorí sa pri prvom použití)"""
+        if party not in self.streams:
+            sequence = np.random.SeedSequence(self.seed, spawn_key=(party_key(party),))
+            self.streams[party] = PartyStream(party, np.random.default_rng(sequence), self.block_size)
+        return self.streams[party]
+
+    def generator(self, party):
+        """NumPy Generator strany pre hromadné generovanie"""
+        return self.stream(party).generator
+
+    def parties(self, protocol, *names):
+        """Slovník generátorov strán jedného protokolu, napr. parties("qkd", "alice", "bob")"""
+        return {name: self.generator(f"{protocol}.{name}") for name in names}
+
+    def simulator_seed(self, party):
+        """Seed pre jeden beh simulátora Qiskit z prúdu strany (napr. "qss.sim")"""
+        return int(self.generator(party).integers(0, MAX_SIMULATOR_SEED))
+
+
+# Spoločná služba aplikácie
+_service = RNGService()
+
+
+def reseed(seed=None):
+    """Nastavenie seedu spoločnej služby"""
+    _service.reseed(seed)
+
+
+def seed():
+    """Aktuálny seed spoločnej služby (na zopakovanie behu)"""
+    return _service.seed
+
+
+def stream(party):
+    """Prúd strany zo spoločnej služby"""
+    return _service.stream(party)
+
+
+def generator(party):
+    """NumPy Generator strany zo spoločnej služby"""
+    return _service.generator(party)
+
+
+def parties(protocol, *names):
+    """Generátory strán protokolu zo spoločnej služby"""
+    return _service.parties(protocol, *names)
+
+
+def simulator_seed(party):
+    """Seed simulátora Qiskit zo spoločnej služby"""
+    return _service.simulator_seed(party)
@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Aktívny profiler (None, ak sa štart aplikácie neprofiluje)
+_active = None
+
+
+class StartupProfiler:
+    """Zaznamenávanie trvania jednotlivých fáz štartu aplikácie.
+
+    Výsledok sa ukladá vo formáte Chrome Trace Event (JSON), ktorý vedia zobraziť
+    ako flamegraph nástroje chrome://tracing, Perfetto alebo speedscope.
+    """
+
+    def __init__(self):
+        """Inicializácia profilera s časovým počiatkom v okamihu vytvorenia"""
+        self.origin = time.perf_counter()
+        self.events = []
+        # Hĺbka vnorenia sa sleduje pre každé vlákno zvlášť (Qiskit sa načítava na pozadí)
+        self.local = threading.local()
+
+    @contextmanager
+    def span(self, name, category="startup"):
+        """Meranie trvania bloku kódu ako jednej udalosti"""
+        start = time.perf_counter()
+        self.local.depth = self.depth() + 1
+        try:
+            yield
+        finally:
+            self.local.depth -= 1
+            self.add(name, start, time.perf_counter() - start, category)
+
+    def depth(self):
+        """Vráti aktuálnu hĺbku vnorenia meraní v tomto vlákne"""
+        return getattr(self.local, "depth", 0)
+
+    def add(self, name, start, duration, category="startup"):
+        """Pridanie udalosti so začiatkom (perf_counter) a trvaním v sekundách"""
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self.origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"depth": self.depth()},
+        })
+
+    def to_trace(self):
+        """Vráti záznam vo formáte Chrome Trace Event"""
+        events = sorted(self.events, key=lambda event: (event["ts"], -event["dur"]))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """Uloženie záznamu do JSON súboru"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_trace(), f, ensure_ascii=False, indent=1)
+
+    def summary(self):
+        """Textový prehľad udalostí zoradených podľa času začiatku"""
+        lines = ["Profil štartu aplikácie:"]
+        for event in self.to_trace()["traceEvents"]:
+            indent = "  " * (event["args"]["depth"] + 1)
+            lines.append(f"{indent}{event['name']}: {event['dur'] / 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+def enable():
+    """Zapnutie profilovania štartu a vrátenie aktívneho profilera"""
+    global _active
+    _active = StartupProfiler()
+    return _active
+
+
+def active():
+    """Vráti aktívny profiler alebo None"""
+    return _active
+
+
+@contextmanager
+def span(name, category="startup"):
+    """Meranie bloku kódu, ak je profilovanie zapnuté; inak nerobí nič"""
+    if _active is None:
+        yield
+    else:
+        with _active.span(name, category):
+            yield
@@ -0,0 +1,46 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from QSim_app.bb84Engine import run_bb84_chunks, batch_statistics
+
+
+class FileStatisticsWorker(QThread):
+    """Štatistiky BB84 pre celý súbor Alicinych bitov počítané mimo vlákna GUI.
+
+    Súbor sa spracuje po blokoch (bitSource.BitFile.chunks()); po každom bloku sa
+    vyšle progress s počtom spracovaných a všetkých bitov, na konci statistics so
+    slovníkom z batch_statistics. Pri požiadavke na prerušenie sa výpočet
+    ukončí po aktuálnom bloku a statistics sa nevyšle.
+    """
+
+    progress = pyqtSignal(int, int)
+    statistics = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, bit_file, channel=None, parties=None, eve_parameters=None, parent=None):
+        """Inicializácia so súborom, kanálom, náhodnými prúdmi strán a parametrami Evy"""
+        super().__init__(parent)
+        self.bit_file = bit_file
+        self.channel = channel
+        self.parties = parties
+        self.eve_parameters = eve_parameters or {}
+
+    def counted(self, batches):
+        """Prechod blokmi s hlásením priebehu; pri prerušení sa prúd ukončí"""
+        done = 0
+        for batch in batches:
+            if self.isInterruptionRequested():
+                return
+            done += len(batch)
+            self.progress.emit(done, len(self.bit_file))
+            yield batch
+
+    def run(self):
+        """Výpočet štatistík v pracovnom vlákne"""
+        try:
+            stats = batch_statistics(self.counted(run_bb84_chunks(
+                self.bit_file.chunks(), channel=self.channel, parties=self.parties, **self.eve_parameters)))
+        except (OSError, ValueError) as e:
+            self.failed.emit(str(e))
+            return
+        if not self.isInterruptionRequested():
+            self.statistics.emit(stats)
@@ -0,0 +1,69 @@
+from PyQt6.QtCore import QTimer
+from PyQt6 import sip
+
+
+class TabTimerScheduler:
+    """Pozastavenie časovačov a prekresľovania protokolu, keď jeho karta nie je viditeľná.
+
+    Časovače sa nezastavujú natrvalo: pri opätovnom zobrazení karty sa spustia
+    iba tie, ktoré boli pri skrytí aktívne, takže stav protokolu zostáva rovnaký,
+    ako keby animácia iba na chvíľu stála. Pozastavujú sa iba časovače, ktoré
+    protokol zaregistroval - interné časovače Qt (pohľady, posuvníky) zostávajú
+    nedotknuté.
+    """
+
+    # Po skrytí sa časovače skontrolujú ešte raz, pretože protokol ich môže
+    # spustiť aj neskôr (napr. po dokončení výpočtu na pozadí)
+    RECHECK_DELAY_MS = 2000
+
+    def __init__(self, widget, timers=()):
+        """Inicializácia plánovača pre widget protokolu a jeho animačné časovače"""
+        self.widget = widget
+        self.registered = []
+        self.suspended = []
+        self.is_suspended = False
+        self.register(*timers)
+
+    def register(self, *timers):
+        """Registrácia časovačov protokolu, ktoré sa majú pozastaviť so skrytou kartou"""
+        for timer in timers:
+            if timer not in self.registered:
+                self.registered.append(timer)
+
+    def timers(self):
+        """Zaregistrované časovače, ktoré ešte neboli zrušené"""
+        return [timer for timer in self.registered if not sip.isdeleted(timer)]
+
+    def suspend(self):
+        """Zastavenie aktívnych časovačov a vypnutie prekresľovania widgetu"""
+        # Pri zatváraní aplikácie môže byť widget už zrušený
+        if sip.isdeleted(self.widget):
+            return
+        self.is_suspended = True
+        self.stop_active_timers()
+        self.widget.setUpdatesEnabled(False)
+        QTimer.singleShot(self.RECHECK_DELAY_MS, self.recheck)
+
+    def stop_active_timers(self):
+        """Zastavenie časovačov, ktoré práve bežia, a zapamätanie si ich"""
+        for timer in self.timers():
+            if timer.isActive():
+                timer.stop()
+                if timer not in self.suspended:
+                    self.suspended.append(timer)
+
+    def recheck(self):
+        """Zastavenie časovačov spustených po skrytí karty"""
+        if self.is_suspended and not sip.isdeleted(self.widget):
+            self.stop_active_timers()
+
+    def resume(self):
+        """Opätovné spustenie pozastavených časovačov a zapnutie prekresľovania"""
+        if not self.is_suspended:
+            return
+        self.is_suspended = False
+        self.widget.setUpdatesEnabled(True)
+        for timer in self.suspended:
+            timer.start()
+        self.suspended = []
+        self.widget.update()
@@ -0,0 +1,282 @@
+import numpy as np
+import pytest
+
+from QSim_app.channelModel import FiberChannel, apply_dead_time
+from QSim_app.bb84Engine import run_bb84, run_bb84_statistics, estimate_qber
+from QSim_app.cascade import pack_bits, unpack_bits, parity64, reconcile
+from QSim_app.privacyAmplification import DIRECT_LIMIT, toeplitz_seed, toeplitz_hash
+from QSim_app.keyPipeline import KeyPipeline
+from QSim_app.decoyState import decoy_estimate, estimate_from_simulation, expected_observables, simulate_decoy
+from QSim_app.rngService import MAX_SIMULATOR_SEED, RNGService
+from QSim_app.coinTournament import analyze_strategies, clear_analysis_cache, make_scenario, play_games, \
+    tournament_statistics
+
+
+def test_bb84_without_eve():
+    """Bez Evy je preosiaty kľúč bez chýb a zhoda báz nastane približne v polovici fotónov"""
+    batch = run_bb84(10 ** 5, np.random.default_rng(4))
+    alice_key, bob_key = batch.sifted_key()
+    assert np.array_equal(alice_key, bob_key)
+    stats = batch.statistics()
+    assert stats["qber"] == 0.0
+    assert abs(stats["match_rate"] - 0.5) < 0.01
+
+
+def test_bb84_is_reproducible():
+    """Rovnaký seed dá rovnaké bity, bázy aj merania"""
+    first = run_bb84(1000, np.random.default_rng(5))
+    second = run_bb84(1000, np.random.default_rng(5))
+    for name in ("alice_bits", "alice_bases", "bob_bases", "bob_bits"):
+        assert np.array_equal(getattr(first, name), getattr(second, name))
+
+
+def test_chunked_statistics_without_eve():
+    """Štatistiky po blokoch: bez Evy žiadna chyba, všetky fotóny započítané"""
+    stats = run_bb84_statistics(10 ** 5, np.random.default_rng(6), chunk_size=4096)
+    assert stats["photons"] == 10 ** 5
+    assert stats["errors"] == 0
+
+
+def test_full_intercept_resend_qber():
+    """Eva zachytí všetky fotóny v náhodnej báze - QBER je približne 25 %"""
+    stats = estimate_qber(4 * 10 ** 5, np.random.default_rng(7), eve_fraction=1.0)
+    assert abs(stats["qber"] - 0.25) < 0.01
+    assert stats["qber_low"] < 0.25 < stats["qber_high"]
+
+
+def test_partial_intercept_resend_qber():
+    """Čiastočný útok zvýši QBER úmerne podielu zachytených fotónov"""
+    stats = estimate_qber(4 * 10 ** 5, np.random.default_rng(8), eve_fraction=0.4)
+    assert abs(stats["qber"] - 0.1) < 0.01
+    batch = run_bb84(10 ** 4, np.random.default_rng(9), eve_fraction=0.4)
+    assert abs(batch.intercepted.mean() - 0.4) < 0.03
+
+
+def test_pack_bits_round_trip():
+    """Zbalenie do 64-bitových slov a rozbalenie vráti pôvodné bity, parita slov sedí"""
+    bits = np.random.default_rng(10).integers(0, 2, 1000, dtype=np.uint8)
+    words = pack_bits(bits)
+    assert np.array_equal(unpack_bits(words, len(bits)), bits)
+    padded = np.zeros(len(words) * 64, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    assert np.array_equal(parity64(words), padded.reshape(-1, 64).sum(axis=1) & 1)
+
+
+def test_cascade_corrects_all_errors():
+    """Cascade pri QBER 2-5 % opraví všetky chyby"""
+    for qber in (0.02, 0.03, 0.05):
+        rng = np.random.default_rng(11)
+        alice_key = rng.integers(0, 2, 20000, dtype=np.uint8)
+        bob_key = alice_key ^ (rng.random(len(alice_key)) < qber)
+        result = reconcile(alice_key, bob_key, rng=rng)
+        assert result["residual_errors"] == 0
+        assert np.array_equal(result["key"], alice_key)
+        assert result["corrected_bits"] == int(np.count_nonzero(alice_key != bob_key))
+        # Odhalené parity nad Shannonovou hranicou, ale rádovo pri nej
+        assert 1.0 < result["efficiency"] < 2.0
+
+
+def toeplitz_product(key, seed, m):
+    """Priamy súčin T x (mod 2) s explicitne zostavenou Toeplitzovou maticou"""
+    n = len(key)
+    rows, columns = np.indices((m, n))
+    matrix = seed[rows - columns + n - 1].astype(np.int64)
+    return ((matrix @ key.astype(np.int64)) & 1).astype(np.uint8)
+
+
+def test_toeplitz_hash_matches_matrix_product():
+    """Priamy výpočet aj výpočet cez FFT dajú rovnaký výsledok ako súčin s maticou"""
+    rng = np.random.default_rng(12)
+    for n, m in ((200, 50), (3000, 1000), (4099, 777)):
+        key = rng.integers(0, 2, n, dtype=np.uint8)
+        seed = toeplitz_seed(rng, n, m)
+        assert np.array_equal(toeplitz_hash(key, seed, m), toeplitz_product(key, seed, m))
+    # Posledné dva prípady idú cez FFT
+    assert 3000 * 1000 > DIRECT_LIMIT
+
+
+def test_key_pipeline_blocks():
+    """Bloky pevnej dĺžky (posledný kratší), odhad QBER s Evou a nezávislé časy fáz"""
+    pipeline = KeyPipeline(2 * 10 ** 5, chunk_size=30000, block_size=8192, eve_fraction=0.4, seed=13)
+    blocks = list(pipeline.blocks())
+    sizes = [len(block["alice_key"]) for block in blocks]
+    assert all(size == 8192 for size in sizes[:-1])
+    assert 0 < sizes[-1] <= 8192
+    # Zvyšok preosiatych bitov po odobratí vzorky na odhad QBER
+    assert sum(sizes) + pipeline.sampled_bits == pipeline.counters["estimate"].items
+    assert abs(pipeline.qber() - 0.1) < 0.02
+    assert blocks[-1]["qber_low"] < pipeline.qber() < blocks[-1]["qber_high"]
+    # Časy fáz sa neprekrývajú - ich súčet je čas celého prúdu
+    assert sum(counter.seconds for counter in pipeline.counters.values()) == pytest.approx(pipeline.measured)
+
+
+def test_key_pipeline_distill():
+    """Destilované bloky nemajú zvyškové chyby a sú kratšie ako vstup"""
+    pipeline = KeyPipeline(10 ** 5, block_size=16384, eve_fraction=0.1, seed=14)
+    for block in pipeline.blocks(distill=True):
+        assert block["residual_errors"] == 0
+        assert len(block["key"]) < len(block["alice_key"])
+
+
+def single_photon_values(channel):
+    """Skutočný výťažok a chybovosť jednofotónových impulzov kanála"""
+    eta = channel.transmittance()
+    y0 = 1 - (1 - channel.dark_count_probability) ** 2
+    y1 = y0 + eta - y0 * eta
+    return y1, (0.5 * y0 + channel.misalignment * eta) / y1
+
+
+def test_decoy_bounds_from_exact_observables():
+    """Z presných ziskov je Y1_L dolná a e1_U horná hranica skutočných hodnôt (a sú blízko)"""
+    channel = FiberChannel(distance_km=25)
+    mu, nu = 0.5, 0.1
+    q_mu, _ = expected_observables(mu, channel)
+    q_nu, e_nu = expected_observables(nu, channel)
+    y0, _ = expected_observables(0.0, channel)
+    y1_low, e1_high, _ = decoy_estimate(mu, nu, q_mu, q_nu, e_nu, y0)
+    y1, e1 = single_photon_values(channel)
+    assert 0.9 * y1 < y1_low <= y1
+    assert e1 <= e1_high < 1.5 * e1
+
+
+def test_decoy_rejects_equal_intensities():
+    """Návnada rovnako silná ako signál (aj o pár ulp slabšia) neposkytne odhad Y1"""
+    channel = FiberChannel(distance_km=25)
+    q_mu, e_mu = expected_observables(0.5, channel)
+    y0, _ = expected_observables(0.0, channel)
+    for nu in (0.5, np.nextafter(0.5, 0.0)):
+        y1_low, e1_high, q1_low = decoy_estimate(0.5, nu, q_mu, q_mu, e_mu, y0)
+        assert y1_low == 0.0 and q1_low == 0.0 and e1_high == 0.5
+
+
+def test_decoy_simulation_estimate():
+    """Odhad zo simulácie je blízko skutočného Y1 a konečný kľúč je pomalší ako asymptotický"""
+    channel = FiberChannel(distance_km=25)
+    result = simulate_decoy(channel, 2 * 10 ** 6, rng=np.random.default_rng(15))
+    estimate = estimate_from_simulation(result, finite_key=True)
+    y1, _ = single_photon_values(channel)
+    assert abs(estimate["y1_low"] - y1) < 0.1 * y1
+    assert 0 < estimate["finite_rate"] < estimate["asymptotic_rate"]
+    assert "finite_rate" not in estimate_from_simulation(result)
+
+
+def test_rng_service_same_seed_same_stream():
+    """Rovnaký seed dá rovnaký prúd strany, iný seed iný prúd"""
+    first, second = RNGService(42), RNGService(42)
+    assert np.array_equal(first.stream("qkd.alice").bits(10000), second.stream("qkd.alice").bits(10000))
+    assert first.simulator_seed("qss.sim") == second.simulator_seed("qss.sim")
+    assert 0 <= first.simulator_seed("qss.sim") < MAX_SIMULATOR_SEED
+    other = RNGService(43)
+    assert not np.array_equal(other.stream("qkd.alice").bits(10000), RNGService(42).stream("qkd.alice").bits(10000))
+
+
+def test_rng_service_streams_are_independent():
+    """Prúd strany nezávisí od poradia vyžiadania prúdov ani od ostatných strán"""
+    first, second = RNGService(7), RNGService(7)
+    second.stream("qkd.eve").bits(500)
+    assert np.array_equal(first.stream("qkd.alice").bits(300), second.stream("qkd.alice").bits(300))
+    assert not np.array_equal(first.stream("qkd.bob").bits(300), first.stream("qkd.alice").bits(300))
+
+
+def test_rng_service_bit_and_bits_share_buffer():
+    """Jednotlivé bity aj bloky bitov idú z tej istej zásoby; reseed začne prúd odznova"""
+    service = RNGService(3, block_size=64)
+    single = [service.stream("qss.participants").bit() for _ in range(100)]
+    service.reseed(3)
+    stream = service.stream("qss.participants")
+    assert stream.bits(50).tolist() + stream.bits(50).tolist() == single
+
+
+def test_honest_coin_is_fair():
+    """Poctivá hra: Bob vyhrá približne v polovici hier a žiadna hra sa nepreruší"""
+    counts = play_games(40000, rng=np.random.default_rng(16))
+    assert counts["bob_wins"] + counts["alice_wins"] + counts["aborted"] == counts["games"]
+    assert counts["aborted"] == 0
+    stats = tournament_statistics(counts)
+    assert abs(stats["bias"]) < 0.015
+    assert stats["bias_low"] < 0 < stats["bias_high"]
+    assert counts == play_games(40000, rng=np.random.default_rng(16))
+
+
+def test_cheating_strategies():
+    """Nevyvážená minca, nezistiteľný útok EPR a odhalenie zmiešanej bázy"""
+    counts = play_games(40000, rng=np.random.default_rng(17), bob_strategy="rectilinear",
+                        alice_strategy="unbalanced", alice_params={"rectilinear_probability": 0.75})
+    assert abs(counts["bob_wins"] / counts["games"] - 0.75) < 0.015
+
+    counts = play_games(10000, rng=np.random.default_rng(18), alice_strategy="epr")
+    assert counts["alice_wins"] == counts["games"]
+
+    # Meranie všetkých fotónov v báze podľa vopred zvoleného tipu odhalí zmiešanú bázu častejšie
+    random_aborts = play_games(10000, rng=np.random.default_rng(19), alice_strategy="mixed")["aborted"]
+    committed_aborts = play_games(10000, rng=np.random.default_rng(19), alice_strategy="mixed",
+                                  bob_measurement="committed")["aborted"]
+    assert committed_aborts > random_aborts
+
+
+def test_analyzer_does_not_depend_on_scenario_order():
+    """Výsledok scenára nezávisí od ostatných scenárov, poradia ani od cache"""
+    honest = make_scenario()
+    mixed = make_scenario("mixed", {"mix": 0.1}, bob_measurement="committed")
+    clear_analysis_cache()
+    alone = analyze_strategies([mixed], 2000, seed=20, processes=2)[0]
+    clear_analysis_cache()
+    first, second, repeated = analyze_strategies([honest, mixed, mixed], 2000, seed=20, processes=2)
+    assert second["aborted"] == alone["aborted"] == repeated["aborted"]
+    assert second["bob_wins"] == alone["bob_wins"]
+    assert analyze_strategies([mixed], 2000, seed=20, processes=2)[0] is second
+
+
+def reference_dead_time(detected, dead_pulses, carry=0):
+    """Priamočiary cyklus cez všetky impulzy - referencia pre apply_dead_time"""
+    result = np.zeros_like(detected)
+    ready = carry
+    for index in range(len(detected)):
+        if detected[index] and index >= ready:
+            result[index] = True
+            ready = index + dead_pulses
+    return result, max(0, ready - len(detected))
+
+
+def test_dead_time_matches_reference():
+    """Vektorový mŕtvy čas sa zhoduje s referenčným cyklom"""
+    rng = np.random.default_rng(1)
+    for probability in (0.01, 0.2, 0.7):
+        detected = rng.random(5000) < probability
+        for dead_pulses in (1, 3, 17):
+            mask, carry = apply_dead_time(detected, dead_pulses)
+            expected, expected_carry = reference_dead_time(detected, dead_pulses)
+            assert np.array_equal(mask, expected)
+            assert carry == expected_carry
+
+
+def test_dead_time_carry_across_chunks():
+    """Spracovanie po blokoch s prenosom carry dá rovnaký výsledok ako celý prúd naraz"""
+    rng = np.random.default_rng(2)
+    detected = rng.random(10000) < 0.3
+    dead_pulses = 9
+    expected, _ = reference_dead_time(detected, dead_pulses)
+    parts = []
+    carry = 0
+    for chunk in np.array_split(detected, 37):
+        mask, carry = apply_dead_time(chunk, dead_pulses, carry)
+        parts.append(mask)
+    assert np.array_equal(np.concatenate(parts), expected)
+
+
+def test_dead_time_all_clicks_inside_carry():
+    """Blok, ktorého všetky kliknutia padnú do preneseného mŕtveho času"""
+    mask, carry = apply_dead_time(np.array([0, 1, 0, 0, 0, 0, 0], dtype=bool), 5, 3)
+    assert not mask.any()
+    assert carry == 0
+    mask, carry = apply_dead_time(np.array([0, 1, 0], dtype=bool), 5, 9)
+    assert not mask.any()
+    assert carry == 6
+
+
+def test_short_chunks_with_dead_time():
+    """Krátke bloky s mŕtvym časom dlhším ako blok"""
+    channel = FiberChannel(distance_km=0, detector_efficiency=0.5, dead_time_s=1e-8, pulse_rate_hz=1e9)
+    stats = run_bb84_statistics(10 ** 5, np.random.default_rng(3), chunk_size=7, channel=channel)
+    assert stats["photons"] == 10 ** 5
+    assert 0 < stats["sifted_bits"] < 10 ** 5 // 2
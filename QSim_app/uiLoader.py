@@ -0,0 +1,147 @@
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+
+from PyQt6 import uic
+
+from QSim_app import startupProfiler
+
+# Priečinok s predkompilovanými triedami UI (vedľa .ui súborov)
+CACHE_DIR_NAME = "__uicache__"
+
+# Už naimportované triedy UI podľa cesty k .ui súboru
+_ui_classes = {}
+
+
+def load_ui(ui_path, baseinstance):
+    """Načítanie .ui súboru do widgetu cez predkompilovanú triedu.
+
+    Ak predkompilovanú triedu nemožno vytvoriť ani načítať, použije sa
+    pôvodné uic.loadUi, ktoré .ui súbor parsuje pri každom štarte.
+    """
+    with startupProfiler.span(f"load_ui {ui_path}", "ui"):
+        try:
+            ui_class = compiled_ui_class(ui_path)
+        except Exception as e:
+            print(f"Predkompilované UI pre {ui_path} nie je dostupné ({e}), použije sa uic.loadUi")
+            return uic.loadUi(ui_path, baseinstance)
+
+        ui = ui_class()
+        ui.setupUi(baseinstance)
+
+        # Rovnako ako uic.loadUi sprístupniť pomenované prvky ako atribúty widgetu
+        for name, value in vars(ui).items():
+            setattr(baseinstance, name, value)
+        return baseinstance
+
+
+def cache_path(ui_path):
+    """Vráti cestu k predkompilovanému modulu pre daný .ui súbor"""
+    directory, file_name = os.path.split(ui_path)
+    stem = os.path.splitext(file_name)[0]
+    return os.path.join(directory, CACHE_DIR_NAME, f"ui_{stem}.py")
+
+
+def source_signature(ui_path):
+    """Vráti (mtime, veľkosť) .ui súboru pre rýchle overenie platnosti cache"""
+    stat = os.stat(ui_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def source_hash(ui_path):
+    """Vráti SHA-1 obsahu .ui súboru"""
+    with open(ui_path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def make_header(ui_path):
+    """Hlavička predkompilovaného modulu s údajmi o zdrojovom .ui súbore"""
+    mtime, size = source_signature(ui_path)
+    return f"# uicache mtime={mtime} size={size} sha1={source_hash(ui_path)}\n"
+
+
+def read_header(compiled_path):
+    """Načítanie údajov z hlavičky predkompilovaného modulu"""
+    with open(compiled_path, "r", encoding="utf-8") as f:
+        first_line = f.readline()
+    if not first_line.startswith("# uicache "):
+        return {}
+    return dict(field.split("=", 1) for field in first_line[len("# uicache "):].split())
+
+
+def is_cache_valid(ui_path, compiled_path):
+    """Overenie, či predkompilovaný modul zodpovedá aktuálnemu .ui súboru.
+
+    Najprv sa porovná čas zmeny a veľkosť; pri nezhode sa ešte porovná hash
+    obsahu, aby napr. checkout bez zmeny obsahu nevynútil novú kompiláciu.
+    """
+    if not os.path.exists(compiled_path):
+        return False
+    header = read_header(compiled_path)
+    mtime, size = source_signature(ui_path)
+    if header.get("mtime") == str(mtime) and header.get("size") == str(size):
+        return True
+    if header.get("sha1") == source_hash(ui_path):
+        # Obsah sa nezmenil, stačí obnoviť hlavičku
+        write_compiled(ui_path, compiled_path, read_body(compiled_path))
+        return True
+    return False
+
+
+def read_body(compiled_path):
+    """Vráti obsah predkompilovaného modulu bez hlavičky"""
+    with open(compiled_path, "r", encoding="utf-8") as f:
+        f.readline()
+        return f.read()
+
+
+def write_compiled(ui_path, compiled_path, body):
+    """Zápis predkompilovaného modulu s hlavičkou (atomicky cez dočasný súbor)"""
+    os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+    tmp_path = compiled_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(make_header(ui_path))
+        f.write(body)
+    os.replace(tmp_path, compiled_path)
+
+
+def compile_ui(ui_path):
+    """Kompilácia .ui súboru do Python modulu v cache a vrátenie jeho cesty"""
+    compiled_path = cache_path(ui_path)
+    if not is_cache_valid(ui_path, compiled_path):
+        output = io.StringIO()
+        with open(ui_path, "r", encoding="utf-8") as f:
+            uic.compileUi(f, output)
+        write_compiled(ui_path, compiled_path, output.getvalue())
+        _ui_classes.pop(ui_path, None)
+    return compiled_path
+
+
+def compiled_ui_class(ui_path):
+    """Vráti triedu Ui_* z predkompilovaného modulu (podľa potreby ho skompiluje)"""
+    compiled_path = compile_ui(ui_path)
+    ui_class = _ui_classes.get(ui_path)
+    if ui_class is None:
+        module_name = "QSim_app._uicache." + os.path.splitext(os.path.basename(compiled_path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, compiled_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        ui_class = next(getattr(module, name) for name in dir(module) if name.startswith("Ui_"))
+        _ui_classes[ui_path] = ui_class
+    return ui_class
+
+
+def compile_all(ui_dir="mw"):
+    """Predkompilovanie všetkých .ui súborov v priečinku (krok pri zostavení)"""
+    compiled = []
+    for file_name in sorted(os.listdir(ui_dir)):
+        if file_name.endswith(".ui"):
+            compiled.append(compile_ui(os.path.join(ui_dir, file_name)))
+    return compiled
+
+
+if __name__ == "__main__":
+    for path in compile_all(sys.argv[1] if len(sys.argv) > 1 else "mw"):
+        print(f"Predkompilované: {path}")
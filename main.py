@@ -1,13 +1,64 @@
+import argparse
 import sys
 import traceback
 
 from PyQt6.QtWidgets import QApplication
-from mw.mainWindow import MainWindow
+from PyQt6.QtCore import QTimer
+
+from QSim_app import quantumBackend, startupProfiler, rngService
+from QSim_app.importReport import time_imports, format_import_report
+
+def parse_arguments():
+    """Spracovanie prepínačov aplikácie; ostatné argumenty dostane QApplication"""
+    parser = argparse.ArgumentParser(description="QuantumSim")
+    parser.add_argument("--import-report", action="store_true",
+                        help="vypíše čas importu jednotlivých modulov")
+    parser.add_argument("--profile-startup", nargs="?", const="startup_profile.json", default=None,
+                        metavar="SÚBOR",
+                        help="zmeria štart aplikácie a uloží záznam (Chrome Trace JSON)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed náhodných prúdov všetkých protokolov (beh sa dá zopakovať)")
+    args, qt_args = parser.parse_known_args()
+    return args, [sys.argv[0]] + qt_args
+
+def finish_startup_profile(profiler, path, window):
+    """Vytvorenie všetkých kariet protokolov a uloženie záznamu profilovania"""
+    with profiler.span("karty protokolov", "protocol"):
+        window.build_all_tabs()
+    profiler.write(path)
+    print(profiler.summary(), flush=True)
+    print(f"Profil štartu uložený do {path}", flush=True)
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    args, qt_argv = parse_arguments()
+    profiler = startupProfiler.enable() if args.profile_startup else None
+
+    # Bez zadaného seedu sa použije náhodný; vypíše sa, aby sa beh dal zopakovať cez --seed
+    rngService.reseed(args.seed)
+    print(f"Seed náhodných prúdov: {rngService.seed()}", flush=True)
+
+    with startupProfiler.span("QApplication"):
+        app = QApplication(qt_argv)
+
+    # Moduly protokolov sa importujú tu, aby sa dal zmerať ich čas
+    with startupProfiler.span("importy modulov", "import"):
+        timings = time_imports()
+    from mw.mainWindow import MainWindow
+    if args.import_report:
+        print(format_import_report(timings), flush=True)
+
+    with startupProfiler.span("MainWindow"):
+        window = MainWindow()
+    with startupProfiler.span("MainWindow.show"):
+        window.show()
+
+    # Qiskit sa načíta na pozadí až po zobrazení okna
+    QTimer.singleShot(0, quantumBackend.warm_up)
+
+    if profiler is not None:
+        # Záznam sa uloží po prvom prechode slučkou udalostí
+        QTimer.singleShot(0, lambda: finish_startup_profile(profiler, args.profile_startup, window))
+
     print("Starting done. Application is ready.", flush=True)
     try:
         sys.exit(app.exec())
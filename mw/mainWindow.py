@@ -1,6 +1,6 @@
-from PyQt6 import uic
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QMainWindow, QTextEdit, QTabWidget, QLabel, QPushButton
+from PyQt6.QtCore import QTimer
 
 from QSim_app.qkdProtocol import QKDProtocol #Kvantová distribúcia kľúčov (QKD)
 from QSim_app.coinFlipping import CoinFlipping #Kvantový hod mincou (QFC)
@@ -10,12 +10,14 @@ from QSim_app.byzantineAgreement import QuantumByzantineAgreement #Kvantová byz
 from QSim_app.qrng import QRNG #Kvantové generovanie náhodných čísel (QRNG)
 from QSim_app.qpv import QuantumPositionVerification #Kvantová verifikácia polohy (QPV)
 from QSim_app.qst import QuantumTimeSync #Kvantová synchronizácia času (QST)
+from QSim_app.lazyTab import LazyTab
+from QSim_app.uiLoader import load_ui
 
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        uic.loadUi("mw/main_window.ui", self)
+        load_ui("mw/main_window.ui", self)
 
         # Nastavenie ikony aplikácie
         self.setWindowIcon(QIcon("icon/icon.png"))
@@ -34,39 +36,78 @@ class MainWindow(QMainWindow):
         # Pripojenie tlačidla k funkcii
         self.start_button.clicked.connect(self.show_protocol_tabs)
 
+        # Príprava nasledujúcej karty na pozadí (v čase nečinnosti)
+        self.prefetch_enabled = True
+        self.prefetch_delay_ms = 500
+
         # Inicializácia protokolov
         self.add_protocol_tabs()
 
     def add_protocol_tabs(self):
-        """Inicializácia a pridanie každej karty protokolu do hlavného okna."""
+        """Pridanie zástupných kariet protokolov do hlavného okna.
+
+        Skutočné widgety protokolov sa vytvárajú až pri prvom zobrazení karty.
+        """
+        protocols = [
+            # Kvantová distribúcia kľúčov (QKD)
+            (QKDProtocol, "Kvantová distribúcia kľúčov - BB84 s polarizačným kódovaním"),
+
+            # Kvantový hod mincou (QFC)
+            (lambda: CoinFlipping(self.description_area), "Kvantový hod mincou"),
+
+            # Kvantový záväzkový protokol (QC)
+            (lambda: QuantumCommitment(self.description_area), "Kvantový záväzok"),
+
+            # Kvantové zdieľanie tajomstva (QSS)
+            (QSSProtocolUI, "Kvantové zdieľanie tajomstva"),
+
+            # Kvantová byzantská dohoda (QBA)
+            (lambda: QuantumByzantineAgreement(self.description_area), "Kvantová byzantská dohoda"),
+
+            # Kvantové generovanie náhodných čísel (QRNG)
+            (QRNG, "Kvantové generovanie náhodných čísel"),
 
-        # Kvantová distribúcia kľúčov (QKD)
-        self.tab_widget.addTab(QKDProtocol(), "Kvantová distribúcia kľúčov - BB84 s polarizačným kódovaním")
+            # Kvantová verifikácia polohy (QPV)
+            (QuantumPositionVerification, "Kvantové overenie polohy"),
 
-        # Kvantový hod mincou (QFC)
-        self.tab_widget.addTab(CoinFlipping(self.description_area), "Kvantový hod mincou")
+            # Kvantová synchronizácia času (QST)
+            (QuantumTimeSync, "Kvantová synchronizácia času"),
+        ]
 
-        # Kvantový záväzkový protokol (QC)
-        self.tab_widget.addTab(QuantumCommitment(self.description_area), "Kvantový záväzok")
+        for factory, title in protocols:
+            self.tab_widget.addTab(LazyTab(factory, title), title)
 
-        # Kvantové zdieľanie tajomstva (QSS)
-        self.tab_widget.addTab(QSSProtocolUI(), "Kvantové zdieľanie tajomstva")
+        # Po zobrazení karty sa v nečinnosti pripraví nasledujúca karta
+        self.tab_widget.currentChanged.connect(self.schedule_prefetch)
 
-        # Kvantová byzantská dohoda (QBA)
-        self.tab_widget.addTab(QuantumByzantineAgreement(self.description_area), "Kvantová byzantská dohoda")
+    def protocol_tab(self, index):
+        """Vráti zástupnú kartu protokolu na danom indexe"""
+        tab = self.tab_widget.widget(index)
+        return tab if isinstance(tab, LazyTab) else None
 
-        # Kvantové generovanie náhodných čísel (QRNG)
-        self.tab_widget.addTab(QRNG(), "Kvantové generovanie náhodných čísel")
+    def build_all_tabs(self):
+        """Vytvorenie všetkých widgetov protokolov naraz"""
+        for index in range(self.tab_widget.count()):
+            tab = self.protocol_tab(index)
+            if tab is not None:
+                tab.ensure_built()
 
-        # Kvantová verifikácia polohy (QPV)
-        self.tab_widget.addTab(QuantumPositionVerification(), "Kvantové overenie polohy")
+    def schedule_prefetch(self, index):
+        """Naplánovanie prípravy nasledujúcej karty, keď je aplikácia nečinná"""
+        if not self.prefetch_enabled:
+            return
+        QTimer.singleShot(self.prefetch_delay_ms, lambda: self.prefetch_tab(index + 1))
 
-        # Kvantová synchronizácia času (QST)
-        self.tab_widget.addTab(QuantumTimeSync(), "Kvantová synchronizácia času")
+    def prefetch_tab(self, index):
+        """Vytvorenie widgetu karty vopred, aby jej prvé zobrazenie bolo okamžité"""
+        tab = self.protocol_tab(index)
+        if tab is not None and not tab.is_built():
+            tab.ensure_built()
 
     def show_protocol_tabs(self):
         """Zobraziť protokoly a skryť uvítacie prvky."""
         self.welcome_label.hide()
         self.start_button.hide()
         self.description_label.hide()
-        self.tab_widget.show()
\ No newline at end of file
+        self.tab_widget.show()
+        self.schedule_prefetch(self.tab_widget.currentIndex())
\ No newline at end of file